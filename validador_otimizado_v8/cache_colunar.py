@@ -0,0 +1,238 @@
+# cache_colunar.py  -------------------------------------------------------------
+"""
+Cache colunar (Arrow IPC / Feather v2) dos CSVs processados.
+
+Na primeira leitura de um CSV entregue (``output/<base>/input``) as colunas
+são gravadas, como texto, em um arquivo Arrow sem compressão na pasta
+``output/<base>/colunar``. As etapas seguintes (estatísticas, conteúdo,
+integridade) e as próximas execuções leem esse arquivo mapeado em memória em
+vez de interpretar o CSV de novo. Os CSVs entregues ao parser não mudam.
+
+Quando a cópia do CSV já é interpretada em blocos (cópia com análise,
+derivação), o Arrow é gravado a partir desses blocos (``GravadorColunar``).
+
+O cache é opcional e depende do pyarrow; sem ele, ou sem pasta de cache
+informada, os blocos vêm direto do CSV.
+"""
+import hashlib
+import importlib.util
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from utils_csv import perfil_arquivo, opcoes_leitura
+
+# Linhas por bloco lido do CSV (e por lote gravado no Arrow)
+TAMANHO_CHUNK_LINHAS = 100_000
+
+VERSAO_CACHE_COLUNAR = "1"
+
+_TAMANHO_BLOCO_HASH = 1024 * 1024
+
+# ---------------------------------------------------------------------------
+def arrow_disponivel() -> bool:
+    """True se o pyarrow está instalado (verificado sem importá-lo)."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+def caminho_colunar(arquivo: Path, pasta_colunar: Path) -> Path:
+    return Path(pasta_colunar) / f"{Path(arquivo).name}.arrow"
+
+def _hash_conteudo(arquivo: Path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(arquivo, "rb") as f:
+        for bloco in iter(lambda: f.read(_TAMANHO_BLOCO_HASH), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+def _assinatura(arquivo: Path, com_hash: bool = False) -> Dict[str, str]:
+    st = os.stat(arquivo)
+    assinatura = {
+        "versao": VERSAO_CACHE_COLUNAR,
+        "tamanho": str(st.st_size),
+        "mtime_ns": str(st.st_mtime_ns),
+    }
+    if com_hash:
+        assinatura["hash"] = _hash_conteudo(arquivo)
+    return assinatura
+
+def _metadados(esquema) -> Dict[str, str]:
+    return {chave.decode(): valor.decode() for chave, valor in (esquema.metadata or {}).items()}
+
+def _cache_valido(arquivo: Path, destino: Path, leitor) -> bool:
+    """O Arrow corresponde ao CSV atual? (mtime igual, ou mesmo conteúdo).
+
+    As cópias em ``input`` recebem o mtime da origem (utils_csv.preservar_mtime),
+    então a mesma origem copiada de novo é reconhecida sem calcular o hash.
+    """
+    metadados = _metadados(leitor.schema)
+    atual = _assinatura(arquivo)
+    if metadados.get("versao") != atual["versao"] or metadados.get("tamanho") != atual["tamanho"]:
+        return False
+    # Mesma data e tamanho, mas outras colunas (ex.: derivação alterada no esquema)
+    if leitor.schema.names != perfil_arquivo(arquivo)["colunas"]:
+        return False
+    if metadados.get("mtime_ns") == atual["mtime_ns"]:
+        return True
+    # CSV regravado com o mesmo conteúdo (ex.: nova execução): compara o hash
+    return metadados.get("hash") == _hash_conteudo(arquivo)
+
+# ---------------------------------------------------------------------------
+def _blocos_arrow(arquivo: Path, destino: Path, colunas: Optional[List[str]]) -> Optional[Iterator[pd.DataFrame]]:
+    """Blocos lidos do Arrow mapeado em memória; None se não há cache válido."""
+    import pyarrow as pa
+
+    try:
+        fonte = pa.memory_map(str(destino), "r")
+    except (FileNotFoundError, OSError):
+        return None
+    try:
+        leitor = pa.ipc.open_file(fonte)
+        if not _cache_valido(arquivo, destino, leitor):
+            fonte.close()
+            return None
+    except Exception:
+        fonte.close()
+        return None
+
+    def gerar():
+        with fonte:
+            for i in range(leitor.num_record_batches):
+                lote = leitor.get_batch(i)
+                if colunas is not None:
+                    lote = lote.select(colunas)
+                yield lote.to_pandas()
+    return gerar()
+
+def _blocos_csv_gravando(arquivo: Path, destino: Path, colunas: Optional[List[str]],
+                         tamanho_chunk: int) -> Iterator[pd.DataFrame]:
+    """Lê o CSV inteiro em blocos e grava o Arrow ao mesmo tempo."""
+    import pyarrow as pa
+
+    perfil = perfil_arquivo(arquivo)
+    esquema = pa.schema([(coluna, pa.string()) for coluna in perfil["colunas"]],
+                        metadata=_assinatura(arquivo, com_hash=True))
+    temporario = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+    escritor = None
+    try:
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        escritor = pa.ipc.new_file(str(temporario), esquema)
+    except Exception:
+        escritor = None  # sem cache, mas a leitura continua
+
+    leitor = pd.read_csv(arquivo, dtype=str, chunksize=tamanho_chunk, **opcoes_leitura(perfil))
+    concluido = False
+    try:
+        with leitor:
+            for chunk in leitor:
+                if escritor is not None:
+                    try:
+                        escritor.write_table(pa.Table.from_pandas(chunk, schema=esquema, preserve_index=False))
+                    except Exception:
+                        escritor.close()
+                        escritor = None
+                yield chunk[colunas] if colunas is not None else chunk
+        concluido = True
+    finally:
+        if escritor is not None:
+            escritor.close()
+            if concluido:
+                temporario.replace(destino)
+        if temporario.exists():
+            temporario.unlink()
+
+class GravadorColunar:
+    """Grava o cache colunar de um CSV com os blocos lidos por outra etapa.
+
+    Funciona como os acumuladores da cópia (``atualizar(chunk)``): os lotes
+    vão para um arquivo temporário e ``resultado()``, chamado com o CSV já
+    completo no disco, grava o Arrow com a assinatura do CSV (conhecida só
+    no fim). ``descartar()`` abandona o cache se a leitura não foi até o fim.
+    """
+
+    def __init__(self, arquivo: Path, pasta_colunar: Path, colunas: List[str]):
+        import pyarrow as pa
+
+        self.arquivo = Path(arquivo)
+        self.destino = caminho_colunar(arquivo, pasta_colunar)
+        self._esquema = pa.schema([(coluna, pa.string()) for coluna in colunas])
+        self._lotes = self.destino.with_name(f"{self.destino.name}.{os.getpid()}.lotes.tmp")
+        self.destino.parent.mkdir(parents=True, exist_ok=True)
+        self._escritor = pa.ipc.new_file(str(self._lotes), self._esquema)
+
+    def atualizar(self, chunk: pd.DataFrame):
+        import pyarrow as pa
+
+        self._escritor.write_table(pa.Table.from_pandas(chunk, schema=self._esquema, preserve_index=False))
+
+    def _arrow_atual(self) -> bool:
+        """O Arrow existente já é deste CSV? (mesma versão, tamanho, mtime e colunas)"""
+        import pyarrow as pa
+
+        try:
+            with pa.memory_map(str(self.destino), "r") as fonte:
+                esquema = pa.ipc.open_file(fonte).schema
+        except Exception:
+            return False
+        metadados = _metadados(esquema)
+        return (esquema.names == self._esquema.names
+                and all(metadados.get(chave) == valor for chave, valor in _assinatura(self.arquivo).items()))
+
+    def resultado(self) -> Path:
+        """Grava o Arrow final (lotes já gravados + assinatura do CSV).
+
+        A mesma origem copiada de novo mantém tamanho e mtime: o Arrow da
+        execução anterior continua valendo e não é regravado.
+        """
+        import pyarrow as pa
+
+        if self._arrow_atual():
+            self.descartar()
+            return self.destino
+
+        self._escritor.close()
+        temporario = self.destino.with_name(f"{self.destino.name}.{os.getpid()}.tmp")
+        esquema = self._esquema.with_metadata(_assinatura(self.arquivo, com_hash=True))
+        try:
+            with pa.memory_map(str(self._lotes), "r") as fonte:
+                leitor = pa.ipc.open_file(fonte)
+                with pa.ipc.new_file(str(temporario), esquema) as escritor:
+                    for i in range(leitor.num_record_batches):
+                        escritor.write_batch(leitor.get_batch(i))
+            temporario.replace(self.destino)
+        finally:
+            for caminho in (self._lotes, temporario):
+                if caminho.exists():
+                    caminho.unlink()
+        return self.destino
+
+    def descartar(self):
+        self._escritor.close()
+        if self._lotes.exists():
+            self._lotes.unlink()
+
+def blocos_csv(arquivo: Path, colunas: Optional[List[str]] = None,
+               tamanho_chunk: Optional[int] = None,
+               pasta_colunar: Optional[Path] = None) -> Iterator[pd.DataFrame]:
+    """Blocos do CSV com as colunas como texto (mesmo resultado de pd.read_csv(dtype=str)).
+
+    ``colunas`` restringe as colunas devolvidas (acessadas por nome). Com
+    ``pasta_colunar`` e pyarrow instalado, usa/grava o cache colunar.
+    """
+    arquivo = Path(arquivo)
+    tamanho_chunk = tamanho_chunk or TAMANHO_CHUNK_LINHAS
+
+    if pasta_colunar is not None and arrow_disponivel():
+        destino = caminho_colunar(arquivo, pasta_colunar)
+        blocos = _blocos_arrow(arquivo, destino, colunas)
+        if blocos is not None:
+            yield from blocos
+        else:
+            yield from _blocos_csv_gravando(arquivo, destino, colunas, tamanho_chunk)
+        return
+
+    perfil = perfil_arquivo(arquivo)
+    leitor = pd.read_csv(arquivo, dtype=str, usecols=colunas, chunksize=tamanho_chunk, **opcoes_leitura(perfil))
+    with leitor:
+        yield from leitor
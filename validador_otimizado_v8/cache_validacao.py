@@ -0,0 +1,153 @@
+# cache_validacao.py  --------------------------------------------------------
+"""
+Cache persistente (SQLite) de validação entre execuções.
+
+Cada grupo de arquivos de uma base (ver MotorValidacao.grupos_arquivos) é
+guardado com a assinatura do conteúdo dos arquivos de origem e o hash dos
+campos obrigatórios do template para esses arquivos. Se nada mudou desde a
+última execução, os resultados parciais são reaproveitados sem copiar nem
+validar o arquivo de novo.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Incrementar quando o formato dos resultados parciais mudar
+VERSAO_CACHE = 3
+
+NOME_ARQUIVO_CACHE = ".cache_validacao.sqlite"
+
+_TAMANHO_BLOCO_HASH = 1024 * 1024
+
+# ---------------------------------------------------------------------------
+def _json_padrao(valor):
+    """Converte tipos numpy/pandas para tipos serializáveis."""
+    if hasattr(valor, "item"):
+        return valor.item()
+    return str(valor)
+
+def hash_campos(campos_obrigatorios: Dict[str, List[str]], arquivos: List[str],
+                opcoes: Optional[Dict] = None) -> str:
+    """Hash dos campos obrigatórios do template para os arquivos informados.
+
+    ``opcoes`` são configurações que alteram os arquivos de saída (ex.: encoding).
+    """
+    recorte = {arquivo: campos_obrigatorios.get(arquivo, []) for arquivo in arquivos}
+    texto = json.dumps([VERSAO_CACHE, recorte, opcoes or {}], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+# ---------------------------------------------------------------------------
+class CacheValidacao:
+    """Cache SQLite de resultados parciais por (base, grupo de arquivos)."""
+
+    def __init__(self, pasta_saida: Path):
+        self.caminho = Path(pasta_saida) / NOME_ARQUIVO_CACHE
+        # Conexões SQLite só podem ser usadas na thread que as criou (a
+        # interface processa cada clique em uma thread nova)
+        self._local = threading.local()
+
+    def _conectar(self) -> sqlite3.Connection:
+        """Abre a conexão sob demanda (uma por thread)."""
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            self.caminho.parent.mkdir(parents=True, exist_ok=True)
+            conexao = sqlite3.connect(self.caminho, timeout=30)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                " caminho TEXT PRIMARY KEY, tamanho INTEGER, mtime_ns INTEGER, hash TEXT)"
+            )
+            conexao.execute(
+                "CREATE TABLE IF NOT EXISTS grupos ("
+                " base TEXT, grupo TEXT, assinatura TEXT, hash_campos TEXT, modo TEXT,"
+                " registro TEXT, atualizado TEXT, PRIMARY KEY (base, grupo))"
+            )
+            conexao.commit()
+            self._local.conexao = conexao
+        return conexao
+
+    def fechar(self):
+        """Fecha a conexão da thread atual, se aberta."""
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is not None:
+            conexao.close()
+            self._local.conexao = None
+
+    # -----------------------------------------------------------------------
+    def hash_arquivo(self, arquivo: Path) -> str:
+        """Hash do conteúdo; reaproveita o anterior se tamanho e mtime não mudaram."""
+        caminho = os.path.abspath(arquivo)
+        st = os.stat(caminho)
+        conexao = self._conectar()
+
+        linha = conexao.execute(
+            "SELECT tamanho, mtime_ns, hash FROM hashes WHERE caminho = ?", (caminho,)
+        ).fetchone()
+        if linha and linha[0] == st.st_size and linha[1] == st.st_mtime_ns:
+            return linha[2]
+
+        h = hashlib.blake2b(digest_size=20)
+        with open(caminho, "rb") as f:
+            for bloco in iter(lambda: f.read(_TAMANHO_BLOCO_HASH), b""):
+                h.update(bloco)
+        digest = h.hexdigest()
+
+        conexao.execute(
+            "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?)",
+            (caminho, st.st_size, st.st_mtime_ns, digest),
+        )
+        conexao.commit()
+        return digest
+
+    def assinatura(self, fontes: List[Tuple[str, Optional[Path]]]) -> str:
+        """Assinatura do grupo: hash de cada arquivo de origem (ou ausência)."""
+        partes = [
+            [arquivo, self.hash_arquivo(origem) if origem else None]
+            for arquivo, origem in fontes
+        ]
+        return json.dumps(partes, sort_keys=True)
+
+    # -----------------------------------------------------------------------
+    def consultar(self, base: str, grupo: List[str], assinatura: str,
+                  hash_campos_grupo: str, modo: str) -> Optional[Dict]:
+        """Retorna {'parciais', 'saidas'} guardados, se ainda válidos para esta execução."""
+        linha = self._conectar().execute(
+            "SELECT assinatura, hash_campos, modo, registro FROM grupos WHERE base = ? AND grupo = ?",
+            (base, grupo[0]),
+        ).fetchone()
+        if not linha:
+            return None
+
+        assinatura_salva, hash_campos_salvo, modo_salvo, registro = linha
+        # O modo também entra em hash_campos (validação de conteúdo), então
+        # só um resultado do mesmo modo é reaproveitado
+        if assinatura_salva != assinatura or hash_campos_salvo != hash_campos_grupo or modo_salvo != modo:
+            return None
+        return json.loads(registro)
+
+    def gravar(self, base: str, grupo: List[str], assinatura: str,
+               hash_campos_grupo: str, modo: str, parciais: List[Dict], saidas: List[str]):
+        """Guarda os parciais e os arquivos de saída gerados pelo grupo."""
+        conexao = self._conectar()
+        conexao.execute(
+            "INSERT OR REPLACE INTO grupos VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                base, grupo[0], assinatura, hash_campos_grupo, modo,
+                json.dumps({"parciais": parciais, "saidas": saidas},
+                           ensure_ascii=False, default=_json_padrao),
+                datetime.now().isoformat(timespec="seconds"),
+            ),
+        )
+        conexao.commit()
+
+    def limpar(self):
+        """Remove todos os resultados guardados."""
+        conexao = self._conectar()
+        conexao.execute("DELETE FROM grupos")
+        conexao.execute("DELETE FROM hashes")
+        conexao.commit()
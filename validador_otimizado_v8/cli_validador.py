@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Linha de comando do Validador de Dados Logísticos
+Executa o mesmo pipeline de "Processar Todas as Bases" sem interface gráfica
+e emite um resultado por base, em JSON ou NDJSON, à medida que cada base termina.
+
+Uso:
+    python cli_validador.py validate --template X.xlsx --data DIR \\
+        --mode rapido|completo --jobs N --out DIR --format json|ndjson \\
+        [--esquema esquema.json] [--relatorio] [--exportar ndjson|parquet]
+
+Códigos de saída:
+    0 - todas as bases estão PRONTO PARA PARSER
+    1 - ao menos uma base requer correções
+    2 - erro de configuração ou execução (template, diretório, nenhuma base)
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from motor_validacao import (
+    MotorValidacao,
+    JOBS_PADRAO,
+    base_pronta,
+    status_base,
+    classificar_inconsistencia,
+)
+
+SAIDA_OK = 0
+SAIDA_BASES_COM_PROBLEMAS = 1
+SAIDA_ERRO = 2
+
+# ---------------------------------------------------------------------------
+def _json_padrao(valor):
+    """Converte tipos numpy/pandas e Path para tipos serializáveis"""
+    if hasattr(valor, 'item'):
+        return valor.item()
+    return str(valor)
+
+def _resultado_para_registro(base: str, resultado: Dict) -> Dict:
+    """Resultado de uma base no formato de saída da CLI"""
+    registro = {
+        'tipo': 'base',
+        'base': base,
+        'status': status_base(resultado),
+        'pronto': base_pronta(resultado),
+    }
+    registro.update({chave: valor for chave, valor in resultado.items() if chave != 'base'})
+    return registro
+
+def _inconsistencias_para_registros(motor: MotorValidacao) -> List[Dict]:
+    """Uma entrada por variação de nomenclatura encontrada"""
+    registros = []
+    for inconsistencia in motor.inconsistencias_nomenclatura.values():
+        for variacao, bases in inconsistencia['variacoes']:
+            registros.append({
+                'tipo': 'inconsistencia',
+                'arquivo': inconsistencia['arquivo'],
+                'campo_obrigatorio': inconsistencia['campo_obrigatorio'],
+                'variacao': variacao,
+                'bases': list(bases),
+                'tipo_problema': classificar_inconsistencia(inconsistencia['campo_obrigatorio'], variacao),
+            })
+    return registros
+
+def _emitir(registro: Dict, saida=None):
+    """Escreve um registro JSON em uma linha e força a descarga"""
+    saida = saida or sys.stdout
+    saida.write(json.dumps(registro, ensure_ascii=False, default=_json_padrao) + "\n")
+    saida.flush()
+
+# ---------------------------------------------------------------------------
+def criar_parser() -> argparse.ArgumentParser:
+    """Cria o parser de argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(
+        prog="validador",
+        description="Sistema de Validação de Dados Logísticos v8.0 - execução em lote"
+    )
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    validate = subparsers.add_parser("validate", help="Valida todas as bases de um diretório")
+    validate.add_argument("--template", type=Path, default=None,
+                          help="Template Excel com os campos obrigatórios preenchidos "
+                               "(opcional se o esquema declarar as colunas obrigatórias)")
+    validate.add_argument("--esquema", type=Path, default=None,
+                          help="Esquema JSON de arquivos/abas/aliases (padrão: esquema_arquivos.json embutido)")
+    validate.add_argument("--data", required=True, type=Path,
+                          help="Diretório com os dados brutos (BASE-arquivo.csv ou BASE/arquivo.csv)")
+    validate.add_argument("--mode", choices=["rapido", "completo"], default="rapido",
+                          help="Modo de processamento (padrão: rapido)")
+    validate.add_argument("--jobs", type=int, default=JOBS_PADRAO,
+                          help=f"Processos paralelos (padrão: {JOBS_PADRAO}; 1 = sem pool)")
+    validate.add_argument("--out", type=Path, default=None,
+                          help="Pasta de trabalho; resultados em <out>/output/<base>")
+    validate.add_argument("--format", choices=["json", "ndjson"], default="ndjson",
+                          help="json: um documento ao final; ndjson: uma linha por base ao concluir")
+    validate.add_argument("--sem-cache", action="store_true",
+                          help="Ignora o cache de execuções anteriores e revalida tudo")
+    validate.add_argument("--conteudo", action="store_true",
+                          help="Valida também o conteúdo das colunas obrigatórias no modo rápido "
+                               "(vazios, tipo e padrão; sempre ativo no modo completo)")
+    validate.add_argument("--cache-colunar", action="store_true",
+                          help="Guarda uma cópia Arrow de cada CSV processado e a reutiliza nas "
+                               "análises seguintes (requer pyarrow)")
+    validate.add_argument("--encoding-saida", default=None,
+                          help="Converte as cópias para este encoding (padrão: mantém o original)")
+    validate.add_argument("--qualidade-graficos", choices=["rascunho", "impressao"], default="rascunho",
+                          help="Resolução dos gráficos do modo completo: rascunho (100 DPI) "
+                               "ou impressao (300 DPI)")
+    validate.add_argument("--graficos-svg", action="store_true",
+                          help="Grava os gráficos também em SVG (vetorial)")
+    validate.add_argument("--relatorio", action="store_true",
+                          help="Gera o workbook consolidado de todas as bases ao final")
+    validate.add_argument("--exportar", choices=["ndjson", "parquet"], default=None,
+                          help="Exporta os fatos do relatório consolidado para BI "
+                               "(implica --relatorio; parquet requer pyarrow)")
+    validate.add_argument("--verbose", action="store_true",
+                          help="Mostra mensagens de progresso no stderr")
+
+    return parser
+
+def executar_validacao(args: argparse.Namespace) -> int:
+    """Executa o pipeline completo e retorna o código de saída"""
+    motor = MotorValidacao(pasta_padrao=args.out)
+    motor.usar_cache = not args.sem_cache
+    motor.encoding_saida = args.encoding_saida
+    motor.validar_conteudo = args.conteudo
+    motor.cache_colunar = args.cache_colunar
+    motor.perfil_graficos = args.qualidade_graficos
+    motor.graficos_svg = args.graficos_svg
+
+    try:
+        if args.esquema:
+            motor.carregar_esquema(args.esquema)
+        if args.template:
+            motor.analisar_template(args.template)
+        elif not any(motor.usar_campos_do_esquema().values()):
+            logging.error("❌ Informe --template ou um esquema com colunas obrigatórias")
+            return SAIDA_ERRO
+        bases = motor.detectar_bases(args.data)
+    except Exception as e:
+        logging.error(f"❌ {e}")
+        return SAIDA_ERRO
+
+    if not bases:
+        logging.error("❌ Nenhuma base detectada no diretório especificado")
+        return SAIDA_ERRO
+
+    try:
+        for base, resultado in motor.processar_bases(modo=args.mode, jobs=args.jobs):
+            if args.format == "ndjson":
+                _emitir(_resultado_para_registro(base, resultado))
+    except Exception as e:
+        logging.error(f"❌ Erro durante processamento: {e}")
+        return SAIDA_ERRO
+
+    resumo = dict(motor.resumo_processamento(), tipo='resumo', modo=args.mode, jobs=args.jobs)
+
+    if args.relatorio or args.exportar:
+        try:
+            caminhos = motor.gerar_relatorio_consolidado(exportar=args.exportar)
+        except Exception as e:
+            logging.error(f"❌ Erro ao gerar relatório consolidado: {e}")
+            return SAIDA_ERRO
+        resumo['relatorio'] = {chave: str(caminho) for chave, caminho in caminhos.items()}
+    inconsistencias = _inconsistencias_para_registros(motor)
+
+    if args.format == "ndjson":
+        for registro in inconsistencias:
+            _emitir(registro)
+        _emitir(resumo)
+    else:
+        # Documento único: bases na ordem de detecção, não na de conclusão
+        documento = {
+            'resumo': resumo,
+            'bases': [_resultado_para_registro(base, resultado)
+                      for base, resultado in motor.resultados_validacao.items()],
+            'inconsistencias': inconsistencias,
+        }
+        sys.stdout.write(json.dumps(documento, ensure_ascii=False, indent=2, default=_json_padrao) + "\n")
+
+    if resumo['bases_prontas'] == resumo['total_bases']:
+        return SAIDA_OK
+    return SAIDA_BASES_COM_PROBLEMAS
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando"""
+    args = criar_parser().parse_args(argv)
+
+    # Mensagens de progresso vão para o stderr; o stdout fica só com os resultados
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        stream=sys.stderr
+    )
+
+    if args.comando == "validate":
+        return executar_validacao(args)
+    return SAIDA_ERRO
+
+if __name__ == "__main__":
+    sys.exit(main())
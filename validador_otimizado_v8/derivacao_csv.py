@@ -0,0 +1,170 @@
+# derivacao_csv.py  -------------------------------------------------------------
+"""
+Derivação de arquivos CSV por colunas, em streaming.
+
+O arquivo de origem (ex.: ilhas.csv) é lido uma única vez, em blocos de
+linhas, e escrito ao mesmo tempo na cópia de saída (sem as colunas removidas)
+e em cada arquivo derivado (só as colunas dele). As linhas são regravadas
+pelo módulo csv com o dialeto original (separador, caractere de aspas e
+terminador de linha) e os valores como texto, sem conversão de tipos. A
+grafia das aspas não é mantida: um campo só sai entre aspas quando precisa
+(QUOTE_MINIMAL) e aspas internas são escritas dobradas.
+
+Opcionalmente cada bloco gravado em uma saída é entregue aos acumuladores
+dela (conteúdo, estatísticas, cache colunar) como DataFrame, interpretado
+pelo pandas a partir do mesmo texto gravado: o resultado é o de ler a saída
+depois, sem a segunda leitura.
+"""
+import csv
+import io
+from contextlib import ExitStack
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from utils_csv import perfil_arquivo, perfil_copia, copiar_perfil, nomes_colunas_csv, preservar_mtime
+
+# Linhas lidas/escritas por bloco
+TAMANHO_BLOCO_LINHAS = 10_000
+
+# ---------------------------------------------------------------------------
+class _AnaliseSaida:
+    """Entrega aos acumuladores de uma saída os blocos de linhas gravados nela."""
+
+    def __init__(self, perfil: Dict, acumuladores: List):
+        self.colunas = perfil["colunas"]
+        self.acumuladores = acumuladores
+        # False quando algum bloco não pôde ser entregue: a análise fica incompleta
+        self.completa = True
+
+    def atualizar(self, linhas: List[List[str]], formato: Dict):
+        if not self.completa or not linhas:
+            return
+        # Linhas com outro nº de campos o pandas interpreta conforme o arquivo
+        # inteiro (ex.: índice implícito); nesse caso a saída é analisada depois
+        if any(len(linha) != len(self.colunas) for linha in linhas):
+            self.completa = False
+            return
+        try:
+            import pandas as pd
+
+            texto = io.StringIO()
+            csv.writer(texto, **formato).writerows(linhas)
+            texto.seek(0)
+            chunk = pd.read_csv(texto, header=None, names=self.colunas, dtype=str,
+                                sep=formato["delimiter"], quotechar=formato["quotechar"])
+            for acumulador in self.acumuladores:
+                acumulador.atualizar(chunk)
+        except Exception:
+            self.completa = False
+
+def colunas_ausentes(colunas: List[str], derivados: Dict[Path, List[str]], remover: List[str]) -> List[str]:
+    """Colunas pedidas pela derivação que não existem no arquivo de origem."""
+    existentes = set(colunas)
+    pedidas = [c for lista in derivados.values() for c in lista] + list(remover)
+    return [c for c in dict.fromkeys(pedidas) if c not in existentes]
+
+def derivar_colunas(origem: Path, destino: Path, derivados: Dict[Path, List[str]],
+                    remover: List[str], encoding_saida: Optional[str] = None,
+                    analisar: Optional[Callable[[Path, Dict], List]] = None) -> Dict:
+    """Copia origem para destino sem as colunas ``remover`` e grava cada derivado.
+
+    ``derivados`` associa o caminho de cada arquivo derivado às colunas da
+    origem que ele recebe. ``analisar(caminho, perfil)`` devolve os
+    acumuladores de cada saída (destino e derivados), que recebem
+    ``atualizar(chunk)`` com os blocos gravados. Retorna {'registros': n,
+    'analisados': [saídas cujos acumuladores receberam todas as linhas]} ou,
+    se faltar alguma coluna na origem, {'ausentes': [...]} sem gravar nada.
+    """
+    perfil = perfil_arquivo(origem)
+    colunas = perfil["colunas"]
+    ausentes = colunas_ausentes(colunas, derivados, remover)
+    if ausentes:
+        return {"ausentes": ausentes}
+
+    dialeto = perfil["dialeto"]
+    encoding_destino = encoding_saida or perfil["encoding"]
+    formato = {
+        "delimiter": dialeto["delimiter"],
+        "quotechar": dialeto["quotechar"],
+        "lineterminator": dialeto["lineterminator"],
+    }
+    removidas = {colunas.index(c) for c in remover}
+    indices_origem = [i for i in range(len(colunas)) if i not in removidas]
+    indices_derivados = {caminho: [colunas.index(c) for c in lista] for caminho, lista in derivados.items()}
+
+    registros = 0
+    with ExitStack() as pilha:
+        entrada = pilha.enter_context(open(origem, "r", encoding=perfil["encoding"], newline=""))
+        saida = pilha.enter_context(open(destino, "w", encoding=encoding_destino, newline=""))
+
+        # Linhas de título antes do cabeçalho passam sem alteração
+        for _ in range(dialeto.get("cabecalho", 0)):
+            saida.write(entrada.readline())
+
+        leitor = csv.reader(entrada, delimiter=formato["delimiter"], quotechar=formato["quotechar"])
+        escritor = csv.writer(saida, **formato)
+        escritores = {
+            caminho: csv.writer(pilha.enter_context(open(caminho, "w", encoding=encoding_destino, newline="")), **formato)
+            for caminho in derivados
+        }
+
+        def linha_origem(linha: List[str]) -> List[str]:
+            # Campos além do cabeçalho (linhas irregulares) são mantidos
+            return [linha[i] for i in indices_origem if i < len(linha)] + linha[len(colunas):]
+
+        cabecalho = None
+        perfis: Dict[Path, Dict] = {}
+        analises: Dict[Path, _AnaliseSaida] = {}
+        while True:
+            bloco = list(islice(leitor, TAMANHO_BLOCO_LINHAS))
+            if not bloco:
+                break
+            if cabecalho is None:
+                # Linhas em branco antes do cabeçalho seguem na cópia
+                inicio = next((i for i, linha in enumerate(bloco) if linha), None)
+                if inicio is None:
+                    escritor.writerows(bloco)
+                    continue
+                escritor.writerows(bloco[:inicio])
+                cabecalho = bloco[inicio]
+                escritor.writerow(linha_origem(cabecalho))
+                for caminho, indices in indices_derivados.items():
+                    escritores[caminho].writerow([cabecalho[i] for i in indices])
+                bloco = bloco[inicio + 1:]
+
+                # Perfis das saídas já conhecidos: evita detectar tudo de novo
+                nomes = cabecalho.copy()
+                nomes[0] = nomes[0].lstrip("\ufeff")
+                perfis[destino] = perfil_copia(origem, encoding=encoding_destino,
+                                               colunas=nomes_colunas_csv(linha_origem(nomes)))
+                for caminho, indices in indices_derivados.items():
+                    perfis[caminho] = perfil_copia(origem, encoding=encoding_destino,
+                                                   colunas=nomes_colunas_csv([nomes[i] for i in indices]),
+                                                   cabecalho=0)
+                if analisar is not None:
+                    for caminho, perfil_saida in perfis.items():
+                        acumuladores = analisar(caminho, perfil_saida)
+                        if acumuladores:
+                            analises[caminho] = _AnaliseSaida(perfil_saida, acumuladores)
+
+            linhas_origem = [linha_origem(linha) if linha else linha for linha in bloco]
+            escritor.writerows(linhas_origem)
+            preenchidas = [linha for linha in bloco if linha]
+            registros += len(preenchidas)
+            if destino in analises:
+                analises[destino].atualizar([linha for linha in linhas_origem if linha], formato)
+            for caminho, indices in indices_derivados.items():
+                linhas_derivado = [[linha[i] if i < len(linha) else "" for i in indices] for linha in preenchidas]
+                escritores[caminho].writerows(linhas_derivado)
+                if caminho in analises:
+                    analises[caminho].atualizar(linhas_derivado, formato)
+
+    for caminho in [destino, *derivados]:
+        preservar_mtime(origem, caminho)
+    for caminho, perfil_saida in perfis.items():
+        copiar_perfil(origem, caminho, encoding=perfil_saida["encoding"], colunas=perfil_saida["colunas"],
+                      cabecalho=perfil_saida["dialeto"].get("cabecalho"))
+
+    return {"registros": registros,
+            "analisados": [caminho for caminho, analise in analises.items() if analise.completa]}
@@ -0,0 +1,155 @@
+# esquema.py  --------------------------------------------------------------------
+"""
+Esquema dos arquivos CSV esperados em cada base.
+
+O arquivo ``esquema_arquivos.json`` descreve, para cada CSV: a aba do template
+que o define, colunas obrigatórias fixas, tipos esperados, padrões (regex) de
+códigos, referências a chaves de outros arquivos, nomes alternativos
+(aliases) aceitos e, para arquivos derivados, o arquivo de origem e as
+colunas copiadas/removidas dele. O JSON é compilado uma vez em objetos prontos
+para consulta e a versão compilada fica em cache (pickle) associada ao hash do
+arquivo de esquema.
+"""
+import hashlib
+import json
+import pickle
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+VERSAO_ESQUEMA = 1
+# Incrementar quando os objetos compilados (pickle) mudarem
+VERSAO_CACHE_ESQUEMA = 2
+CAMINHO_ESQUEMA_PADRAO = Path(__file__).with_name("esquema_arquivos.json")
+
+TIPOS_VALIDOS = {"texto", "inteiro", "decimal", "data"}
+
+# ---------------------------------------------------------------------------
+class EsquemaArquivo:
+    """Regras compiladas de um arquivo CSV."""
+
+    def __init__(self, nome: str, definicao: Dict):
+        self.nome = nome
+        self.aba: str = definicao["aba"]
+        self.obrigatorios: List[str] = list(definicao.get("obrigatorios", []))
+        self.tipos: Dict[str, str] = dict(definicao.get("tipos", {}))
+        self.aliases: Dict[str, List[str]] = {
+            campo: list(nomes) for campo, nomes in definicao.get("aliases", {}).items()
+        }
+        self.padroes: Dict[str, str] = dict(definicao.get("padroes", {}))
+        # coluna -> (arquivo referenciado, coluna de chave), de "arquivo.csv:Coluna"
+        self.referencias: Dict[str, Tuple[str, str]] = {
+            coluna: tuple(destino.split(":", 1)) for coluna, destino in definicao.get("referencias", {}).items()
+        }
+        self.derivado_de: Optional[str] = definicao.get("derivado_de")
+        # Colunas do arquivo de origem copiadas para o derivado e as que deixam a origem
+        derivacao = definicao.get("derivacao", {})
+        self.colunas_derivadas: List[str] = list(derivacao.get("colunas", []))
+        self.remover_da_origem: List[str] = list(derivacao.get("remover_da_origem", []))
+
+        # alias -> nome oficial do campo
+        self.campo_por_alias: Dict[str, str] = {
+            alias: campo for campo, nomes in self.aliases.items() for alias in nomes
+        }
+
+    def campo_presente(self, campo: str, colunas: Iterable[str]) -> bool:
+        """True se o campo ou um de seus aliases está entre as colunas."""
+        colunas = colunas if isinstance(colunas, (set, frozenset, dict)) else set(colunas)
+        if campo in colunas:
+            return True
+        return any(alias in colunas for alias in self.aliases.get(campo, ()))
+
+class Esquema:
+    """Esquema compilado: arquivos na ordem do JSON e mapas derivados."""
+
+    def __init__(self, dados: Dict, origem: str = ""):
+        self.origem = origem
+        self.versao = dados.get("versao")
+        if not isinstance(self.versao, int) or self.versao > VERSAO_ESQUEMA:
+            raise ValueError(f"Esquema inválido ({origem}): versão {self.versao!r} não suportada")
+
+        arquivos = dados.get("arquivos")
+        if not isinstance(arquivos, dict) or not arquivos:
+            raise ValueError(f"Esquema inválido ({origem}): 'arquivos' vazio ou ausente")
+
+        self.arquivos: Dict[str, EsquemaArquivo] = {}
+        for nome, definicao in arquivos.items():
+            if not isinstance(definicao, dict) or not isinstance(definicao.get("aba"), str):
+                raise ValueError(f"Esquema inválido ({origem}): '{nome}' sem 'aba'")
+            invalidos = set(definicao.get("tipos", {}).values()) - TIPOS_VALIDOS
+            if invalidos:
+                raise ValueError(f"Esquema inválido ({origem}): tipos desconhecidos em '{nome}': {sorted(invalidos)}")
+            for campo, padrao in definicao.get("padroes", {}).items():
+                try:
+                    re.compile(padrao)
+                except re.error as e:
+                    raise ValueError(f"Esquema inválido ({origem}): padrão de '{nome}:{campo}': {e}")
+            self.arquivos[nome] = EsquemaArquivo(nome, definicao)
+
+        for arquivo in self.arquivos.values():
+            if arquivo.derivado_de and arquivo.derivado_de not in self.arquivos:
+                raise ValueError(f"Esquema inválido ({origem}): '{arquivo.nome}' deriva de arquivo desconhecido")
+            if arquivo.colunas_derivadas and not arquivo.derivado_de:
+                raise ValueError(f"Esquema inválido ({origem}): '{arquivo.nome}' tem 'derivacao' sem 'derivado_de'")
+            for coluna, destino in arquivo.referencias.items():
+                if len(destino) != 2 or destino[0] not in self.arquivos:
+                    raise ValueError(f"Esquema inválido ({origem}): referência '{arquivo.nome}:{coluna}' "
+                                     f"deve apontar para 'arquivo.csv:Coluna' de um arquivo do esquema")
+
+        self.mapeamento_abas: Dict[str, str] = {
+            arquivo.aba: nome for nome, arquivo in self.arquivos.items()
+        }
+        self.arquivos_derivados: Dict[str, List[str]] = {}
+        for nome, arquivo in self.arquivos.items():
+            if arquivo.derivado_de:
+                self.arquivos_derivados.setdefault(arquivo.derivado_de, []).append(nome)
+
+    def arquivo(self, nome: str) -> Optional[EsquemaArquivo]:
+        return self.arquivos.get(nome)
+
+    def campos_obrigatorios(self) -> Dict[str, List[str]]:
+        """Colunas obrigatórias fixas declaradas no esquema, por arquivo."""
+        return {nome: list(arquivo.obrigatorios) for nome, arquivo in self.arquivos.items()}
+
+# ---------------------------------------------------------------------------
+def carregar_esquema(caminho: Optional[Path] = None, pasta_cache: Optional[Path] = None) -> Esquema:
+    """Carrega o esquema (JSON) reaproveitando a versão compilada em cache."""
+    caminho = Path(caminho) if caminho else CAMINHO_ESQUEMA_PADRAO
+    conteudo = caminho.read_bytes()
+
+    arquivo_cache = None
+    if pasta_cache is not None:
+        digest = hashlib.sha256(conteudo + f"|{VERSAO_CACHE_ESQUEMA}".encode()).hexdigest()[:32]
+        arquivo_cache = Path(pasta_cache) / f"esquema_{digest}.pkl"
+        try:
+            with open(arquivo_cache, "rb") as f:
+                esquema = pickle.load(f)
+            esquema.origem = str(caminho)
+            return esquema
+        except Exception:
+            pass
+
+    esquema = Esquema(json.loads(conteudo.decode("utf-8")), origem=str(caminho))
+
+    if arquivo_cache is not None:
+        try:
+            arquivo_cache.parent.mkdir(parents=True, exist_ok=True)
+            temporario = arquivo_cache.with_suffix(".tmp")
+            with open(temporario, "wb") as f:
+                pickle.dump(esquema, f, protocol=pickle.HIGHEST_PROTOCOL)
+            temporario.replace(arquivo_cache)
+        except Exception:
+            pass
+
+    return esquema
+
+# Esquema embutido no pacote (usado quando nenhum outro é informado). Carregado
+# no primeiro uso, e não na importação, para passar pelo cache compilado
+_esquema_padrao: Optional[Esquema] = None
+
+def esquema_padrao(pasta_cache: Optional[Path] = None) -> Esquema:
+    """Esquema embutido, carregado uma vez por processo (com o cache da 1ª chamada)."""
+    global _esquema_padrao
+    if _esquema_padrao is None:
+        _esquema_padrao = carregar_esquema(CAMINHO_ESQUEMA_PADRAO, pasta_cache)
+    return _esquema_padrao
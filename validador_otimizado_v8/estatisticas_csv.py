@@ -0,0 +1,139 @@
+# estatisticas_csv.py  ----------------------------------------------------------
+"""
+Estatísticas de arquivos CSV em streaming (modo completo).
+
+O arquivo é lido em blocos de linhas de tamanho fixo e cada bloco atualiza um
+acumulador: total de registros, vazios por coluna, estimativa de valores
+distintos (KMV), mínimo/máximo e tipo inferido. A memória usada não depende
+do número de linhas do arquivo.
+"""
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from cache_colunar import blocos_csv
+from utils_csv import perfil_arquivo
+
+# Linhas por bloco lido do CSV
+TAMANHO_CHUNK_LINHAS = 100_000
+
+# Quantidade de menores hashes guardados por coluna para estimar distintos.
+# Até esse número de valores distintos a contagem é exata.
+K_DISTINTOS = 1024
+
+_ESCALA_HASH = float(2 ** 64)
+
+# ---------------------------------------------------------------------------
+def _python(valor):
+    """Converte escalares numpy para tipos nativos (serializáveis)."""
+    return valor.item() if hasattr(valor, "item") else valor
+
+class _AcumuladorColuna:
+    """Estado incremental de uma coluna."""
+
+    def __init__(self):
+        self.nulos = 0
+        self.preenchidos = 0
+        self.numericos = 0
+        self.inteiros = 0
+        self.min_numero = None
+        self.max_numero = None
+        self.min_texto = None
+        self.max_texto = None
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def atualizar(self, serie: pd.Series):
+        vazios = serie.isna()
+        self.nulos += int(vazios.sum())
+        valores = serie[~vazios]
+        if valores.empty:
+            return
+        self.preenchidos += len(valores)
+
+        # Valores distintos: mantém os K menores hashes (k-minimum values)
+        hashes = pd.util.hash_pandas_object(valores, index=False).to_numpy(dtype=np.uint64)
+        self.hashes = np.unique(np.concatenate([self.hashes, hashes]))[:K_DISTINTOS]
+
+        # Mínimo/máximo de texto
+        texto = valores.astype(str)
+        menor, maior = texto.min(), texto.max()
+        self.min_texto = menor if self.min_texto is None else min(self.min_texto, menor)
+        self.max_texto = maior if self.max_texto is None else max(self.max_texto, maior)
+
+        # Tipo numérico e mínimo/máximo numérico; coluna que já tem texto
+        # não volta a ser numérica, então a conversão deixa de ser feita
+        if self.numericos < self.preenchidos - len(valores):
+            return
+        numeros = pd.to_numeric(valores, errors="coerce").dropna()
+        if numeros.empty:
+            return
+        self.numericos += len(numeros)
+        self.inteiros += int((numeros == np.floor(numeros)).sum())
+        menor, maior = _python(numeros.min()), _python(numeros.max())
+        self.min_numero = menor if self.min_numero is None else min(self.min_numero, menor)
+        self.max_numero = maior if self.max_numero is None else max(self.max_numero, maior)
+
+    def distintos(self) -> int:
+        """Número de valores distintos (exato até K_DISTINTOS, depois estimado)."""
+        if len(self.hashes) < K_DISTINTOS:
+            return len(self.hashes)
+        kesimo = float(self.hashes[K_DISTINTOS - 1]) / _ESCALA_HASH
+        return int(round((K_DISTINTOS - 1) / kesimo))
+
+    def tipo(self) -> str:
+        if self.preenchidos == 0:
+            return "vazio"
+        if self.numericos == self.preenchidos:
+            return "inteiro" if self.inteiros == self.numericos else "decimal"
+        return "texto"
+
+    def resultado(self) -> Dict:
+        tipo = self.tipo()
+        numerico = tipo in ("inteiro", "decimal")
+        return {
+            "tipo": tipo,
+            "vazios": self.nulos,
+            "distintos": self.distintos(),
+            "minimo": self.min_numero if numerico else self.min_texto,
+            "maximo": self.max_numero if numerico else self.max_texto,
+        }
+
+# ---------------------------------------------------------------------------
+class AcumuladorEstatisticas:
+    """Acumula estatísticas de um arquivo bloco a bloco."""
+
+    def __init__(self, colunas: List[str]):
+        self.colunas = list(colunas)
+        self.total_registros = 0
+        self._colunas = {coluna: _AcumuladorColuna() for coluna in self.colunas}
+
+    def atualizar(self, chunk: pd.DataFrame):
+        """Incorpora um bloco de linhas lido do arquivo."""
+        self.total_registros += len(chunk)
+        for posicao, coluna in enumerate(self.colunas):
+            self._colunas[coluna].atualizar(chunk.iloc[:, posicao])
+
+    def resultado(self) -> Dict:
+        """Estatísticas no formato do relatório (mesmas chaves de antes + colunas)."""
+        total_celulas = self.total_registros * len(self.colunas)
+        campos_vazios = sum(acumulador.nulos for acumulador in self._colunas.values())
+        return {
+            "total_registros": self.total_registros,
+            "total_colunas": len(self.colunas),
+            "campos_vazios": campos_vazios,
+            "taxa_preenchimento": ((total_celulas - campos_vazios) / total_celulas * 100) if total_celulas > 0 else 0,
+            "colunas": {coluna: acumulador.resultado() for coluna, acumulador in self._colunas.items()},
+        }
+
+# ---------------------------------------------------------------------------
+def estatisticas_arquivo(arquivo: Path, tamanho_chunk: Optional[int] = None,
+                         pasta_colunar: Optional[Path] = None) -> Dict:
+    """Calcula as estatísticas do arquivo lendo-o em blocos."""
+    perfil = perfil_arquivo(arquivo)
+    acumulador = AcumuladorEstatisticas(perfil["colunas"])
+    for chunk in blocos_csv(arquivo, tamanho_chunk=tamanho_chunk or TAMANHO_CHUNK_LINHAS,
+                            pasta_colunar=pasta_colunar):
+        acumulador.atualizar(chunk)
+    return acumulador.resultado()
@@ -0,0 +1,54 @@
+# eventos_interface.py  ---------------------------------------------------------
+"""
+Canal de eventos entre as threads de processamento e a interface Tk.
+
+As threads de trabalho apenas publicam eventos (log, progresso, resultado de
+base...) em uma fila; a thread da interface drena a fila em lotes a partir de
+um temporizador (``root.after``). Eventos de estado, em que só o último valor
+importa (ex.: percentual de progresso), são coalescidos dentro do lote.
+"""
+import queue
+from typing import List, Tuple
+
+# Eventos lidos da fila por ciclo da interface
+MAX_EVENTOS_POR_CICLO = 500
+
+# Intervalo entre ciclos de leitura da fila (ms)
+INTERVALO_EVENTOS_MS = 100
+
+# Eventos em que só a ocorrência mais recente do lote é aplicada
+TIPOS_COALESCIDOS = {"progresso", "rotulo_progresso", "inconsistencias"}
+
+# ---------------------------------------------------------------------------
+def coalescer(eventos: List[Tuple[str, tuple]]) -> List[Tuple[str, tuple]]:
+    """Mantém só o último evento de cada tipo coalescido, preservando a ordem."""
+    vistos = set()
+    resultado = []
+    for tipo, dados in reversed(eventos):
+        if tipo in TIPOS_COALESCIDOS:
+            if tipo in vistos:
+                continue
+            vistos.add(tipo)
+        resultado.append((tipo, dados))
+    resultado.reverse()
+    return resultado
+
+class BarramentoEventos:
+    """Fila de eventos segura entre threads (publicar em qualquer thread,
+    drenar apenas na thread da interface)."""
+
+    def __init__(self):
+        self._fila: "queue.SimpleQueue[Tuple[str, tuple]]" = queue.SimpleQueue()
+
+    def publicar(self, tipo: str, *dados):
+        self._fila.put((tipo, dados))
+
+    def drenar(self, maximo: int = MAX_EVENTOS_POR_CICLO) -> Tuple[List[Tuple[str, tuple]], bool]:
+        """Retorna (eventos do lote já coalescidos, ainda_ha_eventos)."""
+        eventos = []
+        try:
+            while len(eventos) < maximo:
+                eventos.append(self._fila.get_nowait())
+        except queue.Empty:
+            return coalescer(eventos), False
+        return coalescer(eventos), not self._fila.empty()
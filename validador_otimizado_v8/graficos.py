@@ -0,0 +1,100 @@
+# graficos.py  ------------------------------------------------------------------
+"""
+Gráficos dos relatórios, desenhados fora da tela.
+
+Cada gráfico usa uma ``Figure`` própria com o canvas Agg (API orientada a
+objetos do matplotlib, sem o estado global do pyplot), então pode ser
+desenhado em qualquer thread ou processo worker. O pedido de um gráfico é um
+dicionário simples (serializável), que pode ser enviado a um pool de
+processos e desenhado por ``renderizar_grafico``.
+
+Perfis de qualidade: ``rascunho`` (resolução de tela, rápido) e ``impressao``
+(300 DPI). Além do PNG, o gráfico pode ser gravado em SVG (vetorial, não
+depende da resolução).
+"""
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+PERFIS_QUALIDADE = {
+    "rascunho": {"dpi": 100},
+    "impressao": {"dpi": 300},
+}
+PERFIL_PADRAO = "rascunho"
+
+FORMATOS_GRAFICOS = ("png", "svg")
+
+COR_VALIDO = '#27ae60'
+COR_PROBLEMA = '#e74c3c'
+COR_TOTAL = '#3498db'
+
+# ---------------------------------------------------------------------------
+def _status_arquivos(figura, dados: Dict):
+    eixo = figura.add_subplot()
+    eixo.bar(['Válidos', 'Com Problemas'], [dados['validos'], dados['com_problemas']],
+             color=[COR_VALIDO, COR_PROBLEMA])
+    eixo.set_title(f"Status dos Arquivos - Base {dados['base']}")
+    eixo.set_ylabel('Quantidade de Arquivos')
+
+def _status_bases(figura, dados: Dict):
+    eixo = figura.add_subplot()
+    x = range(len(dados['bases']))
+    largura = 0.35
+    eixo.bar([i - largura/2 for i in x], dados['validos'], largura, label='Arquivos Válidos', color=COR_VALIDO)
+    eixo.bar([i + largura/2 for i in x], dados['totais'], largura, label='Total Arquivos', color=COR_TOTAL)
+    eixo.set_xlabel('Bases')
+    eixo.set_ylabel('Quantidade de Arquivos')
+    eixo.set_title('Status de Validação por Base')
+    eixo.set_xticks(list(x), dados['bases'], rotation=45)
+    eixo.legend()
+    figura.tight_layout()
+
+def _distribuicao_problemas(figura, dados: Dict):
+    eixo = figura.add_subplot()
+    eixo.pie([dados['sem_problemas'], dados['com_problemas']],
+             labels=['Bases sem Problemas', 'Bases com Problemas'],
+             colors=[COR_VALIDO, COR_PROBLEMA], autopct='%1.1f%%', startangle=90)
+    eixo.set_title('Distribuição de Problemas nas Bases')
+    eixo.axis('equal')
+
+# Tipo de gráfico -> (função de desenho, tamanho em polegadas)
+TIPOS_GRAFICOS = {
+    "status_arquivos": (_status_arquivos, (10, 6)),
+    "status_bases": (_status_bases, (12, 8)),
+    "distribuicao_problemas": (_distribuicao_problemas, (10, 6)),
+}
+
+# ---------------------------------------------------------------------------
+def pedido_grafico(tipo: str, dados: Dict, destino: Path, perfil: str = PERFIL_PADRAO,
+                   formatos: Iterable[str] = ("png",)) -> Dict:
+    """Pedido de gráfico; ``destino`` é o caminho sem extensão."""
+    if tipo not in TIPOS_GRAFICOS:
+        raise ValueError(f"Tipo de gráfico desconhecido: {tipo}")
+    if perfil not in PERFIS_QUALIDADE:
+        raise ValueError(f"Perfil de qualidade inválido: {perfil}")
+    formatos = list(formatos)
+    invalidos = [f for f in formatos if f not in FORMATOS_GRAFICOS]
+    if invalidos:
+        raise ValueError(f"Formato de gráfico inválido: {', '.join(invalidos)}")
+    return {"tipo": tipo, "dados": dados, "destino": str(destino), "perfil": perfil, "formatos": formatos}
+
+def caminhos_grafico(pedido: Dict) -> List[Path]:
+    """Arquivos que o pedido gera (um por formato)."""
+    return [Path(f"{pedido['destino']}.{formato}") for formato in pedido['formatos']]
+
+def renderizar_grafico(pedido: Dict) -> List[str]:
+    """Desenha o gráfico do pedido e retorna os arquivos gravados."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    desenhar, tamanho = TIPOS_GRAFICOS[pedido['tipo']]
+    figura = Figure(figsize=tamanho)
+    FigureCanvasAgg(figura)
+    desenhar(figura, pedido['dados'])
+
+    dpi = PERFIS_QUALIDADE[pedido['perfil']]['dpi']
+    gravados = []
+    for caminho in caminhos_grafico(pedido):
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        figura.savefig(caminho, dpi=dpi, bbox_inches='tight')
+        gravados.append(str(caminho))
+    return gravados
@@ -0,0 +1,80 @@
+# integridade_referencial.py  ---------------------------------------------------
+"""
+Integridade referencial entre os arquivos de uma base.
+
+As colunas de chave referenciadas (ex.: ``patios.csv:Codigo``) são lidas uma
+vez por base e viram um índice de hash (``pd.Index``). Cada coluna que aponta
+para elas é lida em blocos e convertida em códigos inteiros com
+``pd.Categorical`` sobre esse índice: código -1 significa chave órfã. Não há
+conjuntos Python de strings nem laços por linha.
+"""
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import pandas as pd
+
+from cache_colunar import blocos_csv
+
+TAMANHO_CHUNK_LINHAS = 500_000
+
+# Chaves órfãs listadas por referência (as mais frequentes)
+MAX_CHAVES_ORFAS = 20
+
+# ---------------------------------------------------------------------------
+def _valores_coluna(arquivo: Path, coluna: str, pasta_colunar: Optional[Path] = None) -> Iterator[pd.Series]:
+    """Valores preenchidos de uma coluna, em blocos, sem espaços nas bordas."""
+    for chunk in blocos_csv(arquivo, [coluna], TAMANHO_CHUNK_LINHAS, pasta_colunar):
+        valores = chunk[coluna].dropna().str.strip()
+        yield valores[valores != ""]
+
+def indice_chaves(arquivo: Path, coluna: str, pasta_colunar: Optional[Path] = None) -> pd.Index:
+    """Índice de hash com as chaves distintas da coluna referenciada."""
+    distintos = [valores.drop_duplicates() for valores in _valores_coluna(arquivo, coluna, pasta_colunar)]
+    if not distintos:
+        return pd.Index([], dtype=object)
+    return pd.Index(pd.concat(distintos, ignore_index=True).drop_duplicates().to_numpy(dtype=object))
+
+def verificar_referencia(arquivo: Path, coluna: str, chaves: pd.Index,
+                         pasta_colunar: Optional[Path] = None) -> Dict:
+    """Confere cada valor da coluna contra o índice de chaves."""
+    verificados = 0
+    orfaos = pd.Series(dtype="int64")
+    for valores in _valores_coluna(arquivo, coluna, pasta_colunar):
+        verificados += len(valores)
+        codigos = pd.Categorical(valores.to_numpy(dtype=object), categories=chaves).codes
+        sem_chave = valores[codigos == -1]
+        if not sem_chave.empty:
+            orfaos = orfaos.add(sem_chave.value_counts(), fill_value=0)
+
+    orfaos = orfaos.astype("int64").sort_values(ascending=False, kind="stable")
+    return {
+        'verificados': verificados,
+        'orfaos': int(orfaos.sum()),
+        'chaves_orfas_distintas': len(orfaos),
+        'chaves_orfas': [[str(chave), int(total)] for chave, total in orfaos.head(MAX_CHAVES_ORFAS).items()],
+    }
+
+# ---------------------------------------------------------------------------
+class VerificadorIntegridade:
+    """Verifica as referências de uma base, reaproveitando os índices de chave."""
+
+    def __init__(self, pasta_input: Path, pasta_colunar: Optional[Path] = None):
+        self.pasta_input = Path(pasta_input)
+        self.pasta_colunar = pasta_colunar
+        self._indices: Dict = {}
+
+    def _chaves(self, arquivo_ref: str, coluna_ref: str) -> pd.Index:
+        chave = (arquivo_ref, coluna_ref)
+        if chave not in self._indices:
+            self._indices[chave] = indice_chaves(self.pasta_input / arquivo_ref, coluna_ref, self.pasta_colunar)
+        return self._indices[chave]
+
+    def verificar(self, arquivo: str, coluna: Optional[str],
+                  arquivo_ref: str, coluna_ref: Optional[str]) -> Dict:
+        """Resultado de uma referência; colunas None = não encontradas no arquivo."""
+        if not (self.pasta_input / arquivo).exists() or coluna is None:
+            return {'ignorada': f"coluna ausente em {arquivo}"}
+        if not (self.pasta_input / arquivo_ref).exists() or coluna_ref is None:
+            return {'ignorada': f"chave ausente em {arquivo_ref}"}
+        return verificar_referencia(self.pasta_input / arquivo, coluna, self._chaves(arquivo_ref, coluna_ref),
+                                    self.pasta_colunar)
@@ -0,0 +1,1420 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de Validação de Dados Logísticos - sem interface gráfica
+Reúne análise de template, detecção de bases, processamento rápido/completo,
+detecção de inconsistências e geração de relatórios. Pode ser usado pela
+interface Tk, por linha de comando ou importado em outros scripts.
+
+pandas, numpy, matplotlib e os módulos de estatística/conteúdo são importados
+só quando usados (modo completo, conteúdo, tabelas e gráficos): o modo rápido
+não carrega nenhum deles.
+"""
+from __future__ import annotations
+
+import fnmatch
+import logging
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from cache_validacao import CacheValidacao, hash_campos
+from esquema import carregar_esquema, esquema_padrao
+from template_excel import campos_template
+from utils_csv import (
+    perfil_arquivo,
+    copiar_perfil,
+    copiar_arquivo,
+    campos_similares_flex,
+    indice_colunas,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# ---------------------------------------------------------------------------
+STATUS_PRONTO = "PRONTO PARA PARSER"
+STATUS_CORRECOES = "REQUER CORREÇÕES NO MDRIVER"
+
+MINIMO_ARQUIVOS_BASE = 5  # Mínimo de arquivos CSV para ser considerada base válida
+
+# Processos paralelos sugeridos para CLI e interface
+JOBS_PADRAO = max(1, min(4, os.cpu_count() or 1))
+
+# ---------------------------------------------------------------------------
+def _log_padrao(mensagem: str, nivel: str = "INFO"):
+    """Registra mensagem apenas no logging (uso sem interface)"""
+    if nivel == "ERROR":
+        logging.error(mensagem)
+    else:
+        logging.info(mensagem)
+
+def base_pronta(resultado: Dict) -> bool:
+    """Indica se todos os arquivos da base passaram na validação"""
+    return resultado['arquivos_validos'] == resultado['total_arquivos']
+
+def status_base(resultado: Dict) -> str:
+    """Retorna o status textual da base (pronta para parser ou não)"""
+    return STATUS_PRONTO if base_pronta(resultado) else STATUS_CORRECOES
+
+def classificar_inconsistencia(campo_obrigatorio: str, variacao: str) -> str:
+    """Classifica o tipo de problema de nomenclatura"""
+    if campo_obrigatorio.replace(' ', '') == variacao.replace(' ', ''):
+        return "Espaçamento"
+    return "Acentuação/Caracteres"
+
+# ---------------------------------------------------------------------------
+# Pool de processos: cada worker mantém um motor próprio, criado uma única vez
+_motor_worker = None
+
+def _inicializar_worker(configuracao: Dict):
+    """Cria o motor do processo worker a partir da configuração do principal"""
+    global _motor_worker
+    _motor_worker = MotorValidacao(pasta_padrao=configuracao['pasta_padrao'])
+    if configuracao['esquema_path']:
+        _motor_worker.carregar_esquema(configuracao['esquema_path'])
+    _motor_worker.dados_path = Path(configuracao['dados_path'])
+    _motor_worker.indice_arquivos = configuracao['indice_arquivos']
+    _motor_worker.campos_obrigatorios = configuracao['campos_obrigatorios']
+    _motor_worker.modo_processamento = configuracao['modo_processamento']
+    _motor_worker.usar_cache = configuracao['usar_cache']
+    _motor_worker.encoding_saida = configuracao['encoding_saida']
+    _motor_worker.validar_conteudo = configuracao['validar_conteudo']
+    _motor_worker.cache_colunar = configuracao['cache_colunar']
+
+def _processar_grupo_worker(base: str, grupo: List[str]) -> List[Dict]:
+    """Executa um grupo de arquivos de uma base no processo worker"""
+    return _motor_worker._processar_grupo(base, grupo)
+
+def _verificar_integridade_worker(base: str) -> List[Dict]:
+    """Confere a integridade referencial de uma base no processo worker"""
+    return _motor_worker._verificar_integridade(base)
+
+def varrer_diretorio_dados(diretorio: Path) -> Tuple[Dict[str, Dict[str, str]], Dict[str, Dict[str, str]]]:
+    """Lista os CSVs do diretório de dados com um os.scandir por pasta
+
+    Retorna (estrutura BASE-arquivo.csv, estrutura BASE/arquivo.csv), cada uma
+    no formato base -> {arquivo -> caminho}. Os nomes de arquivo passam por
+    os.path.normcase (no Windows a busca não diferencia maiúsculas).
+    """
+    por_prefixo: Dict[str, Dict[str, str]] = {}
+    por_pasta: Dict[str, Dict[str, str]] = {}
+    pastas = []
+
+    with os.scandir(diretorio) as entradas:
+        for entrada in entradas:
+            if entrada.is_dir():
+                pastas.append(entrada)
+            elif '-' in entrada.name and fnmatch.fnmatch(entrada.name, "*.csv") and entrada.is_file():
+                base, arquivo_csv = entrada.name.split('-', 1)
+                por_prefixo.setdefault(base, {})[os.path.normcase(arquivo_csv)] = entrada.path
+
+    for pasta in pastas:
+        try:
+            with os.scandir(pasta.path) as entradas:
+                por_pasta[pasta.name] = {
+                    os.path.normcase(entrada.name): entrada.path
+                    for entrada in entradas
+                    if fnmatch.fnmatch(entrada.name, "*.csv") and entrada.is_file()
+                }
+        except OSError:
+            continue
+
+    return por_prefixo, por_pasta
+
+# ---------------------------------------------------------------------------
+class MotorValidacao:
+    """Motor de validação independente da interface gráfica"""
+
+    def __init__(self, pasta_padrao: Optional[Path] = None,
+                 log: Optional[Callable[..., None]] = None):
+        """Inicializa o motor com a pasta de trabalho e a função de log"""
+        self.pasta_padrao = Path(pasta_padrao) if pasta_padrao else Path.home() / "Documents" / "ValidadorLogistico"
+        self.pasta_saida = self.pasta_padrao / "output"
+        self.log = log or _log_padrao
+
+        # Entradas
+        self.template_excel_path = None
+        self.dados_path = None
+        self.indice_arquivos = None  # base -> {arquivo -> caminho}, montado em detectar_bases
+
+        # Dados de análise
+        self.campos_obrigatorios = {}
+        self.bases_detectadas = []
+        self.resultados_validacao = {}
+        self.inconsistencias_nomenclatura = {}
+
+        # Catálogo de cabeçalhos preenchido durante o processamento:
+        # arquivo -> coluna -> bases em que aparece, e (base, arquivo) -> colunas
+        self.catalogo_cabecalhos: Dict[str, Dict[str, Set[str]]] = {}
+        self.cabecalhos_bases: Dict[Tuple[str, str], List[str]] = {}
+
+        # Configurações de processamento
+        self.modo_processamento = "rapido"  # "rapido" ou "completo"
+        self.jobs = 1  # processos paralelos; 1 = processamento no processo atual
+        self.usar_cache = True  # reaproveita resultados de arquivos não alterados
+        self.encoding_saida = None  # None = cópia byte a byte no encoding original
+        self.validar_conteudo = False  # conteúdo das colunas também no modo rápido
+        self.cache_colunar = False  # cópia Arrow em output/<base>/colunar (requer pyarrow)
+        self.perfil_graficos = "rascunho"  # "rascunho" (100 DPI) ou "impressao" (300 DPI)
+        self.graficos_svg = False  # grava também os gráficos em SVG
+        self._cache = None
+
+        # Gráficos das bases desenhados no pool durante processar_bases
+        self._executor_graficos = None
+        self._graficos_pendentes = []
+
+        # Arquivos esperados, abas do template, aliases e tipos
+        self.esquema = esquema_padrao(self.pasta_padrao / "cache")
+        self.esquema_path = None  # None = esquema embutido
+
+    # -----------------------------------------------------------------------
+    # Esquema
+    # -----------------------------------------------------------------------
+    def carregar_esquema(self, esquema_path: Path):
+        """Usa um esquema de arquivos próprio (JSON) no lugar do embutido"""
+        esquema_path = Path(esquema_path)
+        if not esquema_path.exists():
+            raise FileNotFoundError(f"Esquema não encontrado: {esquema_path}")
+
+        self.esquema = carregar_esquema(esquema_path, self.pasta_padrao / "cache")
+        self.esquema_path = esquema_path
+        self.log(f"📐 Esquema carregado: {esquema_path} ({len(self.esquema.arquivos)} arquivos)")
+
+    def usar_campos_do_esquema(self) -> Dict[str, List[str]]:
+        """Campos obrigatórios apenas a partir do esquema (sem template Excel)"""
+        self.campos_obrigatorios = self.esquema.campos_obrigatorios()
+        total_campos, arquivos_com_campos = self.resumo_template()
+        self.log(f"📐 {total_campos} campos obrigatórios do esquema em {arquivos_com_campos} arquivos")
+        return self.campos_obrigatorios
+
+    # -----------------------------------------------------------------------
+    # Template
+    # -----------------------------------------------------------------------
+    def analisar_template(self, template_excel_path: Path) -> Dict[str, List[str]]:
+        """Analisa template Excel para identificar campos obrigatórios"""
+        template_excel_path = Path(template_excel_path)
+        if not template_excel_path.exists():
+            raise FileNotFoundError(f"Template não encontrado: {template_excel_path}")
+
+        self.template_excel_path = template_excel_path
+        self.log("🔍 Analisando template Excel...")
+
+        self.campos_obrigatorios = {}
+
+        # Lê o workbook uma única vez (ou reaproveita o resultado em cache)
+        pasta_cache = self.pasta_padrao / "cache" if self.usar_cache else None
+        mapeamento_abas = self.esquema.mapeamento_abas
+        campos_por_arquivo, em_cache = campos_template(template_excel_path, mapeamento_abas, pasta_cache)
+        if em_cache:
+            self.log("♻️ Template sem alterações: campos obrigatórios reaproveitados do cache")
+
+        for aba, arquivo_csv in mapeamento_abas.items():
+            campos_com_dados = campos_por_arquivo.get(arquivo_csv)
+            # Colunas fixas do esquema somam-se às marcadas no template
+            fixos = [c for c in self.esquema.arquivos[arquivo_csv].obrigatorios
+                     if c not in (campos_com_dados or [])]
+            if campos_com_dados is not None:
+                self.campos_obrigatorios[arquivo_csv] = campos_com_dados + fixos
+                self.log(f"✅ {arquivo_csv}: {len(campos_com_dados) + len(fixos)} campos obrigatórios")
+            else:
+                self.campos_obrigatorios[arquivo_csv] = fixos
+                self.log(f"⚠️ Aba '{aba}' não encontrada no template")
+
+        total_campos, arquivos_com_campos = self.resumo_template()
+
+        self.log(f"✅ Template analisado com sucesso!")
+        self.log(f"📊 {total_campos} campos obrigatórios em {arquivos_com_campos} arquivos")
+
+        return self.campos_obrigatorios
+
+    def resumo_template(self) -> Tuple[int, int]:
+        """Retorna (total de campos obrigatórios, arquivos com campos)"""
+        total_campos = sum(len(campos) for campos in self.campos_obrigatorios.values())
+        arquivos_com_campos = len([arq for arq, campos in self.campos_obrigatorios.items() if len(campos) > 0])
+        return total_campos, arquivos_com_campos
+
+    # -----------------------------------------------------------------------
+    # Detecção de bases
+    # -----------------------------------------------------------------------
+    def detectar_bases(self, diretorio: Path) -> List[str]:
+        """Detecta bases disponíveis no diretório de dados brutos"""
+        diretorio = Path(diretorio)
+        if not diretorio.exists():
+            raise FileNotFoundError(f"Diretório não encontrado: {diretorio}")
+
+        self.dados_path = diretorio
+        self.log("🎯 Detectando bases disponíveis...")
+
+        # Estrutura 1: BASE-arquivo.csv / Estrutura 2: \\BASE\arquivo.csv
+        por_prefixo, por_pasta = varrer_diretorio_dados(diretorio)
+
+        bases = {base for base, arquivos in por_prefixo.items() if len(arquivos) >= MINIMO_ARQUIVOS_BASE}
+        bases.update(base for base, arquivos in por_pasta.items() if len(arquivos) >= MINIMO_ARQUIVOS_BASE)
+
+        # Índice usado no processamento; BASE-arquivo.csv tem precedência sobre a pasta
+        self.indice_arquivos = {
+            base: {**por_pasta.get(base, {}), **por_prefixo.get(base, {})}
+            for base in set(por_prefixo) | set(por_pasta)
+        }
+
+        self.bases_detectadas = sorted(list(bases))
+
+        if self.bases_detectadas:
+            self.log(f"✅ {len(self.bases_detectadas)} bases detectadas: {', '.join(self.bases_detectadas)}")
+        else:
+            self.log("⚠️ Nenhuma base detectada")
+
+        return self.bases_detectadas
+
+    def _encontrar_arquivo_original(self, diretorio: Path, base: str, arquivo_csv: str) -> Optional[Path]:
+        """Encontra arquivo original da base"""
+        # Índice da detecção: nenhum acesso ao disco
+        if self.indice_arquivos is not None:
+            caminho = self.indice_arquivos.get(base, {}).get(os.path.normcase(arquivo_csv))
+            return Path(caminho) if caminho else None
+
+        # Estrutura 1: BASE-arquivo.csv
+        arquivo_prefixo = diretorio / f"{base}-{arquivo_csv}"
+        if arquivo_prefixo.exists():
+            return arquivo_prefixo
+
+        # Estrutura 2: \\BASE\arquivo.csv
+        arquivo_pasta = diretorio / base / arquivo_csv
+        if arquivo_pasta.exists():
+            return arquivo_pasta
+
+        return None
+
+    # -----------------------------------------------------------------------
+    # Processamento
+    # -----------------------------------------------------------------------
+    def grupos_arquivos(self) -> List[List[str]]:
+        """Agrupa arquivos do template em unidades independentes de processamento"""
+        derivados = {
+            derivado
+            for origem, lista in self.esquema.arquivos_derivados.items() if origem in self.campos_obrigatorios
+            for derivado in lista
+        }
+        grupos = []
+        for arquivo_csv in self.campos_obrigatorios.keys():
+            if arquivo_csv in derivados:
+                continue
+            grupo = [arquivo_csv] + [d for d in self.esquema.arquivos_derivados.get(arquivo_csv, [])
+                                     if d in self.campos_obrigatorios]
+            grupos.append(grupo)
+        return grupos
+
+    def processar_bases(self, bases: Optional[List[str]] = None,
+                        modo: Optional[str] = None,
+                        jobs: Optional[int] = None,
+                        progresso: Optional[Callable[[int, int], None]] = None) -> Iterator[Tuple[str, Dict]]:
+        """Processa as bases e devolve (base, resultado) à medida que concluem
+
+        Cada base é dividida em grupos de arquivos (ver grupos_arquivos); com
+        jobs > 1 todos os grupos de todas as bases são distribuídos em um pool
+        de processos. O callback progresso recebe (grupos concluídos, total).
+        """
+        if not self.campos_obrigatorios:
+            raise ValueError("Template não analisado! Analise o template Excel primeiro.")
+
+        if modo:
+            self.modo_processamento = modo
+        jobs = self.jobs if jobs is None else jobs
+        bases = self.bases_detectadas if bases is None else bases
+
+        grupos = self.grupos_arquivos()
+        total_tarefas = len(bases) * len(grupos)
+        concluidas = 0
+        self.log(f"🔄 Processando {len(bases)} bases ({total_tarefas} tarefas, {jobs} processo(s))...")
+
+        if jobs <= 1:
+            for base in bases:
+                parciais = []
+                for grupo in grupos:
+                    parciais.extend(self._processar_grupo(base, grupo))
+                    concluidas += 1
+                    if progresso:
+                        progresso(concluidas, total_tarefas)
+                resultado = self._registrar_resultado(base, parciais)
+                yield base, resultado
+        else:
+            pendentes = {base: len(grupos) for base in bases}
+            parciais_por_base = {base: [] for base in bases}
+
+            # spawn: workers não herdam (fork) o estado do processo principal, como
+            # threads da interface Tk ou conexões abertas; mesmo comportamento do Windows
+            with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_inicializar_worker,
+                                     initargs=(self._configuracao_worker(),)) as executor:
+                self._executor_graficos = executor
+                try:
+                    # futuro -> (base, True se for a verificação de integridade da base)
+                    futuros = {
+                        executor.submit(_processar_grupo_worker, base, grupo): (base, False)
+                        for base in bases for grupo in grupos
+                    }
+                    while futuros:
+                        prontos, _ = wait(futuros, return_when=FIRST_COMPLETED)
+                        for futuro in prontos:
+                            base, integridade = futuros.pop(futuro)
+                            if integridade:
+                                resultado = self._registrar_resultado(base, parciais_por_base.pop(base),
+                                                                      futuro.result())
+                                yield base, resultado
+                                continue
+
+                            parciais_por_base[base].extend(futuro.result())
+                            pendentes[base] -= 1
+                            concluidas += 1
+                            if progresso:
+                                progresso(concluidas, total_tarefas)
+
+                            if pendentes[base] == 0:
+                                # Integridade precisa de todos os arquivos da base prontos: vira
+                                # mais uma tarefa do pool em vez de rodar no processo principal
+                                if self._integridade_ativa():
+                                    futuros[executor.submit(_verificar_integridade_worker, base)] = (base, True)
+                                    continue
+                                resultado = self._registrar_resultado(base, parciais_por_base.pop(base))
+                                yield base, resultado
+                finally:
+                    self._aguardar_graficos()
+
+        # Ordem determinística, independente da ordem de conclusão
+        ordem = {base: i for i, base in enumerate(self.bases_detectadas)}
+        self.resultados_validacao = dict(
+            sorted(self.resultados_validacao.items(), key=lambda item: ordem.get(item[0], len(ordem)))
+        )
+
+    def _aguardar_graficos(self):
+        """Espera os gráficos enviados ao pool e desliga o envio"""
+        pendentes, self._graficos_pendentes = self._graficos_pendentes, []
+        self._executor_graficos = None
+        for base, futuro in pendentes:
+            try:
+                futuro.result()
+            except Exception as e:
+                self.log(f"⚠️ Erro ao gerar gráficos ({base}): {e}")
+
+    def processar_todas_bases(self, modo: Optional[str] = None, jobs: Optional[int] = None) -> Dict[str, Dict]:
+        """Processa todas as bases detectadas e detecta inconsistências"""
+        if not self.bases_detectadas:
+            raise ValueError("Nenhuma base detectada! Execute a detecção primeiro.")
+
+        for base, resultado in self.processar_bases(modo=modo, jobs=jobs):
+            pass
+
+        self.log("✅ Todas as bases foram processadas com sucesso!")
+
+        return self.resultados_validacao
+
+    def processar_base(self, base: str) -> Dict:
+        """Processa uma base no modo configurado"""
+        if self.modo_processamento == "rapido":
+            return self.processar_base_rapido(base)
+        return self.processar_base_completo(base)
+
+    def processar_base_rapido(self, base: str) -> Dict:
+        """Processamento rápido - apenas validação essencial"""
+        self.modo_processamento = "rapido"
+        return self._processar_base_sequencial(base)
+
+    def processar_base_completo(self, base: str) -> Dict:
+        """Processamento completo - com estatísticas e análises"""
+        self.modo_processamento = "completo"
+        return self._processar_base_sequencial(base)
+
+    def _processar_base_sequencial(self, base: str) -> Dict:
+        """Processa todos os grupos de uma base no processo atual"""
+        parciais = []
+        for grupo in self.grupos_arquivos():
+            parciais.extend(self._processar_grupo(base, grupo))
+        return self._registrar_resultado(base, parciais)
+
+    def _configuracao_worker(self) -> Dict:
+        """Estado mínimo (serializável) para recriar o motor em outro processo"""
+        return {
+            'pasta_padrao': str(self.pasta_padrao),
+            'dados_path': str(self.dados_path),
+            'indice_arquivos': self.indice_arquivos,
+            'campos_obrigatorios': self.campos_obrigatorios,
+            'modo_processamento': self.modo_processamento,
+            'usar_cache': self.usar_cache,
+            'encoding_saida': self.encoding_saida,
+            'validar_conteudo': self.validar_conteudo,
+            'cache_colunar': self.cache_colunar,
+            'esquema_path': str(self.esquema_path) if self.esquema_path else None,
+        }
+
+    def _obter_cache(self) -> CacheValidacao:
+        """Cache persistente da pasta de saída (aberto sob demanda)"""
+        if self._cache is None:
+            self._cache = CacheValidacao(self.pasta_saida)
+        return self._cache
+
+    def _opcoes_cache(self, grupo: List[str]) -> Dict:
+        """Configurações que alteram o resultado do grupo (parte da chave do cache)"""
+        regras = [self.esquema.arquivos[arquivo_csv] for arquivo_csv in grupo if arquivo_csv in self.esquema.arquivos]
+        opcoes = {
+            'encoding_saida': self.encoding_saida,
+            'aliases': {r.nome: r.aliases for r in regras},
+            'conteudo': self._conteudo_ativo(),
+        }
+        if opcoes['conteudo']:
+            opcoes['tipos'] = {r.nome: r.tipos for r in regras}
+            opcoes['padroes'] = {r.nome: r.padroes for r in regras}
+        derivacoes = {r.nome: [r.colunas_derivadas, r.remover_da_origem] for r in regras if r.colunas_derivadas}
+        if derivacoes:
+            opcoes['derivacoes'] = derivacoes
+        return opcoes
+
+    def _pasta_colunar(self, pasta_input: Path) -> Optional[Path]:
+        """Pasta do cache colunar da base (None = desativado)"""
+        return pasta_input.parent / "colunar" if self.cache_colunar else None
+
+    def _conteudo_ativo(self) -> bool:
+        """Validação de conteúdo roda no modo completo ou quando pedida explicitamente"""
+        return self.validar_conteudo or self.modo_processamento == "completo"
+
+    def _integridade_ativa(self) -> bool:
+        """Há referências declaradas no esquema para conferir nos arquivos do template"""
+        return self._conteudo_ativo() and any(
+            regras.referencias for arquivo_csv, regras in self.esquema.arquivos.items()
+            if arquivo_csv in self.campos_obrigatorios
+        )
+
+    def _processar_grupo(self, base: str, grupo: List[str]) -> List[Dict]:
+        """Processa um grupo de arquivos de uma base (unidade de trabalho do pool)
+
+        Retorna um resultado parcial por arquivo; mensagens de log são
+        devolvidas no parcial para que o processo principal as registre.
+        Se os arquivos de origem e os campos obrigatórios não mudaram desde a
+        última execução, os parciais guardados no cache são reaproveitados.
+        """
+        if not self.usar_cache:
+            return self._executar_grupo(base, grupo)
+
+        inicio = time.time()
+        cache = self._obter_cache()
+        pasta_input = self.pasta_saida / base / "input"
+        assinatura = None
+
+        try:
+            diretorio = Path(self.dados_path)
+            fontes = [(arquivo_csv, self._encontrar_arquivo_original(diretorio, base, arquivo_csv))
+                      for arquivo_csv in grupo]
+            assinatura = cache.assinatura(fontes)
+            hash_grupo = hash_campos(self.campos_obrigatorios, grupo, self._opcoes_cache(grupo))
+
+            registro = cache.consultar(base, grupo, assinatura, hash_grupo, self.modo_processamento)
+            if registro and all((pasta_input / saida).exists() for saida in registro['saidas']):
+                parciais = registro['parciais']
+                for parcial in parciais:
+                    parcial['cache'] = True
+                    parcial['mensagens'] = []
+                    parcial['tempo'] = (time.time() - inicio) / len(parciais)
+                return parciais
+        except Exception as e:
+            # Falha no cache nunca impede a validação
+            logging.warning(f"⚠️ Cache de validação indisponível ({base}): {e}")
+            assinatura = None
+
+        parciais = self._executar_grupo(base, grupo)
+
+        if assinatura is not None:
+            try:
+                saidas = [arquivo_csv for arquivo_csv in grupo if (pasta_input / arquivo_csv).exists()]
+                cache.gravar(base, grupo, assinatura, hash_grupo, self.modo_processamento, parciais, saidas)
+            except Exception as e:
+                logging.warning(f"⚠️ Não foi possível gravar cache de validação ({base}): {e}")
+
+        return parciais
+
+    def _executar_grupo(self, base: str, grupo: List[str]) -> List[Dict]:
+        """Copia, valida e (no modo completo) analisa os arquivos do grupo"""
+        diretorio = Path(self.dados_path)
+        pasta_input = self.pasta_saida / base / "input"
+        pasta_input.mkdir(parents=True, exist_ok=True)
+
+        parciais = []
+        analises: Dict[str, Dict] = {}  # arquivo -> análises feitas durante a derivação
+        for arquivo_csv in grupo:
+            inicio = time.time()
+            parcial = {
+                'arquivo': arquivo_csv,
+                'encontrado': False,
+                'valido': False,
+                'campos_faltantes': [],
+                'problemas': [],
+                'mensagens': [],
+                'tempo': 0
+            }
+            campos_obrigatorios = self.campos_obrigatorios.get(arquivo_csv, [])
+
+            try:
+                arquivo_original = self._encontrar_arquivo_original(diretorio, base, arquivo_csv)
+
+                if arquivo_original:
+                    # Arquivo também presente nos dados (ex.: vazao-ilhas.csv próprio): a cópia
+                    # dele substitui o derivado, e a análise do derivado deixa de valer
+                    analises.pop(arquivo_csv, None)
+                    arquivo_destino = pasta_input / arquivo_csv
+                    derivacoes = self._derivacoes_arquivo(arquivo_csv, grupo)
+                    if derivacoes:
+                        # Cópia e derivados (ex.: vazao-ilhas.csv) na mesma leitura
+                        analises.update(self._copiar_derivando(arquivo_original, arquivo_destino, derivacoes,
+                                                               parcial['mensagens']))
+                    elif not self._copiar_analisando(arquivo_original, arquivo_destino, parcial):
+                        # Copia arquivo preservando encoding
+                        self._copiar_arquivo_preservando_encoding(arquivo_original, arquivo_destino)
+
+                    # Validação rápida de campos obrigatórios
+                    if campos_obrigatorios:
+                        parcial['campos_faltantes'] = self._validar_campos_rapido(arquivo_destino, campos_obrigatorios)
+                    parcial['valido'] = not parcial['campos_faltantes']
+                    parcial['encontrado'] = True
+
+                else:
+                    parcial['problemas'].append(f"Arquivo {arquivo_csv} não encontrado")
+
+            except Exception as e:
+                parcial['problemas'].append(f"Erro ao processar {arquivo_csv}: {e}")
+
+            parcial['tempo'] = time.time() - inicio
+            parciais.append(parcial)
+
+        # Origem e derivados analisados com os blocos gravados na derivação (só os
+        # arquivos que a derivação produziu; os copiados dos dados têm análise própria)
+        for parcial in parciais:
+            for chave, valor in analises.get(parcial['arquivo'], {}).items():
+                parcial.setdefault(chave, valor)
+
+        # Cabeçalhos dos arquivos gerados (perfil já em cache após a validação)
+        for parcial in parciais:
+            arquivo_path = pasta_input / parcial['arquivo']
+            if arquivo_path.exists():
+                try:
+                    parcial['colunas'] = perfil_arquivo(arquivo_path)['colunas']
+                except Exception:
+                    pass
+
+        # Conteúdo das colunas obrigatórias (inclui derivados criados no grupo)
+        if self._conteudo_ativo():
+            for parcial in parciais:
+                arquivo_path = pasta_input / parcial['arquivo']
+                campos_obrigatorios = self.campos_obrigatorios.get(parcial['arquivo'], [])
+                if not campos_obrigatorios or 'conteudo' in parcial or not arquivo_path.exists():
+                    continue
+                inicio_conteudo = time.time()
+                try:
+                    parcial['conteudo'] = self._validar_conteudo_arquivo(arquivo_path, campos_obrigatorios)
+                except Exception as e:
+                    parcial['mensagens'].append((f"⚠️ Erro ao validar conteúdo de {parcial['arquivo']}: {e}", "INFO"))
+                parcial['tempo'] += time.time() - inicio_conteudo
+
+        # Análise estatística de cada arquivo (inclui derivados criados no grupo)
+        if self.modo_processamento == "completo":
+            for parcial in parciais:
+                if 'estatisticas' in parcial:
+                    continue
+                inicio_stats = time.time()
+                arquivo_path = pasta_input / parcial['arquivo']
+                if arquivo_path.exists():
+                    try:
+                        parcial['estatisticas'] = self._analisar_estatisticas_arquivo(arquivo_path)
+                    except Exception as e:
+                        parcial['mensagens'].append((f"⚠️ Erro ao analisar estatísticas de {parcial['arquivo']}: {e}", "INFO"))
+                parcial['tempo_estatisticas'] = time.time() - inicio_stats
+
+        return parciais
+
+    def _registrar_resultado(self, base: str, parciais: List[Dict],
+                             integridade: Optional[List[Dict]] = None) -> Dict:
+        """Consolida os parciais da base, gera relatórios e guarda o resultado"""
+        resultado = self._montar_resultado(base, parciais, integridade)
+        if resultado['arquivos_em_cache']:
+            self.log(f"♻️ {base}: {resultado['arquivos_em_cache']} arquivo(s) sem alteração reaproveitados do cache")
+        self.resultados_validacao[base] = resultado
+        self._catalogar_cabecalhos(base, parciais)
+        return resultado
+
+    def _montar_resultado(self, base: str, parciais: List[Dict],
+                          integridade: Optional[List[Dict]] = None) -> Dict:
+        """Monta o resultado da base a partir dos parciais, na ordem do template
+
+        integridade: resultado já calculado no pool (None = verificar aqui, se ativa)
+        """
+        ordem = {arquivo_csv: i for i, arquivo_csv in enumerate(self.campos_obrigatorios.keys())}
+        parciais = sorted(parciais, key=lambda p: ordem.get(p['arquivo'], len(ordem)))
+
+        resultado = {
+            'base': base,
+            'arquivos_processados': 0,
+            'arquivos_validos': 0,
+            'total_arquivos': len(self.campos_obrigatorios),
+            'problemas': [],
+            'campos_faltantes': {},
+            'tempo_processamento': 0,
+            'arquivos_em_cache': sum(1 for parcial in parciais if parcial.get('cache') and parcial['encontrado'])
+        }
+
+        for parcial in parciais:
+            for mensagem, nivel in parcial['mensagens']:
+                self.log(mensagem, nivel)
+
+            resultado['problemas'].extend(parcial['problemas'])
+            resultado['tempo_processamento'] += parcial['tempo']
+            if parcial['encontrado']:
+                resultado['arquivos_processados'] += 1
+                if parcial['valido']:
+                    resultado['arquivos_validos'] += 1
+                else:
+                    resultado['campos_faltantes'][parcial['arquivo']] = parcial['campos_faltantes']
+
+        conteudo = {parcial['arquivo']: parcial['conteudo'] for parcial in parciais if 'conteudo' in parcial}
+        if conteudo:
+            resultado['conteudo'] = conteudo
+
+        # Integridade referencial precisa de todos os arquivos da base prontos
+        if integridade is None and self._integridade_ativa():
+            integridade = self._verificar_integridade(base)
+        if integridade:
+            resultado['integridade'] = integridade
+
+        pasta_base = self.pasta_saida / base
+
+        if self.modo_processamento == "rapido":
+            # Gera relatório rápido
+            self._gerar_relatorio_rapido(resultado, pasta_base)
+            return resultado
+
+        # Adiciona análises estatísticas
+        resultado['estatisticas'] = {
+            parcial['arquivo']: parcial['estatisticas'] for parcial in parciais if 'estatisticas' in parcial
+        }
+        resultado['graficos_gerados'] = []
+        resultado['tempo_estatisticas'] = sum(parcial.get('tempo_estatisticas', 0) for parcial in parciais)
+
+        # Gera gráficos se solicitado
+        if resultado['estatisticas']:
+            inicio_graficos = time.time()
+            try:
+                graficos = self._gerar_graficos_base(resultado, pasta_base)
+                resultado['graficos_gerados'] = graficos
+            except Exception as e:
+                self.log(f"⚠️ Erro ao gerar gráficos: {e}")
+            resultado['tempo_estatisticas'] += time.time() - inicio_graficos
+
+        # Gera relatório completo
+        self._gerar_relatorio_completo(resultado, pasta_base)
+
+        return resultado
+
+    def _validar_campos_rapido(self, arquivo_path: Path, campos_obrigatorios: List[str]) -> List[str]:
+        """Validação rápida de campos obrigatórios"""
+        try:
+            # Cabeçalho vem do perfil do arquivo (cache compartilhado)
+            colunas = perfil_arquivo(arquivo_path)['colunas']
+            colunas_existentes = set(colunas)
+            indice = indice_colunas(colunas)
+            regras = self.esquema.arquivo(arquivo_path.name)
+
+            # Verifica campos faltantes (ou presentes só com alias/variação de nomenclatura)
+            campos_faltantes = [
+                campo for campo in campos_obrigatorios
+                if campo not in colunas_existentes
+                and not (regras and regras.campo_presente(campo, colunas_existentes))
+                and not indice.tem_similar(campo)
+            ]
+
+            return campos_faltantes
+
+        except Exception as e:
+            return [f"Erro ao validar: {e}"]
+
+    def _resolver_colunas(self, arquivo_csv: str, campos: List[str], colunas: List[str]) -> Dict[str, str]:
+        """Coluna real do arquivo para cada campo obrigatório (nome, alias ou variação)"""
+        colunas_existentes = set(colunas)
+        regras = self.esquema.arquivo(arquivo_csv)
+        indice = indice_colunas(colunas)
+        resolvidas = {}
+        for campo in campos:
+            if campo in colunas_existentes:
+                resolvidas[campo] = campo
+                continue
+            aliases = regras.aliases.get(campo, []) if regras else []
+            candidatas = [alias for alias in aliases if alias in colunas_existentes] or indice.similares(campo)
+            if candidatas:
+                resolvidas[campo] = candidatas[0]
+        return resolvidas
+
+    def _validar_conteudo_arquivo(self, arquivo_path: Path, campos_obrigatorios: List[str]) -> Dict:
+        """Vazios, tipo e padrão das colunas obrigatórias, linha a linha"""
+        from validacao_conteudo import validar_conteudo_arquivo
+
+        colunas = perfil_arquivo(arquivo_path)['colunas']
+        regras = self.esquema.arquivo(arquivo_path.name)
+        return validar_conteudo_arquivo(
+            arquivo_path,
+            self._resolver_colunas(arquivo_path.name, campos_obrigatorios, colunas),
+            tipos=regras.tipos if regras else None,
+            padroes=regras.padroes if regras else None,
+            pasta_colunar=self._pasta_colunar(arquivo_path.parent),
+        )
+
+    def _acumuladores_analise(self, destino: Path, perfil: Dict) -> Dict:
+        """Acumuladores das análises de uma saída, alimentados pela cópia que a grava
+
+        Vazio quando não há análise a fazer (cópia simples). Com o cache
+        colunar ativo o Arrow da saída é gravado a partir dos mesmos blocos.
+        """
+        campos_obrigatorios = self.campos_obrigatorios.get(destino.name, [])
+        acumuladores = {}
+        if self._conteudo_ativo() and campos_obrigatorios:
+            from validacao_conteudo import acumulador_conteudo
+
+            regras = self.esquema.arquivo(destino.name)
+            acumuladores['conteudo'] = acumulador_conteudo(
+                perfil,
+                self._resolver_colunas(destino.name, campos_obrigatorios, perfil['colunas']),
+                tipos=regras.tipos if regras else None,
+                padroes=regras.padroes if regras else None,
+            )
+        if self.modo_processamento == "completo":
+            from estatisticas_csv import AcumuladorEstatisticas
+
+            acumuladores['estatisticas'] = AcumuladorEstatisticas(perfil['colunas'])
+        if acumuladores and self.cache_colunar:
+            from cache_colunar import GravadorColunar, arrow_disponivel
+
+            if arrow_disponivel():
+                acumuladores['colunar'] = GravadorColunar(destino, self._pasta_colunar(destino.parent),
+                                                          perfil['colunas'])
+        return acumuladores
+
+    @staticmethod
+    def _alimentados(acumuladores: Dict) -> List:
+        """Acumuladores que recebem os blocos (sem colunas obrigatórias no arquivo não há conteúdo a ler)"""
+        return [a for chave, a in acumuladores.items() if chave != 'conteudo' or a.colunas]
+
+    @staticmethod
+    def _concluir_analise(acumuladores: Dict, completa: bool = True) -> Dict:
+        """Resultados das análises da saída; conclui (ou descarta) o Arrow gravado junto"""
+        colunar = acumuladores.get('colunar')
+        if colunar is not None:
+            try:
+                colunar.resultado() if completa else colunar.descartar()
+            except Exception:
+                pass  # sem cache colunar; as etapas seguintes leem o CSV
+        if not completa:
+            return {}
+        return {chave: acumulador.resultado() for chave, acumulador in acumuladores.items() if chave != 'colunar'}
+
+    def _copiar_analisando(self, origem: Path, destino: Path, parcial: Dict) -> bool:
+        """Copia o arquivo validando conteúdo e calculando estatísticas na mesma leitura
+
+        Retorna False quando não há análise a fazer na cópia (ou ela falhou);
+        nesse caso a cópia é feita à parte e cada etapa lê o arquivo copiado.
+        Com o cache colunar ativo o Arrow também é gravado dos blocos da cópia.
+        """
+        try:
+            perfil = perfil_arquivo(origem)
+            acumuladores = self._acumuladores_analise(destino, perfil)
+        except Exception:
+            return False
+        if not acumuladores:
+            return False
+
+        from pipeline_arquivo import copiar_analisando
+
+        try:
+            encoding_destino = copiar_analisando(origem, destino, perfil, self._alimentados(acumuladores),
+                                                 self.encoding_saida)
+        except Exception:
+            # A cópia é refeita à parte e cada etapa reporta o próprio erro
+            self._concluir_analise(acumuladores, completa=False)
+            return False
+
+        copiar_perfil(origem, destino, encoding=encoding_destino)
+        parcial.update(self._concluir_analise(acumuladores))
+        return True
+
+    def _verificar_integridade(self, base: str) -> List[Dict]:
+        """Chaves estrangeiras declaradas no esquema que não existem no arquivo referenciado"""
+        from integridade_referencial import VerificadorIntegridade
+
+        pasta_input = self.pasta_saida / base / "input"
+        verificador = VerificadorIntegridade(pasta_input, self._pasta_colunar(pasta_input))
+        resultados = []
+
+        def coluna_real(arquivo_csv: str, campo: str) -> Optional[str]:
+            arquivo_path = pasta_input / arquivo_csv
+            if not arquivo_path.exists():
+                return None
+            colunas = perfil_arquivo(arquivo_path)['colunas']
+            return self._resolver_colunas(arquivo_csv, [campo], colunas).get(campo)
+
+        for arquivo_csv, regras in self.esquema.arquivos.items():
+            if arquivo_csv not in self.campos_obrigatorios:
+                continue
+            for campo, (arquivo_ref, campo_ref) in regras.referencias.items():
+                inicio = time.time()
+                registro = {'arquivo': arquivo_csv, 'coluna': campo, 'referencia': f"{arquivo_ref}:{campo_ref}"}
+                try:
+                    registro.update(verificador.verificar(
+                        arquivo_csv, coluna_real(arquivo_csv, campo),
+                        arquivo_ref, coluna_real(arquivo_ref, campo_ref),
+                    ))
+                except Exception as e:
+                    registro['erro'] = str(e)
+                registro['tempo'] = time.time() - inicio
+                resultados.append(registro)
+
+        return resultados
+
+    def _campos_similares(self, campo1: str, campo2: str) -> bool:
+        """Comparação flexível usando utils_csv"""
+        return campos_similares_flex(campo1, campo2)
+
+    def _copiar_arquivo_preservando_encoding(self, origem: Path, destino: Path):
+        """Copia arquivo preservando encoding original
+
+        A cópia é feita em streaming; só há transcodificação se
+        ``encoding_saida`` estiver configurado.
+        """
+        encoding_destino = None
+        try:
+            # Encoding vem do perfil do arquivo (cache compartilhado)
+            encoding = perfil_arquivo(origem)['encoding']
+            encoding_destino = copiar_arquivo(origem, destino, encoding, self.encoding_saida)
+
+        except Exception as e:
+            # Fallback: copia binário
+            shutil.copy2(origem, destino)
+            encoding_destino = None
+
+        # Cópia tem o mesmo conteúdo: evita detectar tudo de novo no destino
+        copiar_perfil(origem, destino, encoding=encoding_destino)
+
+    def _derivacoes_arquivo(self, arquivo_csv: str, grupo: List[str]) -> List[str]:
+        """Arquivos do grupo derivados por colunas de arquivo_csv (ver esquema)"""
+        return [
+            derivado for derivado in self.esquema.arquivos_derivados.get(arquivo_csv, [])
+            if derivado in grupo and self.esquema.arquivos[derivado].colunas_derivadas
+        ]
+
+    def _copiar_derivando(self, origem: Path, destino: Path, derivacoes: List[str],
+                          mensagens: List[Tuple[str, str]]) -> Dict[str, Dict]:
+        """Copia o arquivo gravando os derivados por colunas em uma única leitura
+
+        Conteúdo e estatísticas da cópia e dos derivados são calculados com os
+        blocos gravados; retorna esses resultados por arquivo. Se faltar
+        alguma coluna da derivação, o arquivo é copiado sem alterações e os
+        derivados não são criados.
+        """
+        from derivacao_csv import derivar_colunas
+
+        pasta_destino = destino.parent
+        derivados = {pasta_destino / d: self.esquema.arquivos[d].colunas_derivadas for d in derivacoes}
+        remover = list(dict.fromkeys(
+            coluna for d in derivacoes for coluna in self.esquema.arquivos[d].remover_da_origem
+        ))
+        nomes = ", ".join(derivacoes)
+        acumuladores: Dict[Path, Dict] = {}
+
+        def analisar(caminho: Path, perfil: Dict) -> List:
+            try:
+                acumuladores[caminho] = self._acumuladores_analise(caminho, perfil)
+            except Exception:
+                return []  # a saída é analisada depois, lendo o arquivo
+            return self._alimentados(acumuladores[caminho])
+
+        try:
+            resultado = derivar_colunas(origem, destino, derivados, remover, self.encoding_saida, analisar)
+        except Exception as e:
+            mensagens.append((f"❌ Erro ao criar {nomes}: {e}", "INFO"))
+            resultado = {'ausentes': []}
+        else:
+            if 'registros' in resultado:
+                mensagens.append((f"✅ Arquivo {nomes} criado com {resultado['registros']} registros", "INFO"))
+                return {
+                    caminho.name: self._concluir_analise(acumuladores_saida, caminho in resultado['analisados'])
+                    for caminho, acumuladores_saida in acumuladores.items()
+                }
+            mensagens.append((f"⚠️ Coluna {', '.join(resultado['ausentes'])} não encontrada em {destino.name}", "INFO"))
+
+        # Sem derivação: cópia simples e nenhum derivado desatualizado na saída
+        for acumuladores_saida in acumuladores.values():
+            self._concluir_analise(acumuladores_saida, completa=False)
+        for caminho in derivados:
+            if caminho.exists():
+                caminho.unlink()
+        self._copiar_arquivo_preservando_encoding(origem, destino)
+        return {}
+
+    def _analisar_estatisticas_arquivo(self, arquivo_path: Path) -> Dict:
+        """Analisa estatísticas de um arquivo (leitura em blocos, memória constante)"""
+        try:
+            from estatisticas_csv import estatisticas_arquivo
+            return estatisticas_arquivo(arquivo_path, pasta_colunar=self._pasta_colunar(arquivo_path.parent))
+
+        except Exception as e:
+            return {'erro': str(e)}
+
+    # -----------------------------------------------------------------------
+    # Relatórios por base
+    # -----------------------------------------------------------------------
+    def _gerar_relatorio_rapido(self, resultado: Dict, pasta_base: Path):
+        """Gera relatório rápido da base"""
+        relatorio_path = pasta_base / f"relatorio_validacao_{resultado['base']}.md"
+
+        with open(relatorio_path, 'w', encoding='utf-8') as f:
+            f.write(f"# Relatório de Validação - Base {resultado['base']}\n\n")
+            f.write(f"**Data:** {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
+            f.write(f"**Modo:** Processamento Rápido ⚡\n")
+            f.write(f"**Tempo:** {resultado['tempo_processamento']:.2f} segundos\n\n")
+
+            f.write("## 📊 Resumo Executivo\n\n")
+            f.write(f"- **Arquivos Processados:** {resultado['arquivos_processados']}/{resultado['total_arquivos']}\n")
+            f.write(f"- **Arquivos Válidos:** {resultado['arquivos_validos']}/{resultado['total_arquivos']}\n")
+            f.write(f"- **Taxa de Sucesso:** {(resultado['arquivos_validos']/resultado['total_arquivos']*100):.1f}%\n")
+
+            if base_pronta(resultado):
+                f.write(f"- **Status:** ✅ {STATUS_PRONTO}\n\n")
+            else:
+                f.write(f"- **Status:** ❌ {STATUS_CORRECOES}\n\n")
+
+            if resultado['campos_faltantes']:
+                f.write("## ⚠️ Campos Obrigatórios Faltantes\n\n")
+                for arquivo, campos in resultado['campos_faltantes'].items():
+                    f.write(f"### {arquivo}\n")
+                    for campo in campos:
+                        f.write(f"- ❌ {campo}\n")
+                    f.write("\n")
+
+            if resultado['problemas']:
+                f.write("## 🚨 Problemas Detectados\n\n")
+                for problema in resultado['problemas']:
+                    f.write(f"- ❌ {problema}\n")
+                f.write("\n")
+
+            self._escrever_secao_conteudo(f, resultado)
+            self._escrever_secao_integridade(f, resultado)
+
+            f.write("## 📁 Localização dos Arquivos\n\n")
+            f.write(f"**Pasta de Saída:** `{pasta_base / 'input'}`\n\n")
+            f.write("Os arquivos processados estão disponíveis na pasta `input` desta base.\n")
+
+    def _escrever_secao_conteudo(self, f, resultado: Dict):
+        """Seção de conteúdo das colunas obrigatórias (se validado)"""
+        if not resultado.get('conteudo'):
+            return
+
+        f.write("## 🔎 Conteúdo das Colunas Obrigatórias\n\n")
+        for arquivo, conteudo in resultado['conteudo'].items():
+            f.write(f"### {arquivo} ({conteudo['registros']} registros)\n")
+            if not conteudo['problemas']:
+                f.write("- ✅ Todas as colunas obrigatórias preenchidas e no formato esperado\n\n")
+                continue
+
+            f.write("| Campo | Coluna | Vazios | % Vazios | Fora do tipo | Fora do padrão |\n")
+            f.write("|-------|--------|--------|----------|--------------|----------------|\n")
+            for campo, info in conteudo['colunas'].items():
+                f.write(f"| {campo} | {info['coluna']} | {info['vazios']} | {info['taxa_vazios']:.1f}% "
+                        f"| {info['fora_do_tipo']} | {info['fora_do_padrao']} |\n")
+            f.write("\n")
+
+            for campo, info in conteudo['colunas'].items():
+                if info['exemplos']:
+                    exemplos = ", ".join(
+                        f"linha {e['linha']} ({e['motivo']}{': ' + repr(e['valor']) if e['valor'] is not None else ''})"
+                        for e in info['exemplos']
+                    )
+                    f.write(f"- **{campo}:** {exemplos}\n")
+            f.write("\n")
+
+    def _escrever_secao_integridade(self, f, resultado: Dict):
+        """Seção de integridade referencial (se verificada)"""
+        if not resultado.get('integridade'):
+            return
+
+        f.write("## 🔗 Integridade Referencial\n\n")
+        f.write("| Arquivo | Coluna | Referência | Verificados | Órfãos | Chaves órfãs |\n")
+        f.write("|---------|--------|------------|-------------|--------|--------------|\n")
+        for item in resultado['integridade']:
+            if 'verificados' in item:
+                f.write(f"| {item['arquivo']} | {item['coluna']} | {item['referencia']} | {item['verificados']} "
+                        f"| {item['orfaos']} | {item['chaves_orfas_distintas']} |\n")
+            else:
+                motivo = item.get('ignorada') or f"erro: {item.get('erro')}"
+                f.write(f"| {item['arquivo']} | {item['coluna']} | {item['referencia']} | - | - | {motivo} |\n")
+        f.write("\n")
+
+        for item in resultado['integridade']:
+            if item.get('chaves_orfas'):
+                chaves = ", ".join(f"{chave} ({total}x)" for chave, total in item['chaves_orfas'])
+                f.write(f"- **{item['arquivo']}:{item['coluna']}** sem correspondência: {chaves}\n")
+        f.write("\n")
+
+    def _gerar_relatorio_completo(self, resultado: Dict, pasta_base: Path):
+        """Gera relatório completo da base"""
+        # Primeiro gera o relatório rápido
+        self._gerar_relatorio_rapido(resultado, pasta_base)
+
+        # Adiciona seções estatísticas
+        relatorio_path = pasta_base / f"relatorio_completo_{resultado['base']}.md"
+
+        with open(relatorio_path, 'w', encoding='utf-8') as f:
+            f.write(f"# Relatório Completo - Base {resultado['base']}\n\n")
+            f.write(f"**Data:** {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
+            f.write(f"**Modo:** Processamento Completo 📊\n")
+            f.write(f"**Tempo Total:** {resultado['tempo_processamento'] + resultado.get('tempo_estatisticas', 0):.2f} segundos\n\n")
+
+            # Seções do relatório rápido
+            f.write("## 📊 Resumo Executivo\n\n")
+            f.write(f"- **Arquivos Processados:** {resultado['arquivos_processados']}/{resultado['total_arquivos']}\n")
+            f.write(f"- **Arquivos Válidos:** {resultado['arquivos_validos']}/{resultado['total_arquivos']}\n")
+            f.write(f"- **Taxa de Sucesso:** {(resultado['arquivos_validos']/resultado['total_arquivos']*100):.1f}%\n")
+
+            # Adiciona estatísticas se disponíveis
+            if 'estatisticas' in resultado and resultado['estatisticas']:
+                f.write("\n## 📈 Análise Estatística Detalhada\n\n")
+                for arquivo, stats in resultado['estatisticas'].items():
+                    f.write(f"### {arquivo}\n")
+                    f.write(f"- **Registros:** {stats.get('total_registros', 'N/A')}\n")
+                    f.write(f"- **Colunas:** {stats.get('total_colunas', 'N/A')}\n")
+                    f.write(f"- **Campos Vazios:** {stats.get('campos_vazios', 'N/A')}\n")
+                    f.write(f"- **Taxa de Preenchimento:** {stats.get('taxa_preenchimento', 'N/A')}%\n\n")
+
+                    if stats.get('colunas'):
+                        f.write("| Coluna | Tipo | Vazios | Distintos | Mínimo | Máximo |\n")
+                        f.write("|--------|------|--------|-----------|--------|--------|\n")
+                        for coluna, info in stats['colunas'].items():
+                            f.write(f"| {coluna} | {info['tipo']} | {info['vazios']} | {info['distintos']} "
+                                    f"| {info['minimo'] if info['minimo'] is not None else ''} "
+                                    f"| {info['maximo'] if info['maximo'] is not None else ''} |\n")
+                        f.write("\n")
+
+            self._escrever_secao_conteudo(f, resultado)
+            self._escrever_secao_integridade(f, resultado)
+
+            if resultado.get('graficos_gerados'):
+                f.write("## 📊 Visualizações Geradas\n\n")
+                for grafico in resultado['graficos_gerados']:
+                    f.write(f"- {grafico}\n")
+                f.write("\n")
+
+    def _formatos_graficos(self) -> List[str]:
+        return ["png", "svg"] if self.graficos_svg else ["png"]
+
+    def _gerar_graficos_base(self, resultado: Dict, pasta_base: Path) -> List[str]:
+        """Gera gráficos para a base
+
+        Durante processar_bases com pool de processos o desenho é enviado ao
+        pool e os caminhos são devolvidos já (os arquivos ficam prontos antes
+        de processar_bases terminar).
+        """
+        graficos = []
+
+        try:
+            from graficos import pedido_grafico, caminhos_grafico, renderizar_grafico
+
+            # Gráfico de arquivos válidos vs total
+            pedido = pedido_grafico(
+                "status_arquivos",
+                {
+                    'base': resultado['base'],
+                    'validos': resultado['arquivos_validos'],
+                    'com_problemas': resultado['total_arquivos'] - resultado['arquivos_validos'],
+                },
+                pasta_base / "graficos" / "status_arquivos",
+                self.perfil_graficos,
+                self._formatos_graficos(),
+            )
+            if self._executor_graficos is not None:
+                futuro = self._executor_graficos.submit(renderizar_grafico, pedido)
+                self._graficos_pendentes.append((resultado['base'], futuro))
+                arquivos = caminhos_grafico(pedido)
+            else:
+                arquivos = renderizar_grafico(pedido)
+
+            graficos.extend(f"Status dos Arquivos: {arquivo}" for arquivo in arquivos)
+
+        except Exception as e:
+            self.log(f"⚠️ Erro ao gerar gráficos: {e}")
+
+        return graficos
+
+    # -----------------------------------------------------------------------
+    # Inconsistências de nomenclatura
+    # -----------------------------------------------------------------------
+    def _catalogar_cabecalhos(self, base: str, parciais: List[Dict]):
+        """Registra no catálogo os cabeçalhos da base e atualiza as inconsistências
+
+        Só os arquivos da base são reavaliados; uma base reprocessada
+        substitui as colunas que tinha registrado antes.
+        """
+        for parcial in parciais:
+            arquivo_csv = parcial['arquivo']
+            catalogo = self.catalogo_cabecalhos.setdefault(arquivo_csv, {})
+
+            for coluna in self.cabecalhos_bases.pop((base, arquivo_csv), []):
+                bases = catalogo.get(coluna)
+                if bases is not None:
+                    bases.discard(base)
+                    if not bases:
+                        del catalogo[coluna]
+
+            colunas = parcial.get('colunas')
+            if colunas is not None:
+                self.cabecalhos_bases[(base, arquivo_csv)] = colunas
+                for coluna in colunas:
+                    catalogo.setdefault(coluna, set()).add(base)
+
+            self._atualizar_inconsistencias_arquivo(arquivo_csv)
+
+    def _atualizar_inconsistencias_arquivo(self, arquivo_csv: str):
+        """Recalcula as inconsistências de um arquivo a partir do catálogo"""
+        campos_obrigatorios = self.campos_obrigatorios.get(arquivo_csv, [])
+        for campo_obrigatorio in campos_obrigatorios:
+            self.inconsistencias_nomenclatura.pop(f"{arquivo_csv}_{campo_obrigatorio}", None)
+
+        catalogo = self.catalogo_cabecalhos.get(arquivo_csv)
+        if not catalogo or not campos_obrigatorios:
+            return
+
+        ordem = {base: i for i, base in enumerate(self.bases_detectadas)}
+        indice = indice_colunas(catalogo.keys())
+        for campo_obrigatorio in campos_obrigatorios:
+            # Procura variações do campo obrigatório
+            variacoes = [
+                (coluna, sorted(catalogo[coluna], key=lambda b: (ordem.get(b, len(ordem)), b)))
+                for coluna in indice.similares(campo_obrigatorio)
+                if coluna != campo_obrigatorio
+            ]
+            if variacoes:
+                self.inconsistencias_nomenclatura[f"{arquivo_csv}_{campo_obrigatorio}"] = {
+                    'arquivo': arquivo_csv,
+                    'campo_obrigatorio': campo_obrigatorio,
+                    'variacoes': variacoes
+                }
+
+    def detectar_inconsistencias_nomenclatura(self) -> Dict[str, Dict]:
+        """Inconsistências de nomenclatura entre bases, a partir do catálogo de cabeçalhos
+
+        O catálogo é preenchido durante o processamento; nenhum arquivo é lido aqui.
+        """
+        self.inconsistencias_nomenclatura = {}
+        for arquivo_csv in self.campos_obrigatorios:
+            self._atualizar_inconsistencias_arquivo(arquivo_csv)
+        return self.inconsistencias_nomenclatura
+
+    def resumo_processamento(self) -> Dict:
+        """Resumo geral do processamento"""
+        total_bases = len(self.resultados_validacao)
+        bases_prontas = sum(1 for r in self.resultados_validacao.values() if base_pronta(r))
+
+        return {
+            'total_bases': total_bases,
+            'bases_prontas': bases_prontas,
+            'bases_com_problemas': total_bases - bases_prontas,
+            'inconsistencias': len(self.inconsistencias_nomenclatura),
+            'pasta_saida': str(self.pasta_saida)
+        }
+
+    # -----------------------------------------------------------------------
+    # Tabelas Excel e gráficos gerais
+    # -----------------------------------------------------------------------
+    def gerar_tabela_campos_obrigatorios(self) -> Path:
+        """Gera tabela Excel com campos obrigatórios e retorna o caminho"""
+        if not self.campos_obrigatorios:
+            raise ValueError("Template não analisado! Analise o template Excel primeiro.")
+
+        self.log("📋 Gerando tabela de campos obrigatórios...")
+
+        from planilhas_excel import salvar_planilhas
+
+        df_tabela = self.matriz_campos_obrigatorios()
+
+        # Salva Excel
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        excel_path = self.pasta_padrao / f"tabela_campos_obrigatorios_{timestamp}.xlsx"
+        salvar_planilhas({'Campos Obrigatórios': df_tabela}, excel_path)
+
+        self.log(f"✅ Tabela de campos obrigatórios salva: {excel_path}")
+        return excel_path
+
+    def _status_campos(self, arquivo_csv: str, campos: List[str], colunas: List[str]) -> np.ndarray:
+        """✅ campo presente (ou alias do esquema), ⚠️ presente com variação de nome, ❌ ausente"""
+        import numpy as np
+        import pandas as pd
+
+        exatos = pd.Series(campos, dtype=object).isin(colunas).to_numpy()
+        regras = self.esquema.arquivo(arquivo_csv)
+        if regras and regras.aliases:
+            colunas_existentes = set(colunas)
+            exatos = exatos | np.array([regras.campo_presente(campo, colunas_existentes) for campo in campos], dtype=bool)
+        indice = indice_colunas(colunas)
+        similares = np.array([
+            not exato and indice.tem_similar(campo)
+            for campo, exato in zip(campos, exatos)
+        ], dtype=bool)
+        return np.where(exatos, "✅", np.where(similares, "⚠️", "❌"))
+
+    def matriz_campos_obrigatorios(self) -> pd.DataFrame:
+        """Matriz campo obrigatório × base, calculada em memória
+
+        Os cabeçalhos vêm do catálogo montado durante o processamento e cada
+        cabeçalho distinto de um arquivo é comparado com os campos uma única
+        vez, já que bases diferentes costumam ter exatamente as mesmas colunas.
+        """
+        import numpy as np
+        import pandas as pd
+
+        linhas = [(arquivo_csv, campo) for arquivo_csv, campos in self.campos_obrigatorios.items()
+                  for campo in campos]
+        df_tabela = pd.DataFrame(linhas, columns=['Arquivo', 'Campo'])
+        df_tabela['Obrigatório'] = 'X'
+
+        status_por_cabecalho = {}
+
+        # Adiciona colunas para cada base processada
+        for base in self.bases_detectadas:
+            status_base_arquivos = []
+            for arquivo_csv, campos in self.campos_obrigatorios.items():
+                if not campos:
+                    continue
+                colunas = self.cabecalhos_bases.get((base, arquivo_csv))
+                if colunas is None:
+                    status_base_arquivos.append(np.full(len(campos), "❌", dtype=object))
+                    continue
+
+                chave = (arquivo_csv, tuple(colunas))
+                if chave not in status_por_cabecalho:
+                    status_por_cabecalho[chave] = self._status_campos(arquivo_csv, campos, colunas)
+                status_base_arquivos.append(status_por_cabecalho[chave])
+
+            df_tabela[f'Arquivos "{base}"'] = (
+                np.concatenate(status_base_arquivos) if status_base_arquivos else []
+            )
+
+        return df_tabela
+
+    def linhas_tabela_inconsistencias(self) -> List[Dict]:
+        """Linhas da tabela de inconsistências de nomenclatura"""
+        dados_tabela = []
+
+        for chave, inconsistencia in self.inconsistencias_nomenclatura.items():
+            for variacao, bases in inconsistencia['variacoes']:
+                dados_tabela.append({
+                    'Arquivo CSV': inconsistencia['arquivo'],
+                    'Campo Obrigatório': inconsistencia['campo_obrigatorio'],
+                    'Variação Encontrada': variacao,
+                    'Bases Afetadas': ', '.join(bases),
+                    'Tipo Problema': classificar_inconsistencia(inconsistencia['campo_obrigatorio'], variacao),
+                    'Recomendação': f"Padronizar para: {inconsistencia['campo_obrigatorio']}"
+                })
+
+        return dados_tabela
+
+    def gerar_tabela_inconsistencias(self) -> Path:
+        """Gera tabela Excel com inconsistências de nomenclatura e retorna o caminho"""
+        if not self.inconsistencias_nomenclatura:
+            raise ValueError("Nenhuma inconsistência detectada ou processamento não realizado.")
+
+        self.log("⚠️ Gerando tabela de inconsistências...")
+
+        import pandas as pd
+        from planilhas_excel import salvar_planilhas
+
+        # Cria DataFrame
+        df_inconsistencias = pd.DataFrame(self.linhas_tabela_inconsistencias())
+
+        # Salva Excel
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        excel_path = self.pasta_padrao / f"tabela_inconsistencias_{timestamp}.xlsx"
+        salvar_planilhas({'Inconsistências Nomenclatura': df_inconsistencias}, excel_path)
+
+        self.log(f"✅ Tabela de inconsistências salva: {excel_path}")
+        return excel_path
+
+    def gerar_relatorio_consolidado(self, exportar: Optional[str] = None) -> Dict[str, Path]:
+        """Gera o workbook consolidado de todas as bases e, opcionalmente, os fatos
+        em NDJSON ou Parquet para ferramentas de BI
+
+        Tudo sai dos resultados em memória; nenhum arquivo de dados é lido.
+        Retorna os caminhos gerados ('excel' e, se exportado, 'fatos').
+        """
+        if not self.resultados_validacao:
+            raise ValueError("Nenhum processamento realizado ainda.")
+
+        self.log("📚 Gerando relatório consolidado...")
+
+        from relatorio_consolidado import gerar_relatorio
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        destino_exportacao = None
+        if exportar == "ndjson":
+            destino_exportacao = self.pasta_padrao / f"fatos_validacao_{timestamp}.ndjson"
+        elif exportar == "parquet":
+            destino_exportacao = self.pasta_padrao / f"fatos_validacao_{timestamp}"
+
+        caminhos = gerar_relatorio(
+            self.resultados_validacao,
+            self.matriz_campos_obrigatorios(),
+            self.linhas_tabela_inconsistencias(),
+            self.pasta_padrao / f"relatorio_consolidado_{timestamp}.xlsx",
+            exportar=exportar,
+            destino_exportacao=destino_exportacao,
+        )
+
+        self.log(f"✅ Relatório consolidado salvo: {caminhos['excel']}")
+        if 'fatos' in caminhos:
+            self.log(f"✅ Fatos exportados ({exportar}): {caminhos['fatos']}")
+        return caminhos
+
+    def gerar_graficos_estatisticas(self) -> Path:
+        """Gera gráficos gerais e retorna a pasta onde foram salvos
+
+        São só dois gráficos pequenos: desenhados aqui mesmo (Figure/Agg),
+        sem pool de processos, cuja partida custaria mais que o desenho.
+        """
+        if not self.resultados_validacao:
+            raise ValueError("Nenhum processamento realizado ainda.")
+
+        self.log("📈 Gerando gráficos e estatísticas...")
+
+        from graficos import pedido_grafico, renderizar_grafico
+
+        # Cria pasta de gráficos
+        pasta_graficos = self.pasta_padrao / "graficos_gerais"
+        pasta_graficos.mkdir(parents=True, exist_ok=True)
+
+        resultados = self.resultados_validacao.values()
+        bases_com_problemas = sum(1 for r in resultados if r['problemas'])
+
+        pedidos = [
+            # Gráfico 1: Status das bases
+            pedido_grafico("status_bases", {
+                'bases': list(self.resultados_validacao.keys()),
+                'validos': [r['arquivos_validos'] for r in resultados],
+                'totais': [r['total_arquivos'] for r in resultados],
+            }, pasta_graficos / "status_bases", self.perfil_graficos, self._formatos_graficos()),
+            # Gráfico 2: Distribuição de problemas
+            pedido_grafico("distribuicao_problemas", {
+                'sem_problemas': len(self.resultados_validacao) - bases_com_problemas,
+                'com_problemas': bases_com_problemas,
+            }, pasta_graficos / "distribuicao_problemas", self.perfil_graficos, self._formatos_graficos()),
+        ]
+        for pedido in pedidos:
+            renderizar_grafico(pedido)
+
+        self.log(f"✅ Gráficos salvos em: {pasta_graficos}")
+        return pasta_graficos
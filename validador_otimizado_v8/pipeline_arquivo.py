@@ -0,0 +1,82 @@
+# pipeline_arquivo.py  ----------------------------------------------------------
+"""
+Cópia e análise de um arquivo CSV em uma única leitura.
+
+Os bytes lidos do arquivo de origem são gravados na cópia de saída à medida
+que o pandas os consome (transcodificados, se houver ``encoding_saida``), e
+cada bloco de linhas interpretado alimenta os acumuladores pedidos (conteúdo
+das colunas obrigatórias, estatísticas). Assim a origem, muitas vezes em uma
+pasta de rede, é lida uma vez só em vez de uma vez por etapa.
+"""
+import codecs
+import io
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from utils_csv import opcoes_leitura, mesmo_encoding, preservar_mtime, TAMANHO_BLOCO_COPIA
+
+# Linhas por bloco interpretado
+TAMANHO_CHUNK_LINHAS = 100_000
+
+# ---------------------------------------------------------------------------
+class _EspelhoBytes(io.RawIOBase):
+    """Leitura da origem que grava na saída tudo o que foi lido."""
+
+    def __init__(self, entrada, saida, encoding_origem: Optional[str] = None):
+        super().__init__()
+        self._entrada = entrada
+        self._saida = saida
+        # Saída em modo texto: os bytes são decodificados incrementalmente
+        self._decodificador = (codecs.getincrementaldecoder(encoding_origem)()
+                               if encoding_origem is not None else None)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        dados = self._entrada.read(len(buffer))
+        n = len(dados)
+        buffer[:n] = dados
+        self._gravar(dados, final=(n == 0))
+        return n
+
+    def _gravar(self, dados: bytes, final: bool = False):
+        if self._decodificador is None:
+            self._saida.write(dados)
+        else:
+            self._saida.write(self._decodificador.decode(dados, final=final))
+
+    def concluir(self):
+        """Copia o que o leitor não chegou a consumir."""
+        while self.readinto(bytearray(TAMANHO_BLOCO_COPIA)):
+            pass
+
+def copiar_analisando(origem: Path, destino: Path, perfil: dict, acumuladores: List,
+                      encoding_saida: Optional[str] = None,
+                      tamanho_chunk: Optional[int] = None) -> str:
+    """Copia origem para destino passando cada bloco de linhas aos acumuladores.
+
+    Cada acumulador recebe ``atualizar(chunk)`` com todas as colunas como
+    texto (mesmos blocos de pd.read_csv(dtype=str)). Retorna o encoding do
+    destino.
+    """
+    encoding_origem = perfil["encoding"]
+    transcodificar = encoding_saida is not None and not mesmo_encoding(encoding_origem, encoding_saida)
+    encoding_destino = encoding_saida if transcodificar else encoding_origem
+
+    with open(origem, "rb") as entrada, \
+         (open(destino, "w", encoding=encoding_saida, newline="") if transcodificar
+          else open(destino, "wb")) as saida:
+        espelho = _EspelhoBytes(entrada, saida, encoding_origem if transcodificar else None)
+        leitor = pd.read_csv(io.BufferedReader(espelho, TAMANHO_BLOCO_COPIA), dtype=str,
+                             chunksize=tamanho_chunk or TAMANHO_CHUNK_LINHAS, **opcoes_leitura(perfil))
+        with leitor:
+            for chunk in leitor:
+                for acumulador in acumuladores:
+                    acumulador.atualizar(chunk)
+        espelho.concluir()
+
+    preservar_mtime(origem, destino)
+    return encoding_destino
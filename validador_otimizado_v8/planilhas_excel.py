@@ -0,0 +1,71 @@
+# planilhas_excel.py  -----------------------------------------------------------
+"""
+Gravação das tabelas Excel dos relatórios.
+
+As planilhas são gravadas em streaming com o xlsxwriter (modo
+``constant_memory``: cada linha vai para o disco assim que é escrita) e a
+largura das colunas é calculada antes, de forma vetorizada, a partir do
+DataFrame. Sem o xlsxwriter instalado, o pandas grava com o openpyxl usando
+as mesmas larguras.
+"""
+import importlib.util
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+# Largura máxima de coluna (em caracteres) e folga somada ao maior valor
+LARGURA_MAXIMA = 50
+FOLGA_LARGURA = 2
+
+# Formato do cabeçalho (o mesmo usado pelo pandas.to_excel)
+FORMATO_CABECALHO = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+
+# ---------------------------------------------------------------------------
+def larguras_colunas(df: pd.DataFrame) -> List[int]:
+    """Largura de cada coluna: maior texto (valores e cabeçalho) + folga, limitada."""
+    larguras = []
+    for posicao, coluna in enumerate(df.columns):
+        tamanhos = df.iloc[:, posicao].astype("string").str.len()
+        maior = max(int(tamanhos.max()) if tamanhos.notna().any() else 0, len(str(coluna)))
+        larguras.append(min(maior + FOLGA_LARGURA, LARGURA_MAXIMA))
+    return larguras
+
+def _valores_nativos(df: pd.DataFrame) -> pd.DataFrame:
+    """Valores como objetos Python (sem escalares numpy); ausentes viram None."""
+    return df.astype(object).where(df.notna(), None)
+
+def _gravar_xlsxwriter(abas: Dict[str, pd.DataFrame], caminho: Path):
+    import xlsxwriter
+
+    opcoes = {"constant_memory": True, "strings_to_formulas": False, "strings_to_urls": False}
+    with xlsxwriter.Workbook(str(caminho), opcoes) as workbook:
+        formato_cabecalho = workbook.add_format(FORMATO_CABECALHO)
+        for aba, df in abas.items():
+            worksheet = workbook.add_worksheet(aba)
+            # Larguras antes das linhas: no modo streaming não há volta
+            for posicao, largura in enumerate(larguras_colunas(df)):
+                worksheet.set_column(posicao, posicao, largura)
+            worksheet.write_row(0, 0, [str(coluna) for coluna in df.columns], formato_cabecalho)
+            # Textos são gravados como texto (sem fórmulas/links); None = célula vazia
+            for linha, valores in enumerate(_valores_nativos(df).itertuples(index=False, name=None), start=1):
+                worksheet.write_row(linha, 0, valores)
+
+def _gravar_openpyxl(abas: Dict[str, pd.DataFrame], caminho: Path):
+    from openpyxl.utils import get_column_letter
+
+    with pd.ExcelWriter(caminho, engine="openpyxl") as writer:
+        for aba, df in abas.items():
+            df.to_excel(writer, sheet_name=aba, index=False)
+            worksheet = writer.sheets[aba]
+            for posicao, largura in enumerate(larguras_colunas(df), start=1):
+                worksheet.column_dimensions[get_column_letter(posicao)].width = largura
+
+def salvar_planilhas(abas: Dict[str, pd.DataFrame], caminho: Path):
+    """Grava um workbook com uma aba por DataFrame (na ordem do dicionário)."""
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    if importlib.util.find_spec("xlsxwriter") is not None:
+        _gravar_xlsxwriter(abas, caminho)
+    else:
+        _gravar_openpyxl(abas, caminho)
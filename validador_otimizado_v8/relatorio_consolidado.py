@@ -0,0 +1,156 @@
+# relatorio_consolidado.py  -----------------------------------------------------
+"""
+Relatório consolidado de todas as bases, montado a partir dos resultados em
+memória.
+
+Os fatos do processamento (situação de cada base, campos obrigatórios por
+base, inconsistências de nomenclatura, estatísticas e campos faltantes) são
+reunidos uma única vez em tabelas. Das mesmas tabelas saem o workbook Excel
+(uma aba por tabela, gravado de uma vez) e a exportação para ferramentas de
+BI: NDJSON (uma linha por fato, com o nome da tabela em ``tabela``) ou
+Parquet (um arquivo por tabela, requer pyarrow).
+"""
+import importlib.util
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from motor_validacao import base_pronta, status_base
+from planilhas_excel import salvar_planilhas
+
+FORMATOS_EXPORTACAO = ("ndjson", "parquet")
+
+# Tabelas de fatos (colunas em snake_case) e aba correspondente no Excel
+ABAS = {
+    "bases": "Resumo",
+    "campos": "Campos Obrigatórios",
+    "inconsistencias": "Inconsistências Nomenclatura",
+    "estatisticas": "Estatísticas",
+    "campos_faltantes": "Campos Faltantes",
+}
+
+COLUNAS = {
+    "bases": ["base", "status", "pronto", "arquivos_processados", "arquivos_validos",
+              "total_arquivos", "arquivos_em_cache", "problemas", "tempo_processamento"],
+    "campos": ["arquivo", "campo", "base", "status"],
+    "inconsistencias": ["arquivo", "campo_obrigatorio", "variacao", "bases", "tipo_problema"],
+    "estatisticas": ["base", "arquivo", "total_registros", "total_colunas",
+                     "campos_vazios", "taxa_preenchimento"],
+    "campos_faltantes": ["base", "arquivo", "campo"],
+}
+
+# Rótulos das colunas nas abas do Excel
+ROTULOS = {
+    "base": "Base",
+    "status": "Status",
+    "pronto": "Pronto",
+    "arquivos_processados": "Arquivos Processados",
+    "arquivos_validos": "Arquivos Válidos",
+    "total_arquivos": "Total de Arquivos",
+    "arquivos_em_cache": "Arquivos em Cache",
+    "problemas": "Problemas",
+    "tempo_processamento": "Tempo (s)",
+    "arquivo": "Arquivo",
+    "campo": "Campo",
+    "total_registros": "Registros",
+    "total_colunas": "Colunas",
+    "campos_vazios": "Campos Vazios",
+    "taxa_preenchimento": "Preenchimento (%)",
+}
+
+# ---------------------------------------------------------------------------
+def montar_fatos(resultados: Dict[str, Dict], matriz: pd.DataFrame,
+                 inconsistencias: List[Dict]) -> Dict[str, pd.DataFrame]:
+    """Tabelas de fatos a partir dos resultados por base, da matriz de campos
+    (motor.matriz_campos_obrigatorios) e das linhas de inconsistências
+    (motor.linhas_tabela_inconsistencias)."""
+    bases, estatisticas, faltantes = [], [], []
+    for base, resultado in resultados.items():
+        bases.append((
+            base, status_base(resultado), base_pronta(resultado),
+            resultado['arquivos_processados'], resultado['arquivos_validos'],
+            resultado['total_arquivos'], resultado.get('arquivos_em_cache', 0),
+            len(resultado['problemas']), round(resultado['tempo_processamento'], 3),
+        ))
+        for arquivo, stats in resultado.get('estatisticas', {}).items():
+            if 'erro' in stats:
+                continue
+            estatisticas.append((base, arquivo, stats['total_registros'], stats['total_colunas'],
+                                 stats['campos_vazios'], round(stats['taxa_preenchimento'], 2)))
+        faltantes.extend((base, arquivo, campo)
+                         for arquivo, campos in resultado['campos_faltantes'].items() for campo in campos)
+
+    # Matriz campo × base em formato longo (uma linha por campo e base)
+    colunas_bases = [c for c in matriz.columns if c.startswith('Arquivos "')]
+    campos = matriz.melt(id_vars=['Arquivo', 'Campo'], value_vars=colunas_bases,
+                         var_name='base', value_name='status')
+    campos['base'] = campos['base'].str.slice(len('Arquivos "'), -1)
+    campos = campos.rename(columns={'Arquivo': 'arquivo', 'Campo': 'campo'})
+
+    return {
+        "bases": pd.DataFrame(bases, columns=COLUNAS["bases"]),
+        "campos": campos[COLUNAS["campos"]],
+        "inconsistencias": pd.DataFrame(
+            [(linha['Arquivo CSV'], linha['Campo Obrigatório'], linha['Variação Encontrada'],
+              linha['Bases Afetadas'], linha['Tipo Problema']) for linha in inconsistencias],
+            columns=COLUNAS["inconsistencias"]),
+        "estatisticas": pd.DataFrame(estatisticas, columns=COLUNAS["estatisticas"]),
+        "campos_faltantes": pd.DataFrame(faltantes, columns=COLUNAS["campos_faltantes"]),
+    }
+
+def abas_excel(fatos: Dict[str, pd.DataFrame], matriz: pd.DataFrame,
+               inconsistencias: List[Dict]) -> Dict[str, pd.DataFrame]:
+    """Abas do workbook; matriz e inconsistências no mesmo layout das tabelas avulsas."""
+    abas = {}
+    for tabela, aba in ABAS.items():
+        if tabela == "campos":
+            abas[aba] = matriz
+        elif tabela == "inconsistencias":
+            abas[aba] = pd.DataFrame(inconsistencias, columns=[
+                'Arquivo CSV', 'Campo Obrigatório', 'Variação Encontrada',
+                'Bases Afetadas', 'Tipo Problema', 'Recomendação'])
+        else:
+            abas[aba] = fatos[tabela].rename(columns=ROTULOS)
+    return abas
+
+# ---------------------------------------------------------------------------
+def exportar_ndjson(fatos: Dict[str, pd.DataFrame], caminho: Path) -> Path:
+    """Um objeto JSON por linha: {"tabela": ..., <colunas da tabela>}."""
+    with open(caminho, "w", encoding="utf-8", newline="\n") as f:
+        for tabela, df in fatos.items():
+            for registro in df.to_dict(orient="records"):
+                registro = {chave: (valor.item() if hasattr(valor, "item") else valor)
+                            for chave, valor in registro.items()}
+                f.write(json.dumps({"tabela": tabela, **registro}, ensure_ascii=False) + "\n")
+    return caminho
+
+def exportar_parquet(fatos: Dict[str, pd.DataFrame], pasta: Path) -> Path:
+    """Um arquivo <tabela>.parquet por tabela de fatos (requer pyarrow)."""
+    if importlib.util.find_spec("pyarrow") is None:
+        raise ValueError("Exportação Parquet requer o pacote pyarrow")
+    pasta.mkdir(parents=True, exist_ok=True)
+    for tabela, df in fatos.items():
+        df.to_parquet(pasta / f"{tabela}.parquet", index=False)
+    return pasta
+
+def gerar_relatorio(resultados: Dict[str, Dict], matriz: pd.DataFrame, inconsistencias: List[Dict],
+                    excel_path: Path, exportar: Optional[str] = None,
+                    destino_exportacao: Optional[Path] = None) -> Dict[str, Path]:
+    """Monta os fatos uma vez, grava o workbook e (opcional) a exportação.
+
+    Retorna os caminhos gerados: {'excel': ..., 'fatos': ...}.
+    """
+    if exportar is not None and exportar not in FORMATOS_EXPORTACAO:
+        raise ValueError(f"Formato de exportação inválido: {exportar}")
+
+    fatos = montar_fatos(resultados, matriz, inconsistencias)
+    salvar_planilhas(abas_excel(fatos, matriz, inconsistencias), excel_path)
+    caminhos = {'excel': excel_path}
+
+    if exportar == "ndjson":
+        caminhos['fatos'] = exportar_ndjson(fatos, destino_exportacao)
+    elif exportar == "parquet":
+        caminhos['fatos'] = exportar_parquet(fatos, destino_exportacao)
+    return caminhos
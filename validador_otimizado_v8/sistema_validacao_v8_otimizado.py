@@ -9,53 +9,45 @@ Versão: 8.0 - Otimizada com Processamento Rápido/Completo
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-import pandas as pd
-import json
+import importlib.util
 import os
 import sys
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
 import logging
 from datetime import datetime
-import re
 import threading
 import subprocess
-import shutil
-import chardet
-import time
-# utils_csv: novas rotinas de detecção
-from utils_csv import (
-    detectar_encoding_robusto,
-    detectar_separador_automatico,
-    campos_similares_flex,
-)
 
-# Auto-instalação de dependências
-def instalar_dependencias():
-    """Instala dependências automaticamente se necessário"""
-    dependencias = [
-        'pandas', 'numpy', 'matplotlib', 'seaborn', 
-        'chardet', 'openpyxl', 'xlsxwriter'
-    ]
-    
-    for dep in dependencias:
-        try:
-            __import__(dep)
-        except ImportError:
-            print(f"📦 Instalando {dep}...")
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', dep])
+# Dependências externas (módulo -> pacote pip). Bibliotecas pesadas (pandas,
+# matplotlib, openpyxl) só são importadas quando usadas pelo motor.
+DEPENDENCIAS = {
+    'pandas': 'pandas',
+    'numpy': 'numpy',
+    'matplotlib': 'matplotlib',
+    'chardet': 'chardet',
+    'unidecode': 'unidecode',
+    'openpyxl': 'openpyxl',
+    'xlsxwriter': 'xlsxwriter',
+}
 
-# Instala dependências na primeira execução
-try:
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    import numpy as np
-except ImportError:
-    print("🔍 Verificando dependências...")
-    instalar_dependencias()
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    import numpy as np
+def dependencias_faltantes() -> List[str]:
+    """Pacotes ausentes, verificados sem importar os módulos"""
+    return [pacote for modulo, pacote in DEPENDENCIAS.items() if importlib.util.find_spec(modulo) is None]
+
+def instalar_dependencias(pacotes: List[str]):
+    """Instala as dependências informadas"""
+    for pacote in pacotes:
+        print(f"📦 Instalando {pacote}...")
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', pacote])
+
+# motor_validacao: processamento sem interface gráfica
+from motor_validacao import (
+    MotorValidacao,
+    JOBS_PADRAO,
+    base_pronta,
+)
+from eventos_interface import BarramentoEventos, INTERVALO_EVENTOS_MS
 
 class ValidadorLogisticoOtimizado:
     """Sistema de Validação de Dados Logísticos - Versão 8.0 Otimizada"""
@@ -88,17 +80,15 @@ class ValidadorLogisticoOtimizado:
         
     def inicializar_variaveis(self):
         """Inicializa todas as variáveis do sistema"""
+        # Eventos das threads de processamento para a interface
+        self.eventos = BarramentoEventos()
+        
+        # Motor de validação (toda a lógica sem interface gráfica)
+        self.motor = MotorValidacao(log=self.log_status)
+        
         # Caminhos e configurações
-        self.pasta_padrao = Path.home() / "Documents" / "ValidadorLogistico"
+        self.pasta_padrao = self.motor.pasta_padrao
         self.template_excel_path = None
-        self.dados_brutos_path = None
-        self.pasta_saida = None
-        
-        # Dados de análise
-        self.campos_obrigatorios = {}
-        self.bases_detectadas = []
-        self.resultados_validacao = {}
-        self.inconsistencias_nomenclatura = {}
         
         # Configurações de processamento
         self.modo_processamento = "rapido"  # "rapido" ou "completo"
@@ -167,6 +157,9 @@ class ValidadorLogisticoOtimizado:
         # Barra de status
         self.criar_barra_status()
         
+        # Leitura periódica dos eventos publicados pelas threads
+        self.root.after(INTERVALO_EVENTOS_MS, self._processar_eventos)
+        
     def criar_guia_prioridades(self):
         """Cria guia visual de prioridades dos botões"""
         guia_frame = tk.Frame(self.root, bg='#ecf0f1', height=60)
@@ -307,6 +300,28 @@ class ValidadorLogisticoOtimizado:
                                      "🔍 Análises avançadas",
                 bg='#f8d7da', font=('Arial', 9), justify='left').pack(anchor='w', padx=30, pady=(0,10))
         
+        # Processos paralelos
+        jobs_frame = ttk.Frame(processamento_frame)
+        jobs_frame.pack(fill='x', pady=(10,0))
+        
+        ttk.Label(jobs_frame, text="⚙️ Processos paralelos:", font=('Arial', 9)).pack(side='left')
+        
+        self.jobs_var = tk.IntVar(value=JOBS_PADRAO)
+        ttk.Spinbox(jobs_frame, from_=1, to=max(os.cpu_count() or 1, 1), textvariable=self.jobs_var, 
+                   width=5).pack(side='left', padx=10)
+        
+        self.usar_cache_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(jobs_frame, text="♻️ Reaproveitar arquivos sem alteração (cache)", 
+                       variable=self.usar_cache_var).pack(side='left', padx=10)
+        
+        self.cache_colunar_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(jobs_frame, text="🗃️ Cache colunar (Arrow)", 
+                       variable=self.cache_colunar_var).pack(side='left', padx=10)
+        
+        self.graficos_impressao_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(jobs_frame, text="🖨️ Gráficos para impressão (300 DPI)", 
+                       variable=self.graficos_impressao_var).pack(side='left', padx=10)
+        
         # Botões de processamento
         botoes_frame = ttk.Frame(processamento_frame)
         botoes_frame.pack(fill='x', pady=15)
@@ -375,6 +390,10 @@ class ValidadorLogisticoOtimizado:
                   command=self.gerar_tabela_inconsistencias,
                   style='Recomendado.TButton').pack(side='left', padx=(0,10))
         
+        ttk.Button(botoes_rel_frame, text="🟡 Relatório Consolidado (Excel)", 
+                  command=self.gerar_relatorio_consolidado,
+                  style='Recomendado.TButton').pack(side='left', padx=(0,10))
+        
         ttk.Button(botoes_rel_frame, text="🟢 Gráficos e Estatísticas (OPCIONAL)", 
                   command=self.gerar_graficos_estatisticas,
                   style='Opcional.TButton').pack(side='left')
@@ -455,22 +474,61 @@ class ValidadorLogisticoOtimizado:
         self.modo_label.pack(side='right', padx=10, pady=2)
         
     def log_status(self, mensagem: str, nivel: str = "INFO"):
-        """Registra status no log e interface"""
+        """Registra status no log e interface (pode ser chamado de qualquer thread)"""
         if nivel == "ERROR":
             logging.error(mensagem)
         else:
             logging.info(mensagem)
             
-        # Atualiza interface
-        if hasattr(self, 'status_label'):
-            self.status_label.config(text=mensagem)
-            
-        if hasattr(self, 'logs_text'):
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.logs_text.insert(tk.END, f"[{timestamp}] {mensagem}\n")
-            self.logs_text.see(tk.END)
+        # A interface é atualizada pela thread principal (_processar_eventos)
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.eventos.publicar('log', f"[{timestamp}] {mensagem}\n", mensagem)
+        
+    def _processar_eventos(self):
+        """Aplica na interface, em lote, os eventos publicados pelas threads"""
+        eventos, pendentes = self.eventos.drenar()
+        linhas_log = []
+        dialogos = []
+        # Erro em um evento não descarta o restante do lote
+        for tipo, dados in eventos:
+            try:
+                if tipo == 'log':
+                    linhas_log.append(dados[0])
+                    self.status_label.config(text=dados[1])
+                elif tipo == 'progresso':
+                    self.progress_var.set(dados[0])
+                elif tipo == 'rotulo_progresso':
+                    self.progress_label.config(text=dados[0])
+                elif tipo == 'base':
+                    self._atualizar_resultado_tree(*dados)
+                elif tipo == 'inconsistencias':
+                    self._atualizar_tree_inconsistencias(*dados)
+                elif tipo in ('resumo', 'mensagem'):
+                    dialogos.append((tipo, dados))
+            except Exception as e:
+                logging.error(f"Erro ao atualizar interface ({tipo}): {e}")
+                
+        # Um único insert/redesenho para todas as mensagens do lote
+        try:
+            if linhas_log:
+                self.logs_text.insert(tk.END, "".join(linhas_log))
+                self.logs_text.see(tk.END)
+        except Exception as e:
+            logging.error(f"Erro ao atualizar interface (log): {e}")
             
-        self.root.update_idletasks()
+        # Diálogos (modais) só depois de a interface refletir o lote
+        for tipo, dados in dialogos:
+            try:
+                if tipo == 'resumo':
+                    self._mostrar_resumo_processamento()
+                else:
+                    funcao, titulo, texto = dados
+                    getattr(messagebox, funcao)(titulo, texto)
+            except Exception as e:
+                logging.error(f"Erro ao atualizar interface ({tipo}): {e}")
+                
+        # Fila ainda cheia: próximo lote sem esperar o intervalo
+        self.root.after(1 if pendentes else INTERVALO_EVENTOS_MS, self._processar_eventos)
         
     def atualizar_opcao_dados(self):
         """Atualiza opções de localização de dados"""
@@ -524,61 +582,13 @@ class ValidadorLogisticoOtimizado:
             return
             
         try:
-            self.log_status("🔍 Analisando template Excel...")
-            
-            # Mapear abas Excel para arquivos CSV
-            mapeamento_abas = {
-                'Agendamentos': 'agend.csv',
-                'Veículos': 'Veiculos.csv',
-                'Produtos': 'produtos.csv',
-                'Pátios': 'patios.csv',
-                'Ilhas': 'ilhas.csv',
-                'Baias': 'baias.csv',
-                'Braços-Produtos': 'bracos-produtos.csv',
-                'Grades': 'grades.csv',
-                'Grades-Clientes': 'grades-clientes.csv',
-                'Grades-Produtos': 'grades-produtos.csv',
-                'Grades-Clientes-Produtos': 'grades-clientes-produtos.csv',
-                'Grades-Cotas-Clientes': 'grades-cotas-clientes.csv',
-                'Grades-Cotas-Produtos': 'grades-cotas-produtos.csv',
-                'Grades-Fixação-Horários': 'grades-fixacao-horarios.csv',
-                'Horários-Pátios': 'horarios-patios.csv',
-                'Produtos-Agend': 'produtos-agend.csv',
-                'EV': 'EV.csv',
-                'Vazão-Ilhas': 'vazao-ilhas.csv'
-            }
-            
-            self.campos_obrigatorios = {}
-            
-            # Lê arquivo Excel
-            excel_file = pd.ExcelFile(self.template_excel_path)
-            
-            for aba, arquivo_csv in mapeamento_abas.items():
-                if aba in excel_file.sheet_names:
-                    df = pd.read_excel(self.template_excel_path, sheet_name=aba)
-                    
-                    # Identifica campos com dados (não vazios)
-                    campos_com_dados = []
-                    for coluna in df.columns:
-                        if not df[coluna].isna().all() and not (df[coluna] == '').all():
-                            campos_com_dados.append(coluna)
-                    
-                    self.campos_obrigatorios[arquivo_csv] = campos_com_dados
-                    self.log_status(f"✅ {arquivo_csv}: {len(campos_com_dados)} campos obrigatórios")
-                else:
-                    self.campos_obrigatorios[arquivo_csv] = []
-                    self.log_status(f"⚠️ Aba '{aba}' não encontrada no template")
-            
-            total_campos = sum(len(campos) for campos in self.campos_obrigatorios.values())
-            arquivos_com_campos = len([arq for arq, campos in self.campos_obrigatorios.items() if len(campos) > 0])
-            
-            self.log_status(f"✅ Template analisado com sucesso!")
-            self.log_status(f"📊 {total_campos} campos obrigatórios em {arquivos_com_campos} arquivos")
+            campos_obrigatorios = self.motor.analisar_template(self.template_excel_path)
+            total_campos, arquivos_com_campos = self.motor.resumo_template()
             
             messagebox.showinfo("Sucesso", f"Template analisado com sucesso!\n\n"
                                f"• {total_campos} campos obrigatórios encontrados\n"
                                f"• {arquivos_com_campos} arquivos com campos obrigatórios\n"
-                               f"• {len(self.campos_obrigatorios)} arquivos mapeados")
+                               f"• {len(campos_obrigatorios)} arquivos mapeados")
             
         except Exception as e:
             self.log_status(f"❌ Erro ao analisar template: {e}", "ERROR")
@@ -596,49 +606,20 @@ class ValidadorLogisticoOtimizado:
             return
             
         try:
-            self.log_status("🎯 Detectando bases disponíveis...")
-            
-            bases = set()
-            
-            # Estrutura 1: BASE-arquivo.csv
-            for arquivo in diretorio.glob("*.csv"):
-                if '-' in arquivo.name:
-                    base = arquivo.name.split('-')[0]
-                    if self._verificar_base_valida(diretorio, base):
-                        bases.add(base)
+            bases_detectadas = self.motor.detectar_bases(diretorio)
             
-            # Estrutura 2: \\BASE\arquivo.csv
-            for pasta in diretorio.iterdir():
-                if pasta.is_dir():
-                    if self._verificar_pasta_base_valida(pasta):
-                        bases.add(pasta.name)
-            
-            self.bases_detectadas = sorted(list(bases))
-            
-            if self.bases_detectadas:
-                self.log_status(f"✅ {len(self.bases_detectadas)} bases detectadas: {', '.join(self.bases_detectadas)}")
+            if bases_detectadas:
                 messagebox.showinfo("Bases Detectadas", 
-                                   f"{len(self.bases_detectadas)} bases encontradas:\n\n" + 
-                                   "\n".join([f"• {base}" for base in self.bases_detectadas]))
+                                   f"{len(bases_detectadas)} bases encontradas:\n\n" + 
+                                   "\n".join([f"• {base}" for base in bases_detectadas]))
                 self._atualizar_tree_bases()
             else:
-                self.log_status("⚠️ Nenhuma base detectada")
                 messagebox.showwarning("Aviso", "Nenhuma base foi detectada no diretório especificado.")
                 
         except Exception as e:
             self.log_status(f"❌ Erro ao detectar bases: {e}", "ERROR")
             messagebox.showerror("Erro", f"Erro ao detectar bases:\n{e}")
             
-    def _verificar_base_valida(self, diretorio: Path, base: str) -> bool:
-        """Verifica se uma base é válida (tem arquivos suficientes)"""
-        arquivos_base = list(diretorio.glob(f"{base}-*.csv"))
-        return len(arquivos_base) >= 5  # Mínimo de 5 arquivos para ser considerada base válida
-        
-    def _verificar_pasta_base_valida(self, pasta: Path) -> bool:
-        """Verifica se uma pasta contém uma base válida"""
-        arquivos_csv = list(pasta.glob("*.csv"))
-        return len(arquivos_csv) >= 5  # Mínimo de 5 arquivos CSV
-        
     def _atualizar_tree_bases(self):
         """Atualiza tree view com bases detectadas"""
         # Limpa tree
@@ -646,402 +627,66 @@ class ValidadorLogisticoOtimizado:
             self.tree_bases.delete(item)
             
         # Adiciona bases
-        for base in self.bases_detectadas:
+        for base in self.motor.bases_detectadas:
             self.tree_bases.insert('', 'end', values=(base, 'Detectada', '-', '-', 'Aguardando processamento'))
             
     def processar_todas_bases(self):
         """Processa todas as bases detectadas"""
-        if not self.bases_detectadas:
+        if not self.motor.bases_detectadas:
             messagebox.showerror("Erro", "Nenhuma base detectada! Execute a detecção primeiro.")
             return
             
-        if not self.campos_obrigatorios:
+        if not self.motor.campos_obrigatorios:
             messagebox.showerror("Erro", "Template não analisado! Analise o template Excel primeiro.")
             return
             
         # Atualiza modo de processamento
         self.modo_processamento = self.modo_var.get()
+        self.motor.usar_cache = self.usar_cache_var.get()
+        self.motor.cache_colunar = self.cache_colunar_var.get()
+        self.motor.perfil_graficos = "impressao" if self.graficos_impressao_var.get() else "rascunho"
         
         if self.modo_processamento == "rapido":
             self.modo_label.config(text="Modo: Rápido ⚡", bg='#27ae60')
         else:
             self.modo_label.config(text="Modo: Completo 📊", bg='#e74c3c')
             
-        # Executa processamento em thread separada
-        thread = threading.Thread(target=self._processar_bases_thread)
+        # Executa processamento em thread separada (variáveis Tk lidas aqui)
+        thread = threading.Thread(target=self._processar_bases_thread, args=(self.jobs_var.get(),))
         thread.daemon = True
         thread.start()
         
-    def _processar_bases_thread(self):
-        """Thread para processamento das bases"""
+    def _processar_bases_thread(self, jobs: int):
+        """Thread para processamento das bases (só publica eventos para a interface)"""
         try:
-            total_bases = len(self.bases_detectadas)
+            total_bases = len(self.motor.bases_detectadas)
             
-            for i, base in enumerate(self.bases_detectadas):
-                self.log_status(f"🔄 Processando base {base} ({i+1}/{total_bases})...")
-                
-                # Atualiza progresso
-                progresso = (i / total_bases) * 100
-                self.progress_var.set(progresso)
-                self.progress_label.config(text=f"Processando {base}... ({i+1}/{total_bases})")
-                
-                # Processa base
-                if self.modo_processamento == "rapido":
-                    resultado = self._processar_base_rapido(base)
-                else:
-                    resultado = self._processar_base_completo(base)
-                    
-                self.resultados_validacao[base] = resultado
+            bases_processadas = self.motor.processar_bases(modo=self.modo_processamento, 
+                                                           jobs=jobs, 
+                                                           progresso=self._atualizar_progresso)
+            for i, (base, resultado) in enumerate(bases_processadas):
+                self.eventos.publicar('rotulo_progresso', f"Processado {base} ({i+1}/{total_bases} bases)")
                 
-                # Atualiza tree
-                self._atualizar_resultado_tree(base, resultado)
-                
-                # Pequena pausa para feedback visual
-                time.sleep(0.5)
+                # Atualiza trees (inconsistências já incluem esta base)
+                self.eventos.publicar('base', base, resultado)
+                self.eventos.publicar('inconsistencias', self.motor.linhas_tabela_inconsistencias())
                 
             # Finaliza processamento
-            self.progress_var.set(100)
-            self.progress_label.config(text="✅ Processamento concluído!")
-            
-            # Detecta inconsistências
-            self._detectar_inconsistencias_nomenclatura()
+            self.eventos.publicar('progresso', 100)
+            self.eventos.publicar('rotulo_progresso', "✅ Processamento concluído!")
             
             self.log_status("✅ Todas as bases foram processadas com sucesso!")
             
             # Mostra resumo
-            self._mostrar_resumo_processamento()
+            self.eventos.publicar('resumo')
             
         except Exception as e:
             self.log_status(f"❌ Erro durante processamento: {e}", "ERROR")
-            messagebox.showerror("Erro", f"Erro durante processamento:\n{e}")
+            self.eventos.publicar('mensagem', 'showerror', "Erro", f"Erro durante processamento:\n{e}")
             
-    def _processar_base_rapido(self, base: str) -> Dict:
-        """Processamento rápido - apenas validação essencial"""
-        diretorio = Path(self.dados_path_var.get())
-        
-        resultado = {
-            'base': base,
-            'arquivos_processados': 0,
-            'arquivos_validos': 0,
-            'total_arquivos': len(self.campos_obrigatorios),
-            'problemas': [],
-            'campos_faltantes': {},
-            'tempo_processamento': 0
-        }
-        
-        inicio = time.time()
-        
-        # Cria pasta de saída
-        pasta_base = self.pasta_padrao / "output" / base
-        pasta_input = pasta_base / "input"
-        pasta_input.mkdir(parents=True, exist_ok=True)
-        
-        # Processa cada arquivo
-        for arquivo_csv, campos_obrigatorios in self.campos_obrigatorios.items():
-            try:
-                arquivo_original = self._encontrar_arquivo_original(diretorio, base, arquivo_csv)
-                
-                if arquivo_original:
-                    # Copia arquivo preservando encoding
-                    arquivo_destino = pasta_input / arquivo_csv
-                    self._copiar_arquivo_preservando_encoding(arquivo_original, arquivo_destino)
-                    
-                    # Cria vazao-ilhas.csv se for ilhas.csv
-                    if arquivo_csv == "ilhas.csv":
-                        self._criar_vazao_ilhas(arquivo_destino, pasta_input)
-                    
-                    # Validação rápida de campos obrigatórios
-                    if campos_obrigatorios:
-                        campos_faltantes = self._validar_campos_rapido(arquivo_destino, campos_obrigatorios)
-                        if campos_faltantes:
-                            resultado['campos_faltantes'][arquivo_csv] = campos_faltantes
-                        else:
-                            resultado['arquivos_validos'] += 1
-                    else:
-                        resultado['arquivos_validos'] += 1
-                        
-                    resultado['arquivos_processados'] += 1
-                    
-                else:
-                    resultado['problemas'].append(f"Arquivo {arquivo_csv} não encontrado")
-                    
-            except Exception as e:
-                resultado['problemas'].append(f"Erro ao processar {arquivo_csv}: {e}")
-        
-        resultado['tempo_processamento'] = time.time() - inicio
-        
-        # Gera relatório rápido
-        self._gerar_relatorio_rapido(resultado, pasta_base)
-        
-        return resultado
-        
-    def _processar_base_completo(self, base: str) -> Dict:
-        """Processamento completo - com estatísticas e análises"""
-        # Primeiro faz processamento rápido
-        resultado = self._processar_base_rapido(base)
-        
-        # Adiciona análises estatísticas
-        inicio_stats = time.time()
-        
-        pasta_base = self.pasta_padrao / "output" / base
-        pasta_input = pasta_base / "input"
-        
-        resultado['estatisticas'] = {}
-        resultado['graficos_gerados'] = []
-        
-        # Análise estatística de cada arquivo
-        for arquivo_csv in self.campos_obrigatorios.keys():
-            arquivo_path = pasta_input / arquivo_csv
-            if arquivo_path.exists():
-                try:
-                    stats = self._analisar_estatisticas_arquivo(arquivo_path)
-                    resultado['estatisticas'][arquivo_csv] = stats
-                except Exception as e:
-                    self.log_status(f"⚠️ Erro ao analisar estatísticas de {arquivo_csv}: {e}")
-        
-        # Gera gráficos se solicitado
-        if resultado['estatisticas']:
-            try:
-                graficos = self._gerar_graficos_base(resultado, pasta_base)
-                resultado['graficos_gerados'] = graficos
-            except Exception as e:
-                self.log_status(f"⚠️ Erro ao gerar gráficos: {e}")
-        
-        resultado['tempo_estatisticas'] = time.time() - inicio_stats
-        
-        # Gera relatório completo
-        self._gerar_relatorio_completo(resultado, pasta_base)
-        
-        return resultado
-        
-    def _validar_campos_rapido(self, arquivo_path: Path, campos_obrigatorios: List[str]) -> List[str]:
-        """Validação rápida de campos obrigatórios"""
-        try:
-            # Detecta encoding
-            with open(arquivo_path, 'rb') as f:
-                raw_data = f.read(1024)
-                encoding = chardet.detect(raw_data)['encoding'] or 'utf-8'
-            
-            # Lê apenas o cabeçalho
-            df = pd.read_csv(arquivo_path, encoding=encoding, nrows=0)
-            colunas_existentes = set(df.columns)
-            
-            # Verifica campos faltantes
-            campos_faltantes = []
-            for campo in campos_obrigatorios:
-                if campo not in colunas_existentes:
-                    # Verifica variações de nomenclatura
-                    campo_encontrado = False
-                    for coluna in colunas_existentes:
-                        if self._campos_similares(campo, coluna):
-                            campo_encontrado = True
-                            break
-                    
-                    if not campo_encontrado:
-                        campos_faltantes.append(campo)
-            
-            return campos_faltantes
-            
-        except Exception as e:
-            return [f"Erro ao validar: {e}"]
-
-    def _campos_similares(self, campo1: str, campo2: str) -> bool:
-        """Comparação flexível usando utils_csv"""
-        return campos_similares_flex(campo1, campo2)
-
-    def _encontrar_arquivo_original(self, diretorio: Path, base: str, arquivo_csv: str) -> Optional[Path]:
-        """Encontra arquivo original da base"""
-        # Estrutura 1: BASE-arquivo.csv
-        arquivo_prefixo = diretorio / f"{base}-{arquivo_csv}"
-        if arquivo_prefixo.exists():
-            return arquivo_prefixo
-            
-        # Estrutura 2: \\BASE\arquivo.csv
-        arquivo_pasta = diretorio / base / arquivo_csv
-        if arquivo_pasta.exists():
-            return arquivo_pasta
-            
-        return None
-        
-    def _copiar_arquivo_preservando_encoding(self, origem: Path, destino: Path):
-        """Copia arquivo preservando encoding original"""
-        try:
-            # Detecta encoding
-            with open(origem, 'rb') as f:
-                raw_data = f.read()
-                encoding = chardet.detect(raw_data)['encoding'] or 'utf-8'
-            
-            # Lê com encoding detectado
-            with open(origem, 'r', encoding=encoding) as f:
-                conteudo = f.read()
-            
-            # Salva com mesmo encoding
-            with open(destino, 'w', encoding=encoding, newline='') as f:
-                f.write(conteudo)
-                
-        except Exception as e:
-            # Fallback: copia binário
-            shutil.copy2(origem, destino)
-            
-    def _criar_vazao_ilhas(self, arquivo_ilhas: Path, pasta_destino: Path):
-        """Cria arquivo vazao-ilhas.csv a partir de ilhas.csv"""
-        try:
-            # Detecta encoding
-            with open(arquivo_ilhas, 'rb') as f:
-                raw_data = f.read(1024)
-                encoding = chardet.detect(raw_data)['encoding'] or 'utf-8'
-            
-            # Lê arquivo ilhas
-            encoding = detectar_encoding_robusto(arquivo_ilhas)
-            sep = detectar_separador_automatico(arquivo_ilhas, encoding)
-            df = pd.read_csv(arquivo_ilhas, encoding=encoding, sep=sep)
-            
-            # Cria vazao-ilhas com estrutura específica
-            if 'VazaoMaxima(p95)' in df.columns:
-                vazao_df = df[['Codigo', 'DescricaoPatio', 'VazaoMaxima(p95)']].copy()
-                
-                # Remove coluna VazaoMaxima(p95) do arquivo ilhas original
-                df_ilhas_sem_vazao = df.drop('VazaoMaxima(p95)', axis=1)
-                df_ilhas_sem_vazao.to_csv(arquivo_ilhas, index=False, encoding=encoding)
-                
-                # Salva vazao-ilhas
-                vazao_path = pasta_destino / "vazao-ilhas.csv"
-                vazao_df.to_csv(vazao_path, index=False, encoding=encoding)
-                
-                self.log_status(f"✅ Arquivo vazao-ilhas.csv criado com {len(vazao_df)} registros")
-            else:
-                self.log_status("⚠️ Coluna VazaoMaxima(p95) não encontrada em ilhas.csv")
-                
-        except Exception as e:
-            self.log_status(f"❌ Erro ao criar vazao-ilhas.csv: {e}")
-            
-    def _gerar_relatorio_rapido(self, resultado: Dict, pasta_base: Path):
-        """Gera relatório rápido da base"""
-        relatorio_path = pasta_base / f"relatorio_validacao_{resultado['base']}.md"
-        
-        with open(relatorio_path, 'w', encoding='utf-8') as f:
-            f.write(f"# Relatório de Validação - Base {resultado['base']}\n\n")
-            f.write(f"**Data:** {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
-            f.write(f"**Modo:** Processamento Rápido ⚡\n")
-            f.write(f"**Tempo:** {resultado['tempo_processamento']:.2f} segundos\n\n")
-            
-            f.write("## 📊 Resumo Executivo\n\n")
-            f.write(f"- **Arquivos Processados:** {resultado['arquivos_processados']}/{resultado['total_arquivos']}\n")
-            f.write(f"- **Arquivos Válidos:** {resultado['arquivos_validos']}/{resultado['total_arquivos']}\n")
-            f.write(f"- **Taxa de Sucesso:** {(resultado['arquivos_validos']/resultado['total_arquivos']*100):.1f}%\n")
-            
-            if resultado['arquivos_validos'] == resultado['total_arquivos']:
-                f.write(f"- **Status:** ✅ PRONTO PARA PARSER\n\n")
-            else:
-                f.write(f"- **Status:** ❌ REQUER CORREÇÕES NO MDRIVER\n\n")
-            
-            if resultado['campos_faltantes']:
-                f.write("## ⚠️ Campos Obrigatórios Faltantes\n\n")
-                for arquivo, campos in resultado['campos_faltantes'].items():
-                    f.write(f"### {arquivo}\n")
-                    for campo in campos:
-                        f.write(f"- ❌ {campo}\n")
-                    f.write("\n")
-            
-            if resultado['problemas']:
-                f.write("## 🚨 Problemas Detectados\n\n")
-                for problema in resultado['problemas']:
-                    f.write(f"- ❌ {problema}\n")
-                f.write("\n")
-            
-            f.write("## 📁 Localização dos Arquivos\n\n")
-            f.write(f"**Pasta de Saída:** `{pasta_base / 'input'}`\n\n")
-            f.write("Os arquivos processados estão disponíveis na pasta `input` desta base.\n")
-            
-    def _gerar_relatorio_completo(self, resultado: Dict, pasta_base: Path):
-        """Gera relatório completo da base"""
-        # Primeiro gera o relatório rápido
-        self._gerar_relatorio_rapido(resultado, pasta_base)
-        
-        # Adiciona seções estatísticas
-        relatorio_path = pasta_base / f"relatorio_completo_{resultado['base']}.md"
-        
-        with open(relatorio_path, 'w', encoding='utf-8') as f:
-            f.write(f"# Relatório Completo - Base {resultado['base']}\n\n")
-            f.write(f"**Data:** {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
-            f.write(f"**Modo:** Processamento Completo 📊\n")
-            f.write(f"**Tempo Total:** {resultado['tempo_processamento'] + resultado.get('tempo_estatisticas', 0):.2f} segundos\n\n")
-            
-            # Seções do relatório rápido
-            f.write("## 📊 Resumo Executivo\n\n")
-            f.write(f"- **Arquivos Processados:** {resultado['arquivos_processados']}/{resultado['total_arquivos']}\n")
-            f.write(f"- **Arquivos Válidos:** {resultado['arquivos_validos']}/{resultado['total_arquivos']}\n")
-            f.write(f"- **Taxa de Sucesso:** {(resultado['arquivos_validos']/resultado['total_arquivos']*100):.1f}%\n")
-            
-            # Adiciona estatísticas se disponíveis
-            if 'estatisticas' in resultado and resultado['estatisticas']:
-                f.write("\n## 📈 Análise Estatística Detalhada\n\n")
-                for arquivo, stats in resultado['estatisticas'].items():
-                    f.write(f"### {arquivo}\n")
-                    f.write(f"- **Registros:** {stats.get('total_registros', 'N/A')}\n")
-                    f.write(f"- **Colunas:** {stats.get('total_colunas', 'N/A')}\n")
-                    f.write(f"- **Campos Vazios:** {stats.get('campos_vazios', 'N/A')}\n")
-                    f.write(f"- **Taxa de Preenchimento:** {stats.get('taxa_preenchimento', 'N/A')}%\n\n")
-            
-            if resultado.get('graficos_gerados'):
-                f.write("## 📊 Visualizações Geradas\n\n")
-                for grafico in resultado['graficos_gerados']:
-                    f.write(f"- {grafico}\n")
-                f.write("\n")
-                
-    def _analisar_estatisticas_arquivo(self, arquivo_path: Path) -> Dict:
-        """Analisa estatísticas de um arquivo"""
-        try:
-            # Detecta encoding
-            with open(arquivo_path, 'rb') as f:
-                raw_data = f.read(1024)
-                encoding = chardet.detect(raw_data)['encoding'] or 'utf-8'
-
-            encoding = detectar_encoding_robusto(arquivo_path)
-            sep = detectar_separador_automatico(arquivo_path, encoding)
-            df = pd.read_csv(arquivo_path, encoding=encoding, sep=sep)
-            
-            stats = {
-                'total_registros': len(df),
-                'total_colunas': len(df.columns),
-                'campos_vazios': df.isnull().sum().sum(),
-                'taxa_preenchimento': ((df.size - df.isnull().sum().sum()) / df.size * 100) if df.size > 0 else 0
-            }
-            
-            return stats
-            
-        except Exception as e:
-            return {'erro': str(e)}
-            
-    def _gerar_graficos_base(self, resultado: Dict, pasta_base: Path) -> List[str]:
-        """Gera gráficos para a base"""
-        graficos = []
-        
-        try:
-            pasta_graficos = pasta_base / "graficos"
-            pasta_graficos.mkdir(exist_ok=True)
-            
-            # Gráfico de arquivos válidos vs total
-            plt.figure(figsize=(10, 6))
-            categorias = ['Válidos', 'Com Problemas']
-            valores = [resultado['arquivos_validos'], 
-                      resultado['total_arquivos'] - resultado['arquivos_validos']]
-            cores = ['#27ae60', '#e74c3c']
-            
-            plt.bar(categorias, valores, color=cores)
-            plt.title(f'Status dos Arquivos - Base {resultado["base"]}')
-            plt.ylabel('Quantidade de Arquivos')
-            
-            grafico_path = pasta_graficos / "status_arquivos.png"
-            plt.savefig(grafico_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            graficos.append(f"Status dos Arquivos: {grafico_path}")
-            
-        except Exception as e:
-            self.log_status(f"⚠️ Erro ao gerar gráficos: {e}")
-            
-        return graficos
+    def _atualizar_progresso(self, concluidas: int, total: int):
+        """Publica o percentual de tarefas concluídas (coalescido pela interface)"""
+        self.eventos.publicar('progresso', (concluidas / total) * 100 if total else 100)
         
     def _atualizar_resultado_tree(self, base: str, resultado: Dict):
         """Atualiza tree view com resultado do processamento"""
@@ -1049,7 +694,7 @@ class ValidadorLogisticoOtimizado:
         for item in self.tree_bases.get_children():
             valores = self.tree_bases.item(item, 'values')
             if valores[0] == base:
-                status = "✅ Pronto" if resultado['arquivos_validos'] == resultado['total_arquivos'] else "❌ Problemas"
+                status = "✅ Pronto" if base_pronta(resultado) else "❌ Problemas"
                 observacoes = f"{len(resultado['problemas'])} problemas" if resultado['problemas'] else "OK"
                 
                 self.tree_bases.item(item, values=(
@@ -1061,98 +706,40 @@ class ValidadorLogisticoOtimizado:
                 ))
                 break
                 
-    def _detectar_inconsistencias_nomenclatura(self):
-        """Detecta inconsistências de nomenclatura entre bases"""
-        self.inconsistencias_nomenclatura = {}
-        
-        # Coleta todos os campos encontrados por arquivo
-        campos_por_arquivo = {}
-        
-        for base, resultado in self.resultados_validacao.items():
-            pasta_input = self.pasta_padrao / "output" / base / "input"
-            
-            for arquivo_csv in self.campos_obrigatorios.keys():
-                arquivo_path = pasta_input / arquivo_csv
-                
-                if arquivo_path.exists():
-                    try:
-                        # Detecta encoding + separador de forma robusta
-                        encoding = detectar_encoding_robusto(arquivo_path)
-                        sep = detectar_separador_automatico(arquivo_path, encoding)
+    def _atualizar_tree_inconsistencias(self, linhas: List[Dict]):
+        """Atualiza tree view de inconsistências
 
-                        # Lê apenas o cabeçalho
-                        df = pd.read_csv(arquivo_path, encoding=encoding, sep=sep, nrows=0)
-                        
-                        if arquivo_csv not in campos_por_arquivo:
-                            campos_por_arquivo[arquivo_csv] = {}
-                            
-                        for coluna in df.columns:
-                            if coluna not in campos_por_arquivo[arquivo_csv]:
-                                campos_por_arquivo[arquivo_csv][coluna] = []
-                            campos_por_arquivo[arquivo_csv][coluna].append(base)
-                            
-                    except Exception as e:
-                        continue
-        
-        # Detecta inconsistências
-        for arquivo_csv, campos_obrigatorios in self.campos_obrigatorios.items():
-            if arquivo_csv in campos_por_arquivo:
-                for campo_obrigatorio in campos_obrigatorios:
-                    # Procura variações do campo obrigatório
-                    variações_encontradas = []
-                    
-                    for campo_encontrado, bases in campos_por_arquivo[arquivo_csv].items():
-                        if campo_encontrado != campo_obrigatorio and self._campos_similares(campo_obrigatorio, campo_encontrado):
-                            variações_encontradas.append((campo_encontrado, bases))
-                    
-                    if variações_encontradas:
-                        chave = f"{arquivo_csv}_{campo_obrigatorio}"
-                        self.inconsistencias_nomenclatura[chave] = {
-                            'arquivo': arquivo_csv,
-                            'campo_obrigatorio': campo_obrigatorio,
-                            'variacoes': variações_encontradas
-                        }
-        
-        # Atualiza tree de inconsistências
-        self._atualizar_tree_inconsistencias()
-        
-    def _atualizar_tree_inconsistencias(self):
-        """Atualiza tree view de inconsistências"""
+        ``linhas`` é uma cópia (motor.linhas_tabela_inconsistencias) feita na
+        thread de processamento, que continua alterando o dicionário do motor.
+        """
         # Limpa tree
         for item in self.tree_inconsistencias.get_children():
             self.tree_inconsistencias.delete(item)
         
         # Adiciona inconsistências
-        for chave, inconsistencia in self.inconsistencias_nomenclatura.items():
-            for variacao, bases in inconsistencia['variacoes']:
-                tipo_problema = "Espaçamento" if inconsistencia['campo_obrigatorio'].replace(' ', '') == variacao.replace(' ', '') else "Acentuação/Caracteres"
-                
-                self.tree_inconsistencias.insert('', 'end', values=(
-                    inconsistencia['arquivo'],
-                    inconsistencia['campo_obrigatorio'],
-                    variacao,
-                    ', '.join(bases),
-                    tipo_problema
-                ))
+        for linha in linhas:
+            self.tree_inconsistencias.insert('', 'end', values=(
+                linha['Arquivo CSV'],
+                linha['Campo Obrigatório'],
+                linha['Variação Encontrada'],
+                linha['Bases Afetadas'],
+                linha['Tipo Problema']
+            ))
                 
     def _mostrar_resumo_processamento(self):
         """Mostra resumo final do processamento"""
-        total_bases = len(self.resultados_validacao)
-        bases_prontas = sum(1 for r in self.resultados_validacao.values() 
-                           if r['arquivos_validos'] == r['total_arquivos'])
-        
-        inconsistencias = len(self.inconsistencias_nomenclatura)
+        resumo_motor = self.motor.resumo_processamento()
         
         resumo = f"""Processamento Concluído!
 
 📊 Resumo Geral:
-• {total_bases} bases processadas
-• {bases_prontas} bases prontas para parser
-• {total_bases - bases_prontas} bases com problemas
-• {inconsistencias} inconsistências de nomenclatura detectadas
+• {resumo_motor['total_bases']} bases processadas
+• {resumo_motor['bases_prontas']} bases prontas para parser
+• {resumo_motor['bases_com_problemas']} bases com problemas
+• {resumo_motor['inconsistencias']} inconsistências de nomenclatura detectadas
 
 📁 Resultados salvos em:
-{self.pasta_padrao / 'output'}
+{resumo_motor['pasta_saida']}
 
 🎯 Próximos Passos:
 1. Gere as tabelas Excel na aba Relatórios
@@ -1163,7 +750,7 @@ class ValidadorLogisticoOtimizado:
         
     def processar_base_especifica(self):
         """Processa uma base específica selecionada pelo usuário"""
-        if not self.bases_detectadas:
+        if not self.motor.bases_detectadas:
             messagebox.showerror("Erro", "Nenhuma base detectada!")
             return
             
@@ -1177,18 +764,22 @@ class ValidadorLogisticoOtimizado:
         tk.Label(dialog, text="Selecione a base para processar:", font=('Arial', 12)).pack(pady=10)
         
         listbox = tk.Listbox(dialog, font=('Arial', 10))
-        for base in self.bases_detectadas:
+        for base in self.motor.bases_detectadas:
             listbox.insert(tk.END, base)
         listbox.pack(fill='both', expand=True, padx=20, pady=10)
         
         def processar_selecionada():
             seleção = listbox.curselection()
             if seleção:
-                base_selecionada = self.bases_detectadas[seleção[0]]
+                base_selecionada = self.motor.bases_detectadas[seleção[0]]
                 dialog.destroy()
                 
                 # Processa base selecionada
-                thread = threading.Thread(target=self._processar_base_especifica_thread, args=(base_selecionada,))
+                self.motor.usar_cache = self.usar_cache_var.get()
+                self.motor.cache_colunar = self.cache_colunar_var.get()
+                self.motor.perfil_graficos = "impressao" if self.graficos_impressao_var.get() else "rascunho"
+                thread = threading.Thread(target=self._processar_base_especifica_thread,
+                                          args=(base_selecionada, self.modo_var.get(), self.jobs_var.get()))
                 thread.daemon = True
                 thread.start()
             else:
@@ -1196,115 +787,49 @@ class ValidadorLogisticoOtimizado:
         
         ttk.Button(dialog, text="Processar", command=processar_selecionada).pack(pady=10)
         
-    def _processar_base_especifica_thread(self, base: str):
-        """Thread para processar base específica"""
+    def _processar_base_especifica_thread(self, base: str, modo: str, jobs: int):
+        """Thread para processar base específica (só publica eventos para a interface)"""
         try:
             self.log_status(f"🔄 Processando base específica: {base}")
             
-            self.progress_var.set(0)
-            self.progress_label.config(text=f"Processando {base}...")
+            self.eventos.publicar('progresso', 0)
+            self.eventos.publicar('rotulo_progresso', f"Processando {base}...")
             
-            if self.modo_var.get() == "rapido":
-                resultado = self._processar_base_rapido(base)
-            else:
-                resultado = self._processar_base_completo(base)
-                
-            self.resultados_validacao[base] = resultado
-            self._atualizar_resultado_tree(base, resultado)
+            for _, resultado in self.motor.processar_bases([base], modo=modo, 
+                                                           jobs=jobs, 
+                                                           progresso=self._atualizar_progresso):
+                self.eventos.publicar('base', base, resultado)
+                self.eventos.publicar('inconsistencias', self.motor.linhas_tabela_inconsistencias())
             
-            self.progress_var.set(100)
-            self.progress_label.config(text=f"✅ Base {base} processada!")
+            self.eventos.publicar('progresso', 100)
+            self.eventos.publicar('rotulo_progresso', f"✅ Base {base} processada!")
             
             self.log_status(f"✅ Base {base} processada com sucesso!")
             
-            messagebox.showinfo("Sucesso", f"Base {base} processada com sucesso!\n\n"
-                               f"Arquivos válidos: {resultado['arquivos_validos']}/{resultado['total_arquivos']}")
+            self.eventos.publicar('mensagem', 'showinfo', "Sucesso", f"Base {base} processada com sucesso!\n\n"
+                                  f"Arquivos válidos: {resultado['arquivos_validos']}/{resultado['total_arquivos']}")
             
         except Exception as e:
             self.log_status(f"❌ Erro ao processar base {base}: {e}", "ERROR")
-            messagebox.showerror("Erro", f"Erro ao processar base {base}:\n{e}")
+            self.eventos.publicar('mensagem', 'showerror', "Erro", f"Erro ao processar base {base}:\n{e}")
+            
+    def _abrir_arquivo_sistema(self, caminho: Path):
+        """Abre arquivo ou pasta com o aplicativo padrão do sistema"""
+        if sys.platform == "win32":
+            os.startfile(caminho)
+        elif sys.platform == "darwin":
+            subprocess.run(["open", caminho])
+        else:
+            subprocess.run(["xdg-open", caminho])
             
     def gerar_tabela_campos_obrigatorios(self):
         """Gera tabela Excel com campos obrigatórios"""
-        if not self.campos_obrigatorios:
+        if not self.motor.campos_obrigatorios:
             messagebox.showerror("Erro", "Template não analisado! Analise o template Excel primeiro.")
             return
             
         try:
-            self.log_status("📋 Gerando tabela de campos obrigatórios...")
-            
-            # Prepara dados para tabela
-            dados_tabela = []
-            
-            for arquivo_csv, campos in self.campos_obrigatorios.items():
-                for campo in campos:
-                    linha = {
-                        'Arquivo': arquivo_csv,
-                        'Campo': campo,
-                        'Obrigatório': 'X'
-                    }
-                    
-                    # Adiciona colunas para cada base processada
-                    for base in self.bases_detectadas:
-                        if base in self.resultados_validacao:
-                            # Verifica se o campo existe na base
-                            pasta_input = self.pasta_padrao / "output" / base / "input"
-                            arquivo_path = pasta_input / arquivo_csv
-                            
-                            tem_campo = "❌"
-                            if arquivo_path.exists():
-                                try:
-                                    with open(arquivo_path, 'rb') as f:
-                                        raw_data = f.read(1024)
-                                        encoding = chardet.detect(raw_data)['encoding'] or 'utf-8'
-
-                                    encoding = detectar_encoding_robusto(arquivo_path)
-                                    sep = detectar_separador_automatico(arquivo_path, encoding)
-                                    df = pd.read_csv(arquivo_path, encoding=encoding, sep=sep, nrows=0)
-                                    if campo in df.columns:
-                                        tem_campo = "✅"
-                                    else:
-                                        # Verifica variações
-                                        for coluna in df.columns:
-                                            if self._campos_similares(campo, coluna):
-                                                tem_campo = "⚠️"
-                                                break
-                                except:
-                                    tem_campo = "❌"
-                            
-                            linha[f'Arquivos "{base}"'] = tem_campo
-                        else:
-                            linha[f'Arquivos "{base}"'] = "❌"
-                    
-                    dados_tabela.append(linha)
-            
-            # Cria DataFrame
-            df_tabela = pd.DataFrame(dados_tabela)
-            
-            # Salva Excel
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            excel_path = self.pasta_padrao / f"tabela_campos_obrigatorios_{timestamp}.xlsx"
-            
-            with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-                df_tabela.to_excel(writer, sheet_name='Campos Obrigatórios', index=False)
-                
-                # Formata planilha
-                worksheet = writer.sheets['Campos Obrigatórios']
-                
-                # Ajusta largura das colunas
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
-            
-            self.log_status(f"✅ Tabela de campos obrigatórios salva: {excel_path}")
+            excel_path = self.motor.gerar_tabela_campos_obrigatorios()
             
             messagebox.showinfo("Sucesso", f"Tabela de campos obrigatórios gerada!\n\n"
                                f"Arquivo: {excel_path.name}\n"
@@ -1313,12 +838,7 @@ class ValidadorLogisticoOtimizado:
             # Pergunta se quer abrir o arquivo
             if messagebox.askyesno("Abrir Arquivo", "Deseja abrir a tabela Excel gerada?"):
                 try:
-                    if sys.platform == "win32":
-                        os.startfile(excel_path)
-                    elif sys.platform == "darwin":
-                        subprocess.run(["open", excel_path])
-                    else:
-                        subprocess.run(["xdg-open", excel_path])
+                    self._abrir_arquivo_sistema(excel_path)
                 except Exception as e:
                     messagebox.showerror("Erro", f"Erro ao abrir arquivo:\n{e}")
             
@@ -1328,71 +848,23 @@ class ValidadorLogisticoOtimizado:
             
     def gerar_tabela_inconsistencias(self):
         """Gera tabela Excel com inconsistências de nomenclatura"""
-        if not self.inconsistencias_nomenclatura:
+        if not self.motor.inconsistencias_nomenclatura:
             messagebox.showwarning("Aviso", "Nenhuma inconsistência detectada ou processamento não realizado.")
             return
             
         try:
-            self.log_status("⚠️ Gerando tabela de inconsistências...")
-            
-            # Prepara dados para tabela
-            dados_tabela = []
-            
-            for chave, inconsistencia in self.inconsistencias_nomenclatura.items():
-                for variacao, bases in inconsistencia['variacoes']:
-                    tipo_problema = "Espaçamento" if inconsistencia['campo_obrigatorio'].replace(' ', '') == variacao.replace(' ', '') else "Acentuação/Caracteres"
-                    
-                    dados_tabela.append({
-                        'Arquivo CSV': inconsistencia['arquivo'],
-                        'Campo Obrigatório': inconsistencia['campo_obrigatorio'],
-                        'Variação Encontrada': variacao,
-                        'Bases Afetadas': ', '.join(bases),
-                        'Tipo Problema': tipo_problema,
-                        'Recomendação': f"Padronizar para: {inconsistencia['campo_obrigatorio']}"
-                    })
-            
-            # Cria DataFrame
-            df_inconsistencias = pd.DataFrame(dados_tabela)
-            
-            # Salva Excel
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            excel_path = self.pasta_padrao / f"tabela_inconsistencias_{timestamp}.xlsx"
-            
-            with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-                df_inconsistencias.to_excel(writer, sheet_name='Inconsistências Nomenclatura', index=False)
-                
-                # Formata planilha
-                worksheet = writer.sheets['Inconsistências Nomenclatura']
-                
-                # Ajusta largura das colunas
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
-            
-            self.log_status(f"✅ Tabela de inconsistências salva: {excel_path}")
+            excel_path = self.motor.gerar_tabela_inconsistencias()
+            total_inconsistencias = len(self.motor.linhas_tabela_inconsistencias())
             
             messagebox.showinfo("Sucesso", f"Tabela de inconsistências gerada!\n\n"
                                f"Arquivo: {excel_path.name}\n"
-                               f"Inconsistências encontradas: {len(dados_tabela)}\n"
+                               f"Inconsistências encontradas: {total_inconsistencias}\n"
                                f"Localização: {excel_path.parent}")
             
             # Pergunta se quer abrir o arquivo
             if messagebox.askyesno("Abrir Arquivo", "Deseja abrir a tabela Excel gerada?"):
                 try:
-                    if sys.platform == "win32":
-                        os.startfile(excel_path)
-                    elif sys.platform == "darwin":
-                        subprocess.run(["open", excel_path])
-                    else:
-                        subprocess.run(["xdg-open", excel_path])
+                    self._abrir_arquivo_sistema(excel_path)
                 except Exception as e:
                     messagebox.showerror("Erro", f"Erro ao abrir arquivo:\n{e}")
             
@@ -1400,63 +872,38 @@ class ValidadorLogisticoOtimizado:
             self.log_status(f"❌ Erro ao gerar tabela de inconsistências: {e}", "ERROR")
             messagebox.showerror("Erro", f"Erro ao gerar tabela:\n{e}")
             
-    def gerar_graficos_estatisticas(self):
-        """Gera gráficos e estatísticas avançadas"""
-        if not self.resultados_validacao:
+    def gerar_relatorio_consolidado(self):
+        """Gera workbook único com resumo, campos, inconsistências e estatísticas de todas as bases"""
+        if not self.motor.resultados_validacao:
             messagebox.showwarning("Aviso", "Nenhum processamento realizado ainda.")
             return
             
         try:
-            self.log_status("📈 Gerando gráficos e estatísticas...")
-            
-            # Cria pasta de gráficos
-            pasta_graficos = self.pasta_padrao / "graficos_gerais"
-            pasta_graficos.mkdir(exist_ok=True)
-            
-            # Gráfico 1: Status das bases
-            plt.figure(figsize=(12, 8))
-            
-            bases = list(self.resultados_validacao.keys())
-            arquivos_validos = [r['arquivos_validos'] for r in self.resultados_validacao.values()]
-            total_arquivos = [r['total_arquivos'] for r in self.resultados_validacao.values()]
-            
-            x = range(len(bases))
-            width = 0.35
-            
-            plt.bar([i - width/2 for i in x], arquivos_validos, width, label='Arquivos Válidos', color='#27ae60')
-            plt.bar([i + width/2 for i in x], total_arquivos, width, label='Total Arquivos', color='#3498db')
+            excel_path = self.motor.gerar_relatorio_consolidado()['excel']
             
-            plt.xlabel('Bases')
-            plt.ylabel('Quantidade de Arquivos')
-            plt.title('Status de Validação por Base')
-            plt.xticks(x, bases, rotation=45)
-            plt.legend()
-            plt.tight_layout()
-            
-            grafico1_path = pasta_graficos / "status_bases.png"
-            plt.savefig(grafico1_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            # Gráfico 2: Distribuição de problemas
-            plt.figure(figsize=(10, 6))
-            
-            total_problemas = sum(len(r['problemas']) for r in self.resultados_validacao.values())
-            bases_com_problemas = sum(1 for r in self.resultados_validacao.values() if r['problemas'])
-            bases_sem_problemas = len(self.resultados_validacao) - bases_com_problemas
+            messagebox.showinfo("Sucesso", f"Relatório consolidado gerado!\n\n"
+                               f"Arquivo: {excel_path.name}\n"
+                               f"Localização: {excel_path.parent}")
             
-            labels = ['Bases sem Problemas', 'Bases com Problemas']
-            sizes = [bases_sem_problemas, bases_com_problemas]
-            colors = ['#27ae60', '#e74c3c']
+            # Pergunta se quer abrir o arquivo
+            if messagebox.askyesno("Abrir Arquivo", "Deseja abrir o relatório Excel gerado?"):
+                try:
+                    self._abrir_arquivo_sistema(excel_path)
+                except Exception as e:
+                    messagebox.showerror("Erro", f"Erro ao abrir arquivo:\n{e}")
             
-            plt.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-            plt.title('Distribuição de Problemas nas Bases')
-            plt.axis('equal')
+        except Exception as e:
+            self.log_status(f"❌ Erro ao gerar relatório consolidado: {e}", "ERROR")
+            messagebox.showerror("Erro", f"Erro ao gerar relatório:\n{e}")
             
-            grafico2_path = pasta_graficos / "distribuicao_problemas.png"
-            plt.savefig(grafico2_path, dpi=300, bbox_inches='tight')
-            plt.close()
+    def gerar_graficos_estatisticas(self):
+        """Gera gráficos e estatísticas avançadas"""
+        if not self.motor.resultados_validacao:
+            messagebox.showwarning("Aviso", "Nenhum processamento realizado ainda.")
+            return
             
-            self.log_status(f"✅ Gráficos salvos em: {pasta_graficos}")
+        try:
+            pasta_graficos = self.motor.gerar_graficos_estatisticas()
             
             messagebox.showinfo("Sucesso", f"Gráficos e estatísticas gerados!\n\n"
                                f"Localização: {pasta_graficos}\n"
@@ -1474,7 +921,7 @@ class ValidadorLogisticoOtimizado:
             
     def abrir_pasta_resultados(self):
         """Abre pasta de resultados"""
-        pasta_output = self.pasta_padrao / "output"
+        pasta_output = self.motor.pasta_saida
         pasta_output.mkdir(exist_ok=True)
         
         try:
@@ -1605,12 +1052,23 @@ class ValidadorLogisticoOtimizado:
 
 def main():
     """Função principal"""
+    # Com argumentos: execução em lote pela linha de comando (sem interface)
+    if len(sys.argv) > 1:
+        from cli_validador import main as main_cli
+        sys.exit(main_cli(sys.argv[1:]))
+        
     try:
         print("🚀 Iniciando Sistema de Validação de Dados Logísticos v8.0...")
         print("⚡ Versão Otimizada com Processamento Rápido/Completo")
         print("🎯 Interface com Guia Visual de Prioridades")
         print()
         
+        # Primeira execução: instala o que faltar antes de abrir a interface
+        faltantes = dependencias_faltantes()
+        if faltantes:
+            print("🔍 Verificando dependências...")
+            instalar_dependencias(faltantes)
+        
         app = ValidadorLogisticoOtimizado()
         app.executar()
         
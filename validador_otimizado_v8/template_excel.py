@@ -0,0 +1,155 @@
+# template_excel.py  ------------------------------------------------------------
+"""
+Leitura dos campos obrigatórios do template Excel.
+
+O workbook é aberto uma única vez em modo somente leitura (openpyxl) e cada
+aba mapeada é percorrida linha a linha, sem montar DataFrame, com o mesmo
+resultado do pd.read_excel (cabeçalho, linhas em branco e colunas sem nome).
+O resultado fica em cache (JSON na pasta de cache) associado ao hash do
+template e do mapeamento, então um template sem alterações não é lido de novo.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils_csv import nomes_unicos
+
+VERSAO_CACHE_TEMPLATE = 2
+
+# Mesmos valores que o pandas trata como vazio ao ler uma planilha
+VALORES_VAZIOS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+}
+
+# ---------------------------------------------------------------------------
+def _vazio(valor) -> bool:
+    """Célula vazia (None, texto vazio ou marcador de ausência)."""
+    if valor is None:
+        return True
+    if isinstance(valor, str):
+        return valor in VALORES_VAZIOS
+    if isinstance(valor, float):
+        return valor != valor  # NaN
+    return False
+
+def _nome_coluna(valor, posicao: int):
+    """Nome da coluna como o pandas gera a partir do cabeçalho."""
+    if valor is None or valor == "":
+        return f"Unnamed: {posicao}"
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+def _aparar(linha) -> List:
+    """Valores da linha sem as células vazias à direita (como o pandas)."""
+    valores = list(linha)
+    while valores and (valores[-1] is None or valores[-1] == ""):
+        valores.pop()
+    return valores
+
+def _campos_preenchidos_aba(linhas) -> List:
+    """Colunas com ao menos um valor preenchido abaixo do cabeçalho.
+
+    Reproduz o pd.read_excel: o cabeçalho é a primeira linha da aba, mesmo em
+    branco (colunas "Unnamed: N"). A aba é lida inteira porque uma coluna sem
+    cabeçalho pode receber valor em qualquer linha.
+    """
+    cabecalho = None
+    preenchidas = set()
+    largura = 0
+    for linha in linhas:
+        valores = _aparar(linha)
+        largura = max(largura, len(valores))
+        if cabecalho is None:
+            cabecalho = valores
+            continue
+        for posicao, valor in enumerate(valores):
+            if posicao not in preenchidas and not _vazio(valor):
+                preenchidas.add(posicao)
+
+    if cabecalho is None:
+        return []
+
+    # Colunas sem cabeçalho à direita viram "Unnamed: N", como no pandas
+    cabecalho = cabecalho + [None] * (largura - len(cabecalho))
+    nomes = nomes_unicos([_nome_coluna(valor, i) for i, valor in enumerate(cabecalho)])
+    return [nomes[i] for i in sorted(preenchidas)]
+
+def ler_campos_template(caminho: Path, mapeamento: Dict[str, str]) -> Dict[str, Optional[List]]:
+    """Campos obrigatórios por arquivo CSV; None quando a aba não existe."""
+    caminho = Path(caminho)
+    campos: Dict[str, Optional[List]] = {}
+
+    if caminho.suffix.lower() == ".xls":
+        # Formato antigo: openpyxl não lê; o pandas abre o arquivo uma vez
+        import pandas as pd
+
+        with pd.ExcelFile(caminho) as excel:
+            for aba, arquivo_csv in mapeamento.items():
+                if aba not in excel.sheet_names:
+                    campos[arquivo_csv] = None
+                    continue
+                df = excel.parse(aba)
+                campos[arquivo_csv] = [
+                    coluna for coluna in df.columns
+                    if not df[coluna].isna().all() and not (df[coluna] == '').all()
+                ]
+        return campos
+
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        for aba, arquivo_csv in mapeamento.items():
+            if aba not in workbook.sheetnames:
+                campos[arquivo_csv] = None
+                continue
+            planilha = workbook[aba]
+            # Dimensão declarada pode estar errada; o pandas também a descarta
+            planilha.reset_dimensions()
+            campos[arquivo_csv] = _campos_preenchidos_aba(planilha.iter_rows(values_only=True))
+    finally:
+        workbook.close()
+    return campos
+
+# ---------------------------------------------------------------------------
+def hash_template(caminho: Path, mapeamento: Dict[str, str]) -> str:
+    """Hash do conteúdo do template e do mapeamento aba -> arquivo."""
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(bloco)
+    h.update(json.dumps([VERSAO_CACHE_TEMPLATE, mapeamento], ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest()
+
+def campos_template(caminho: Path, mapeamento: Dict[str, str],
+                    pasta_cache: Optional[Path] = None) -> Tuple[Dict[str, Optional[List]], bool]:
+    """Retorna (campos por arquivo, veio_do_cache), lendo o Excel só se necessário."""
+    arquivo_cache = None
+    if pasta_cache is not None:
+        try:
+            arquivo_cache = Path(pasta_cache) / f"template_{hash_template(caminho, mapeamento)[:32]}.json"
+            if arquivo_cache.exists():
+                with open(arquivo_cache, "r", encoding="utf-8") as f:
+                    return json.load(f)["campos"], True
+        except Exception:
+            arquivo_cache = None
+
+    campos = ler_campos_template(caminho, mapeamento)
+
+    if arquivo_cache is not None:
+        try:
+            arquivo_cache.parent.mkdir(parents=True, exist_ok=True)
+            # Só nomes de coluna em texto são serializáveis sem perda
+            if all(isinstance(c, str) for lista in campos.values() if lista for c in lista):
+                temporario = arquivo_cache.with_suffix(".tmp")
+                with open(temporario, "w", encoding="utf-8") as f:
+                    json.dump({"campos": campos}, f, ensure_ascii=False)
+                temporario.replace(arquivo_cache)
+        except Exception:
+            pass
+
+    return campos, False
@@ -0,0 +1,75 @@
+# conftest.py  ------------------------------------------------------------------
+"""
+Fixtures dos testes: template Excel e pasta de dados pequenos, gerados em
+tmp_path. Os módulos do validador são importados pelo nome (como no programa).
+"""
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from motor_validacao import MotorValidacao  # noqa: E402
+
+# Aba do template -> cabeçalho e uma linha preenchida (campos obrigatórios)
+ABAS_TEMPLATE = {
+    "Pátios": (["Codigo", "Descrição"], [1, "x"]),
+    "Ilhas": (["Codigo", "DescricaoPatio"], [1, "x"]),
+    "Vazão-Ilhas": (["Codigo", "VazaoMaxima(p95)"], [1, 3]),
+    "Baias": (["Codigo", "CodigoPatio"], [1, 1]),
+    "Produtos": (["Codigo", "Nome"], [1, "a"]),
+    "Agendamentos": (["Placa", "Data"], ["a", "2025-01-01"]),
+}
+
+# ---------------------------------------------------------------------------
+def escrever_csv(caminho: Path, linhas: List[List[str]], encoding: str = "utf-8", sep: str = ";"):
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    with open(caminho, "w", encoding=encoding, newline="") as f:
+        for linha in linhas:
+            f.write(sep.join(linha) + "\r\n")
+
+def escrever_template(caminho: Path, abas: Dict[str, tuple]):
+    import openpyxl
+
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for aba, (cabecalho, valores) in abas.items():
+        planilha = workbook.create_sheet(aba)
+        planilha.append(cabecalho)
+        planilha.append(valores)
+    workbook.save(caminho)
+
+def escrever_base(pasta: Path, encoding: str = "utf-8"):
+    """Base com os cinco arquivos mínimos; ilhas.csv gera vazao-ilhas.csv."""
+    escrever_csv(pasta / "patios.csv", [["Codigo", "Descrição"]] + [[str(i), f"Pátio {i}"] for i in range(5)], encoding)
+    escrever_csv(pasta / "ilhas.csv", [["Codigo", "DescricaoPatio", "VazaoMaxima(p95)"]]
+                 + [[str(i), f"Pátio {i % 5}", f"{i * 1.5}"] for i in range(10)], encoding)
+    escrever_csv(pasta / "baias.csv", [["Codigo", "CodigoPatio"]] + [[str(i), str(i % 5)] for i in range(8)], encoding)
+    escrever_csv(pasta / "produtos.csv", [["Codigo", "Nome"]] + [[str(i), f"Prod ç {i}"] for i in range(4)], encoding)
+    escrever_csv(pasta / "agend.csv", [["Placa", "Data"]] + [[f"ABC{i}", f"2025-01-0{i % 9 + 1}"] for i in range(20)],
+                 encoding)
+
+# ---------------------------------------------------------------------------
+@pytest.fixture
+def template(tmp_path) -> Path:
+    caminho = tmp_path / "template.xlsx"
+    escrever_template(caminho, ABAS_TEMPLATE)
+    return caminho
+
+@pytest.fixture
+def dados(tmp_path) -> Path:
+    """Pasta de dados com a base BAFOR (estrutura BASE/arquivo.csv)."""
+    pasta = tmp_path / "dados"
+    escrever_base(pasta / "BAFOR")
+    return pasta
+
+@pytest.fixture
+def motor(tmp_path, template, dados) -> MotorValidacao:
+    """Motor com template analisado e bases detectadas (processamento no processo atual)."""
+    motor = MotorValidacao(pasta_padrao=tmp_path / "trabalho")
+    motor.analisar_template(template)
+    motor.dados_path = dados
+    motor.detectar_bases(dados)
+    return motor
@@ -0,0 +1,40 @@
+# test_cache.py  ----------------------------------------------------------------
+"""Cache incremental: arquivos sem alteração reaproveitados, alterados revalidados."""
+from conftest import escrever_csv
+
+def _processar(motor):
+    return dict(motor.processar_bases(modo="rapido", jobs=1))["BAFOR"]
+
+def test_segunda_execucao_vem_do_cache(motor):
+    primeiro = _processar(motor)
+    segundo = _processar(motor)
+
+    assert primeiro['arquivos_em_cache'] == 0
+    assert segundo['arquivos_em_cache'] == segundo['arquivos_processados'] == 5
+    assert segundo['arquivos_validos'] == primeiro['arquivos_validos']
+
+def test_arquivo_alterado_nao_vem_do_cache(motor, dados):
+    _processar(motor)
+    escrever_csv(dados / "BAFOR" / "baias.csv", [["Codigo", "CodigoPatio"], ["1", "1"], ["2", "1"]])
+
+    resultado = _processar(motor)
+    copia = motor.pasta_saida / "BAFOR" / "input" / "baias.csv"
+
+    assert resultado['arquivos_em_cache'] < 5
+    assert copia.read_bytes() == (dados / "BAFOR" / "baias.csv").read_bytes()
+
+def test_sem_cache_revalida_tudo(motor):
+    _processar(motor)
+    motor.usar_cache = False
+
+    assert _processar(motor)['arquivos_em_cache'] == 0
+
+def test_vazao_ilhas_novo_nos_dados_invalida_o_derivado(motor, dados):
+    _processar(motor)
+    proprio = dados / "BAFOR" / "vazao-ilhas.csv"
+    escrever_csv(proprio, [["Codigo", "VazaoMaxima(p95)"], ["1", "2.5"]])
+    motor.detectar_bases(dados)
+
+    _processar(motor)
+
+    assert (motor.pasta_saida / "BAFOR" / "input" / "vazao-ilhas.csv").read_bytes() == proprio.read_bytes()
@@ -0,0 +1,64 @@
+# test_cli.py  ------------------------------------------------------------------
+"""Códigos de saída da linha de comando (processamento sem pool)."""
+import json
+
+import cli_validador
+
+def _validar(tmp_path, *argumentos):
+    return cli_validador.main(["validate", "--out", str(tmp_path / "trabalho"), "--jobs", "1", *argumentos])
+
+def _esquema(tmp_path, obrigatorios):
+    """Esquema só com patios.csv, sem template."""
+    caminho = tmp_path / "esquema.json"
+    caminho.write_text(json.dumps({
+        "versao": 1,
+        "arquivos": {"patios.csv": {"aba": "Pátios", "obrigatorios": obrigatorios}},
+    }), encoding="utf-8")
+    return caminho
+
+def test_todas_as_bases_prontas(tmp_path, dados, capsys):
+    codigo = _validar(tmp_path, "--data", str(dados), "--esquema", str(_esquema(tmp_path, ["Codigo"])))
+
+    assert codigo == cli_validador.SAIDA_OK == 0
+    resumo = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert resumo['tipo'] == 'resumo' and resumo['bases_prontas'] == 1
+
+def test_base_com_campo_faltante(tmp_path, dados, capsys):
+    codigo = _validar(tmp_path, "--data", str(dados), "--esquema", str(_esquema(tmp_path, ["Codigo", "Capacidade"])))
+
+    assert codigo == cli_validador.SAIDA_BASES_COM_PROBLEMAS == 1
+    registro = json.loads(capsys.readouterr().out.splitlines()[0])
+    assert registro['base'] == "BAFOR" and not registro['pronto']
+
+def test_base_sem_arquivos_do_template(tmp_path, template, dados):
+    # O template pede arquivos que não existem nos dados
+    assert _validar(tmp_path, "--data", str(dados), "--template", str(template)) == 1
+
+def test_erros_de_configuracao(tmp_path, template, dados):
+    assert _validar(tmp_path, "--data", str(dados), "--template", str(tmp_path / "ausente.xlsx")) == 2
+    assert _validar(tmp_path, "--data", str(tmp_path / "ausente"), "--template", str(template)) == 2
+
+    vazia = tmp_path / "vazia"
+    vazia.mkdir()
+    assert _validar(tmp_path, "--data", str(vazia), "--template", str(template)) == 2
+
+    # Sem template e sem colunas obrigatórias no esquema
+    assert _validar(tmp_path, "--data", str(dados), "--esquema", str(_esquema(tmp_path, []))) == 2
+
+def test_saida_json_unica(tmp_path, dados, capsys):
+    codigo = _validar(tmp_path, "--data", str(dados), "--format", "json",
+                      "--esquema", str(_esquema(tmp_path, ["Codigo"])))
+
+    documento = json.loads(capsys.readouterr().out)
+    assert codigo == 0
+    assert [base['base'] for base in documento['bases']] == ["BAFOR"]
+    assert documento['resumo']['bases_prontas'] == 1
+
+def test_pool_de_processos(tmp_path, dados, capsys):
+    esquema = str(_esquema(tmp_path, ["Codigo"]))
+    codigo = cli_validador.main(["validate", "--out", str(tmp_path / "pool"), "--jobs", "2",
+                                 "--data", str(dados), "--esquema", esquema])
+
+    assert codigo == 0
+    copia = tmp_path / "pool" / "output" / "BAFOR" / "input" / "patios.csv"
+    assert copia.read_bytes() == (dados / "BAFOR" / "patios.csv").read_bytes()
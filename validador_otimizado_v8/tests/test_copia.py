@@ -0,0 +1,24 @@
+# test_copia.py  ----------------------------------------------------------------
+"""Cópias dos arquivos não derivados idênticas à origem, byte a byte."""
+import pytest
+
+from conftest import escrever_base
+from motor_validacao import MotorValidacao
+
+NAO_DERIVADOS = ["patios.csv", "baias.csv", "produtos.csv", "agend.csv"]
+
+@pytest.mark.parametrize("modo", ["rapido", "completo"])
+@pytest.mark.parametrize("encoding", ["utf-8", "latin-1"])
+def test_copias_identicas_a_origem(tmp_path, template, encoding, modo):
+    dados = tmp_path / "dados"
+    escrever_base(dados / "BAFOR", encoding)
+    motor = MotorValidacao(pasta_padrao=tmp_path / "trabalho")
+    motor.analisar_template(template)
+    motor.dados_path = dados
+    motor.detectar_bases(dados)
+
+    dict(motor.processar_bases(modo=modo, jobs=1))
+    pasta_input = motor.pasta_saida / "BAFOR" / "input"
+
+    for arquivo_csv in NAO_DERIVADOS:
+        assert (pasta_input / arquivo_csv).read_bytes() == (dados / "BAFOR" / arquivo_csv).read_bytes(), arquivo_csv
@@ -0,0 +1,52 @@
+# test_derivacao.py  ------------------------------------------------------------
+"""Derivação de vazao-ilhas.csv a partir de ilhas.csv durante a cópia."""
+from conftest import escrever_csv
+
+def _processar(motor, modo="completo"):
+    return dict(motor.processar_bases(modo=modo, jobs=1))["BAFOR"]
+
+def test_derivado_criado_e_analisado(motor):
+    resultado = _processar(motor)
+    pasta_input = motor.pasta_saida / "BAFOR" / "input"
+
+    cabecalho_derivado = (pasta_input / "vazao-ilhas.csv").read_text(encoding="utf-8").splitlines()[0]
+    assert cabecalho_derivado == "Codigo;DescricaoPatio;VazaoMaxima(p95)"
+    assert "VazaoMaxima(p95)" not in (pasta_input / "ilhas.csv").read_text(encoding="utf-8")
+    assert resultado['estatisticas']['ilhas.csv']['total_colunas'] == 2
+    assert resultado['estatisticas']['vazao-ilhas.csv']['total_registros'] == 10
+
+def test_vazao_ilhas_dos_dados_prevalece_sobre_o_derivado(motor, dados):
+    # Arquivo próprio nos dados, com outro número de linhas que o derivado
+    proprio = dados / "BAFOR" / "vazao-ilhas.csv"
+    escrever_csv(proprio, [["Codigo", "VazaoMaxima(p95)"], ["1", "2.5"], ["2", "3.5"], ["3", "4.5"]])
+    motor.detectar_bases(dados)
+
+    resultado = _processar(motor)
+    pasta_input = motor.pasta_saida / "BAFOR" / "input"
+
+    assert (pasta_input / "vazao-ilhas.csv").read_bytes() == proprio.read_bytes()
+    estatisticas = resultado['estatisticas']['vazao-ilhas.csv']
+    assert estatisticas['total_registros'] == 3
+    assert estatisticas['total_colunas'] == 2
+    assert resultado['conteudo']['vazao-ilhas.csv']['registros'] == 3
+    # A origem continua analisada com os blocos da derivação
+    assert resultado['estatisticas']['ilhas.csv']['total_registros'] == 10
+
+def test_derivacao_regrava_linhas_mantendo_valores(tmp_path):
+    from derivacao_csv import derivar_colunas
+
+    origem = tmp_path / "ilhas.csv"
+    origem.write_bytes(b'Codigo;DescricaoPatio;VazaoMaxima(p95)\r\n'
+                       b'"1";"P\xc3\xa1tio; A";"1,5"\r\n'
+                       b'2;"diz ""oi""";2\r\n')
+    destino, derivado = tmp_path / "saida.csv", tmp_path / "vazao-ilhas.csv"
+
+    resultado = derivar_colunas(origem, destino, {derivado: ["Codigo", "VazaoMaxima(p95)"]},
+                                ["VazaoMaxima(p95)"])
+
+    assert resultado['registros'] == 2
+    # Separador e terminador mantidos; aspas só onde necessárias (QUOTE_MINIMAL)
+    assert destino.read_bytes() == (b'Codigo;DescricaoPatio\r\n'
+                                    b'1;"P\xc3\xa1tio; A"\r\n'
+                                    b'2;"diz ""oi"""\r\n')
+    assert derivado.read_bytes() == b'Codigo;VazaoMaxima(p95)\r\n1;1,5\r\n2;2\r\n'
@@ -0,0 +1,16 @@
+# test_esquema.py  --------------------------------------------------------------
+"""Esquema embutido: carregado no primeiro uso, pelo cache compilado."""
+import esquema
+from motor_validacao import MotorValidacao
+
+def test_esquema_padrao_usa_cache_compilado(tmp_path, monkeypatch):
+    monkeypatch.setattr(esquema, "_esquema_padrao", None)
+
+    motor = MotorValidacao(pasta_padrao=tmp_path)
+    assert "ilhas.csv" in motor.esquema.arquivos
+    assert list((tmp_path / "cache").glob("esquema_*.pkl"))
+
+    # Nova carga no mesmo cache vem do pickle, sem interpretar o JSON
+    monkeypatch.setattr(esquema, "_esquema_padrao", None)
+    monkeypatch.setattr(esquema.json, "loads", lambda *a, **k: (_ for _ in ()).throw(AssertionError("JSON lido")))
+    assert esquema.esquema_padrao(tmp_path / "cache").arquivos.keys() == motor.esquema.arquivos.keys()
@@ -0,0 +1,45 @@
+# test_template.py  -------------------------------------------------------------
+"""Campos do template lidos pelo openpyxl iguais aos do pd.read_excel."""
+import pandas as pd
+import pytest
+
+from template_excel import ler_campos_template
+
+# Células por (linha, coluna), numeradas a partir de 1 como no Excel
+LAYOUTS = {
+    "linhas_em_branco_no_topo": {
+        (3, 1): "Codigo", (3, 2): "Nome",
+        (4, 1): 1, (5, 2): "a",
+    },
+    "coluna_sem_nome_preenchida_no_fim": {
+        (1, 1): "Codigo", (1, 2): "Nome",
+        (2, 1): 1, (2, 2): "a",
+        (3, 1): 2, (3, 2): "b",
+        (6, 4): "extra",
+    },
+    "cabecalho_com_lacunas_e_repetido": {
+        (1, 1): "Codigo", (1, 3): "Codigo", (1, 4): "NA",
+        (2, 2): "x", (3, 3): "NA", (4, 4): 5,
+    },
+}
+
+def _campos_pandas(caminho, aba):
+    """Caminho antigo: DataFrame inteiro e colunas não vazias."""
+    df = pd.read_excel(caminho, sheet_name=aba)
+    return [coluna for coluna in df.columns
+            if not df[coluna].isna().all() and not (df[coluna] == '').all()]
+
+@pytest.mark.parametrize("layout", sorted(LAYOUTS))
+def test_campos_iguais_ao_read_excel(tmp_path, layout):
+    import openpyxl
+
+    caminho = tmp_path / "template.xlsx"
+    workbook = openpyxl.Workbook()
+    planilha = workbook.active
+    planilha.title = "Aba"
+    for (linha, coluna), valor in LAYOUTS[layout].items():
+        planilha.cell(row=linha, column=coluna, value=valor)
+    workbook.save(caminho)
+
+    campos = ler_campos_template(caminho, {"Aba": "arquivo.csv"})["arquivo.csv"]
+    assert campos == _campos_pandas(caminho, "Aba")
@@ -1,42 +1,394 @@
 # utils_csv.py  --------------------------------------------------------------
+import codecs
+import csv
+import io
+import os
 import re
+import shutil
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
 from pathlib import Path
-import pandas as pd
-import chardet
-import unidecode
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # ---------------------------------------------------------------------------
-def detectar_encoding_robusto(arquivo: Path) -> str:
-    """Tenta descobrir o encoding lendo os primeiros bytes do arquivo."""
-    provavel = chardet.detect(arquivo.read_bytes(2048))["encoding"]
-    encodings = [provavel, "utf-8", "iso-8859-1", "cp1252", "latin1"]
-    for enc in filter(None, encodings):
+# Detecção de encoding por amostragem: BOM, depois validação UTF-8 e, só se
+# necessário, chardet. A amostra (início, meio e fim do arquivo) tem tamanho
+# limitado e só cresce quando a confiança fica abaixo do limiar.
+TAMANHOS_AMOSTRA_ENCODING = (64 * 1024, 1024 * 1024, 8 * 1024 * 1024)
+LIMIAR_CONFIANCA_ENCODING = 0.8
+
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+def _amostrar_bytes(arquivo: Path, tamanho_bloco: int, inicio: Optional[bytes] = None) -> List[bytes]:
+    """Blocos do início, meio e fim do arquivo (o arquivo todo, se for pequeno)."""
+    tamanho = os.path.getsize(arquivo)
+    if inicio is not None and len(inicio) >= tamanho:
+        return [inicio[:tamanho]]  # início já lido cobre o arquivo todo
+    with open(arquivo, "rb") as f:
+        if tamanho <= 3 * tamanho_bloco:
+            return [f.read()]
+        blocos = []
+        for posicao in (0, (tamanho - tamanho_bloco) // 2, tamanho - tamanho_bloco):
+            f.seek(posicao)
+            blocos.append(f.read(tamanho_bloco))
+        return blocos
+
+def _utf8_valido(blocos: List[bytes]) -> bool:
+    """Valida os blocos como UTF-8, tolerando caracteres cortados nas bordas."""
+    for i, bloco in enumerate(blocos):
+        if i > 0:
+            # Bloco do meio/fim pode começar no meio de um caractere
+            inicio = 0
+            while inicio < min(3, len(bloco)) and 0x80 <= bloco[inicio] <= 0xBF:
+                inicio += 1
+            bloco = bloco[inicio:]
         try:
-            with open(arquivo, "r", encoding=enc) as f:
-                f.read(100)
-            return enc
-        except Exception:
-            continue
-    return "utf-8"  # fallback seguro
+            codecs.getincrementaldecoder("utf-8")().decode(bloco, final=False)
+        except UnicodeDecodeError:
+            return False
+    return True
+
+def _decodifica(blocos: List[bytes], encoding: str) -> bool:
+    """True se todos os blocos decodificam no encoding informado."""
+    try:
+        for bloco in blocos:
+            codecs.getincrementaldecoder(encoding)().decode(bloco, final=False)
+        return True
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+def detectar_encoding(arquivo: Path, inicio: Optional[bytes] = None) -> Tuple[str, float]:
+    """Retorna (encoding, confiança) a partir de uma amostra limitada do arquivo.
+
+    ``inicio`` são os primeiros bytes do arquivo, se já foram lidos.
+    """
+    if inicio is None:
+        with open(arquivo, "rb") as f:
+            inicio = f.read(4)
+    for bom, encoding in _BOMS:
+        if inicio.startswith(bom):
+            return encoding, 1.0
+
+    encoding, confianca = "utf-8", 0.0
+    for tamanho_bloco in TAMANHOS_AMOSTRA_ENCODING:
+        blocos = _amostrar_bytes(arquivo, tamanho_bloco, inicio)
+        amostra_completa = len(blocos) == 1
+        amostra = b"".join(blocos)
+
+        if _utf8_valido(blocos):
+            if not amostra.isascii():
+                return "utf-8", 0.99
+            # Só ASCII: UTF-8 é seguro se a amostra cobre o arquivo todo
+            encoding, confianca = "utf-8", 1.0 if amostra_completa else 0.75
+        else:
+            import chardet  # só necessário para arquivos que não são UTF-8
+            detectado = chardet.detect(amostra)
+            candidato = detectado.get("encoding")
+            if candidato and _decodifica(blocos, candidato):
+                encoding, confianca = candidato, detectado.get("confidence") or 0.0
+            else:
+                encoding, confianca = next(
+                    (enc, 0.5) for enc in ("cp1252", "latin1") if _decodifica(blocos, enc)
+                )
+
+        if confianca >= LIMIAR_CONFIANCA_ENCODING or amostra_completa:
+            break
+    return encoding, confianca
+
+def detectar_encoding_robusto(arquivo: Path) -> str:
+    """Tenta descobrir o encoding do arquivo a partir de uma amostra."""
+    try:
+        return detectar_encoding(Path(arquivo))[0]
+    except Exception:
+        return "utf-8"  # fallback seguro
 
 # ---------------------------------------------------------------------------
+# Dialeto CSV: uma única leitura de amostra, sem instanciar o parser do
+# pandas. Cada combinação (separador, aspas) é pontuada pela consistência do
+# número de campos nas primeiras linhas; empates ficam com a ordem abaixo.
+SEPARADORES_CANDIDATOS = [";", ",", "\t", "|"]
+ASPAS_CANDIDATAS = ['"', "'"]
+TAMANHO_AMOSTRA_DIALETO = 64 * 1024
+MAX_LINHAS_DIALETO = 50
+MAX_LINHAS_PREAMBULO = 10
+
+def _terminador_linha(amostra: bytes) -> str:
+    """Retorna o terminador de linha usado na amostra."""
+    if b"\r\n" in amostra:
+        return "\r\n"
+    if b"\r" in amostra and b"\n" not in amostra:
+        return "\r"
+    return "\n"
+
+def _contagens_campos(texto: str, sep: str, aspas: str) -> List[int]:
+    """Número de campos de cada linha da amostra (0 para linhas vazias)."""
+    contagens = []
+    try:
+        for linha in csv.reader(io.StringIO(texto, newline=""), delimiter=sep, quotechar=aspas):
+            contagens.append(len(linha))
+            if len(contagens) >= MAX_LINHAS_DIALETO:
+                break
+    except csv.Error:
+        pass
+    return contagens
+
+def _linha_cabecalho(contagens: List[int], moda: int) -> int:
+    """Índice do cabeçalho: pula um bloco de título separado por linha vazia."""
+    linha = next((i for i, c in enumerate(contagens[:MAX_LINHAS_PREAMBULO]) if c == moda), 0)
+    if linha > 0 and contagens[linha - 1] == 0:
+        return linha
+    return 0
+
+def _ler_amostra(arquivo: Path) -> bytes:
+    """Início do arquivo usado na detecção (um byte a mais indica truncamento)."""
+    with open(arquivo, "rb") as f:
+        return f.read(TAMANHO_AMOSTRA_DIALETO + 1)
+
+def detectar_dialeto(arquivo: Path, encoding: str, amostra: Optional[bytes] = None) -> Dict:
+    """Detecta separador, aspas, terminador de linha e linha do cabeçalho.
+
+    ``cabecalho`` é o índice da linha de cabeçalho: 0, ou a primeira linha
+    com o número de campos predominante quando há um título antes dela
+    separado por uma linha vazia. ``amostra`` é o retorno de _ler_amostra,
+    se já foi lido.
+    """
+    if amostra is None:
+        amostra = _ler_amostra(arquivo)
+    truncada = len(amostra) > TAMANHO_AMOSTRA_DIALETO
+    amostra = amostra[:TAMANHO_AMOSTRA_DIALETO]
+
+    texto = amostra.decode(encoding, errors="replace")
+    if truncada:
+        # Descarta a última linha, provavelmente incompleta
+        fim = max(texto.rfind("\n"), texto.rfind("\r"))
+        if fim > 0:
+            texto = texto[:fim + 1]
+
+    dialeto = {
+        "delimiter": ",",  # fallback
+        "quotechar": '"',
+        "lineterminator": _terminador_linha(amostra),
+        "cabecalho": 0,
+    }
+    melhor = None
+    for aspas in ASPAS_CANDIDATAS:
+        for sep in SEPARADORES_CANDIDATOS:
+            contagens = _contagens_campos(texto, sep, aspas)
+            preenchidas = [c for c in contagens if c > 0]
+            if not preenchidas:
+                continue
+            frequencias = Counter(preenchidas)
+            moda = max(frequencias, key=lambda n: (frequencias[n], n))
+            if moda < 2:
+                continue
+            pontuacao = (frequencias[moda] / len(preenchidas), moda)
+            if melhor is None or pontuacao > melhor:
+                melhor = pontuacao
+                dialeto["delimiter"], dialeto["quotechar"] = sep, aspas
+                dialeto["cabecalho"] = _linha_cabecalho(contagens, moda)
+    return dialeto
+
+def opcoes_leitura(perfil: Dict) -> Dict:
+    """Argumentos de pd.read_csv correspondentes ao perfil do arquivo."""
+    dialeto = perfil["dialeto"]
+    return {
+        "encoding": perfil["encoding"],
+        "sep": dialeto["delimiter"],
+        "quotechar": dialeto["quotechar"],
+        "skiprows": dialeto.get("cabecalho", 0),
+    }
+
+def nomes_unicos(nomes: List) -> List:
+    """Renomeia duplicados como o pandas: a, a.1, a.2 ..."""
+    vistos = set(nomes)
+    contagem: Dict = {}
+    resultado = []
+    for nome in nomes:
+        if nome in contagem:
+            while True:
+                contagem[nome] += 1
+                novo = f"{nome}.{contagem[nome]}"
+                if novo not in vistos:
+                    break
+            vistos.add(novo)
+            resultado.append(novo)
+        else:
+            contagem[nome] = 0
+            resultado.append(nome)
+    return resultado
+
+def nomes_colunas_csv(campos: List[str]) -> List[str]:
+    """Nomes que o pandas dá às colunas de uma linha de cabeçalho."""
+    return nomes_unicos([nome if nome != "" else f"Unnamed: {i}" for i, nome in enumerate(campos)])
+
+def ler_cabecalho(arquivo: Path, perfil: Dict, amostra: Optional[bytes] = None) -> List[str]:
+    """Nomes das colunas como o pd.read_csv gera, lidos com o módulo csv.
+
+    Evita carregar o pandas só para o cabeçalho (modo rápido). Se a
+    ``amostra`` já lida contém o arquivo inteiro, o arquivo não é reaberto.
+    """
+    dialeto = perfil["dialeto"]
+    if amostra is not None and len(amostra) <= TAMANHO_AMOSTRA_DIALETO:
+        fonte = io.StringIO(amostra.decode(perfil["encoding"]), newline="")
+    else:
+        fonte = open(arquivo, "r", encoding=perfil["encoding"], newline="")
+    with fonte as f:
+        for _ in range(dialeto.get("cabecalho", 0)):
+            f.readline()
+        leitor = csv.reader(f, delimiter=dialeto["delimiter"], quotechar=dialeto["quotechar"])
+        # Linhas em branco antes do cabeçalho são ignoradas, como no pandas
+        linha = next((linha for linha in leitor if linha), None)
+    if linha is None:
+        raise ValueError(f"Arquivo sem cabeçalho: {arquivo}")
+    if linha[0].startswith("\ufeff"):
+        linha[0] = linha[0][1:]
+    return nomes_colunas_csv(linha)
+
 def detectar_separador_automatico(arquivo: Path, encoding: str) -> str:
-    """Retorna o separador que gerar mais de uma coluna no header."""
-    for sep in [";", ",", "\t", "|"]:
-        try:
-            df = pd.read_csv(arquivo, sep=sep, encoding=encoding, nrows=1)
-            if len(df.columns) > 1:
-                return sep
-        except Exception:
-            pass
-    return ","  # fallback
+    """Retorna o separador detectado na amostra do arquivo."""
+    try:
+        return detectar_dialeto(Path(arquivo), encoding)["delimiter"]
+    except Exception:
+        return ","  # fallback
+
+# ---------------------------------------------------------------------------
+# Perfil do arquivo: encoding, separador, dialeto e cabeçalho, detectados uma
+# única vez e compartilhados por todas as etapas. A chave inclui tamanho e
+# mtime, então qualquer alteração no arquivo gera um novo perfil.
+MAX_PERFIS_CACHE = 4096
+
+_cache_perfis: "OrderedDict[Tuple[str, int, int], Dict]" = OrderedDict()
+_chave_por_caminho: Dict[str, Tuple[str, int, int]] = {}
+_lock_perfis = threading.Lock()
+
+def _chave_arquivo(arquivo: Path) -> Tuple[str, int, int]:
+    """Chave do cache: (caminho absoluto, tamanho, mtime em ns)."""
+    st = os.stat(arquivo)
+    return (os.path.abspath(arquivo), st.st_size, st.st_mtime_ns)
+
+def _guardar_perfil(chave: Tuple[str, int, int], perfil: Dict):
+    """Guarda o perfil, descartando versões antigas do mesmo caminho."""
+    with _lock_perfis:
+        antiga = _chave_por_caminho.get(chave[0])
+        if antiga is not None and antiga != chave:
+            _cache_perfis.pop(antiga, None)
+        _cache_perfis[chave] = perfil
+        _cache_perfis.move_to_end(chave)
+        _chave_por_caminho[chave[0]] = chave
+        while len(_cache_perfis) > MAX_PERFIS_CACHE:
+            descartada, _ = _cache_perfis.popitem(last=False)
+            if _chave_por_caminho.get(descartada[0]) == descartada:
+                del _chave_por_caminho[descartada[0]]
+
+def perfil_arquivo(arquivo: Path) -> Dict:
+    """Retorna encoding, separador, dialeto e colunas do arquivo (com cache)."""
+    chave = _chave_arquivo(arquivo)
+    with _lock_perfis:
+        perfil = _cache_perfis.get(chave)
+        if perfil is not None:
+            _cache_perfis.move_to_end(chave)
+            return perfil
+
+    # Início do arquivo lido uma vez para encoding, dialeto e cabeçalho
+    amostra = _ler_amostra(Path(arquivo))
+    encoding, confianca = detectar_encoding(Path(arquivo), amostra)
+    dialeto = detectar_dialeto(Path(arquivo), encoding, amostra)
+    perfil = {
+        "encoding": encoding,
+        "confianca_encoding": confianca,
+        "separador": dialeto["delimiter"],
+        "dialeto": dialeto,
+    }
+    perfil["colunas"] = ler_cabecalho(Path(arquivo), perfil, amostra)
+    _guardar_perfil(chave, perfil)
+    return perfil
+
+def perfil_copia(origem: Path, encoding: Optional[str] = None,
+                 colunas: Optional[List[str]] = None, cabecalho: Optional[int] = None) -> Dict:
+    """Perfil de uma cópia da origem (ver copiar_perfil), sem gravar no cache."""
+    perfil = perfil_arquivo(origem)
+    if encoding is not None:
+        perfil = dict(perfil, encoding=encoding)
+    if colunas is not None:
+        perfil = dict(perfil, colunas=list(colunas))
+    if cabecalho is not None:
+        perfil = dict(perfil, dialeto=dict(perfil["dialeto"], cabecalho=cabecalho))
+    return perfil
+
+def copiar_perfil(origem: Path, destino: Path, encoding: Optional[str] = None,
+                  colunas: Optional[List[str]] = None, cabecalho: Optional[int] = None):
+    """Reaproveita o perfil da origem para uma cópia (destino).
+
+    ``encoding`` informa o encoding da cópia quando ela foi transcodificada;
+    ``colunas`` e ``cabecalho`` (linhas antes do cabeçalho), quando a cópia
+    tem outras colunas (arquivos derivados).
+    """
+    _guardar_perfil(_chave_arquivo(destino), perfil_copia(origem, encoding, colunas, cabecalho))
+
+def limpar_cache_perfis():
+    """Esvazia o cache de perfis (ex.: entre execuções longas)."""
+    with _lock_perfis:
+        _cache_perfis.clear()
+        _chave_por_caminho.clear()
+
+# ---------------------------------------------------------------------------
+# Cópia de arquivos em streaming. Sem encoding de saída a cópia é byte a byte
+# (shutil.copyfile usa sendfile/copy_file_range quando o SO permite); a
+# transcodificação, quando pedida, é feita em blocos, sem carregar o arquivo.
+# As cópias (e os arquivos derivados) recebem a data de modificação da origem:
+# regravar a mesma origem em outra execução não invalida os caches que
+# comparam tamanho e mtime (perfis, cache colunar).
+TAMANHO_BLOCO_COPIA = 1024 * 1024
+
+def preservar_mtime(origem: Path, destino: Path):
+    """Aplica ao destino as datas de acesso/modificação da origem."""
+    st = os.stat(origem)
+    os.utime(destino, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+def mesmo_encoding(enc1: str, enc2: str) -> bool:
+    """True se os dois nomes apontam para o mesmo codec."""
+    try:
+        return codecs.lookup(enc1).name == codecs.lookup(enc2).name
+    except LookupError:
+        return False
+
+def copiar_arquivo(origem: Path, destino: Path, encoding_origem: Optional[str] = None,
+                   encoding_saida: Optional[str] = None) -> str:
+    """Copia origem para destino e retorna o encoding do destino."""
+    if encoding_saida is None or encoding_origem is None or mesmo_encoding(encoding_origem, encoding_saida):
+        shutil.copyfile(origem, destino)
+        preservar_mtime(origem, destino)
+        return encoding_origem
+
+    # newline="" preserva os terminadores de linha originais
+    with open(origem, "r", encoding=encoding_origem, newline="") as entrada, \
+         open(destino, "w", encoding=encoding_saida, newline="") as saida:
+        shutil.copyfileobj(entrada, saida, TAMANHO_BLOCO_COPIA)
+    preservar_mtime(origem, destino)
+    return encoding_saida
 
 # ---------------------------------------------------------------------------
 _rx_parenteses = re.compile(r"\([^)]*\)")
 _rx_normaliza  = re.compile(r"\W+")
 
+# Nomes distintos de campos/colunas são poucos e se repetem entre arquivos e
+# bases; a normalização de cada um é feita uma vez e guardada (LRU limitado).
+MAX_NOMES_NORMALIZADOS = 65536
+MAX_INDICES_COLUNAS = 1024
+
+@lru_cache(maxsize=MAX_NOMES_NORMALIZADOS)
 def normalizar_campo(s: str) -> str:
     """Remove acentos, parênteses, pontuação e converte para minúsculas."""
+    # Importado no uso: a interface instala as dependências depois de carregar o motor
+    import unidecode
+
     s = unidecode.unidecode(s)
     s = _rx_parenteses.sub("", s)
     s = _rx_normaliza.sub("", s.lower())
@@ -47,4 +399,70 @@ def campos_similares_flex(c1: str, c2: str) -> bool:
     """Verifica se os campos são equivalentes de forma flexível."""
     n1, n2 = normalizar_campo(c1), normalizar_campo(c2)
     return (n1 == n2) or (n1 in n2) or (n2 in n1)
+
 # ---------------------------------------------------------------------------
+class IndiceColunas:
+    """Índice de um cabeçalho para busca flexível (mesma regra de campos_similares_flex).
+
+    Cada coluna é normalizada uma vez. Para um campo com nome normalizado n:
+    - colunas cujo nome normalizado está contido em n (inclui n == coluna) são
+      achadas consultando no dicionário cada substring de n;
+    - colunas que contêm n são achadas por um índice de trigramas e
+      confirmadas com ``in``.
+    """
+
+    def __init__(self, colunas: Iterable[str]):
+        self.colunas: List[str] = list(colunas)
+        self._por_nome: Dict[str, List[int]] = {}
+        self._trigramas: Dict[str, set] = {}
+
+        for posicao, coluna in enumerate(self.colunas):
+            normalizado = normalizar_campo(coluna)
+            self._por_nome.setdefault(normalizado, []).append(posicao)
+        for normalizado in self._por_nome:
+            for i in range(len(normalizado) - 2):
+                self._trigramas.setdefault(normalizado[i:i + 3], set()).add(normalizado)
+
+    def _nomes_contendo(self, n: str) -> Iterable[str]:
+        """Nomes normalizados das colunas que contêm n."""
+        if len(n) < 3:
+            return [nome for nome in self._por_nome if n in nome]
+        candidatos = None
+        for i in range(len(n) - 2):
+            nomes = self._trigramas.get(n[i:i + 3])
+            if not nomes:
+                return []
+            candidatos = set(nomes) if candidatos is None else candidatos & nomes
+        return [nome for nome in candidatos if n in nome]
+
+    def _nomes_contidos(self, n: str) -> Iterable[str]:
+        """Nomes normalizados das colunas contidos em n (substrings de n)."""
+        encontrados = {""} & self._por_nome.keys()
+        for inicio in range(len(n)):
+            for fim in range(inicio + 1, len(n) + 1):
+                trecho = n[inicio:fim]
+                if trecho in self._por_nome:
+                    encontrados.add(trecho)
+        return encontrados
+
+    def similares(self, campo: str) -> List[str]:
+        """Colunas equivalentes ao campo, na ordem do cabeçalho."""
+        n = normalizar_campo(campo)
+        nomes = set(self._nomes_contidos(n))
+        nomes.update(self._nomes_contendo(n))
+        posicoes = sorted(p for nome in nomes for p in self._por_nome[nome])
+        return [self.colunas[p] for p in posicoes]
+
+    def tem_similar(self, campo: str) -> bool:
+        """True se alguma coluna é equivalente ao campo."""
+        n = normalizar_campo(campo)
+        return bool(self._nomes_contidos(n)) or bool(self._nomes_contendo(n))
+
+@lru_cache(maxsize=MAX_INDICES_COLUNAS)
+def _indice_colunas_cache(colunas: Tuple[str, ...]) -> IndiceColunas:
+    return IndiceColunas(colunas)
+
+def indice_colunas(colunas: Iterable[str]) -> IndiceColunas:
+    """Índice do cabeçalho, reaproveitado entre arquivos com as mesmas colunas."""
+    return _indice_colunas_cache(tuple(colunas))
+# ---------------------------------------------------------------------------
\ No newline at end of file
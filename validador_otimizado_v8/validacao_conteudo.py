@@ -0,0 +1,167 @@
+# validacao_conteudo.py  --------------------------------------------------------
+"""
+Validação do conteúdo das colunas obrigatórias, linha a linha.
+
+Para cada coluna obrigatória presente no arquivo são contados valores vazios,
+valores fora do tipo esperado (``tipos`` do esquema) e fora do padrão
+(``padroes`` do esquema, expressão regular). As verificações são feitas por
+coluna inteira em cada bloco de linhas (operações vetorizadas do pandas) e só
+as primeiras linhas problemáticas de cada coluna são guardadas como exemplo.
+"""
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from cache_colunar import blocos_csv
+from utils_csv import perfil_arquivo, opcoes_leitura
+
+# Linhas por bloco lido do CSV
+TAMANHO_CHUNK_LINHAS = 100_000
+
+# Linhas problemáticas guardadas como exemplo por coluna
+MAX_EXEMPLOS_COLUNA = 10
+
+_RX_INTEIRO = r"[+-]?\d+"
+_RX_DECIMAL = r"[+-]?(?:\d+(?:[.,]\d*)?|[.,]\d+)(?:[eE][+-]?\d+)?"
+FORMATOS_DATA = [
+    "%Y-%m-%d", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S",
+    "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%Y%m%d",
+]
+
+# ---------------------------------------------------------------------------
+def _conforme_tipo(valores: pd.Series, tipo: Optional[str]) -> np.ndarray:
+    """Máscara dos valores (já sem vazios) compatíveis com o tipo esperado."""
+    if tipo == "inteiro":
+        return valores.str.fullmatch(_RX_INTEIRO).to_numpy(dtype=bool)
+    if tipo == "decimal":
+        return valores.str.fullmatch(_RX_DECIMAL).to_numpy(dtype=bool)
+    if tipo == "data":
+        conforme = np.zeros(len(valores), dtype=bool)
+        for formato in FORMATOS_DATA:
+            pendentes = ~conforme
+            if not pendentes.any():
+                break
+            datas = pd.to_datetime(valores[pendentes], format=formato, errors="coerce")
+            conforme[pendentes] = datas.notna().to_numpy()
+        return conforme
+    return np.ones(len(valores), dtype=bool)
+
+class _AcumuladorConteudoColuna:
+    """Contagens e exemplos de uma coluna obrigatória."""
+
+    def __init__(self, campo: str, coluna: str, tipo: Optional[str], padrao: Optional[str]):
+        self.campo = campo
+        self.coluna = coluna
+        self.tipo = tipo
+        self.padrao = padrao
+        self.vazios = 0
+        self.fora_do_tipo = 0
+        self.fora_do_padrao = 0
+        self.exemplos: List[Dict] = []
+
+    def _guardar_exemplos(self, linhas: np.ndarray, valores: Optional[pd.Series], motivo: str):
+        faltam = MAX_EXEMPLOS_COLUNA - len(self.exemplos)
+        if faltam <= 0 or len(linhas) == 0:
+            return
+        linhas = linhas[:faltam]
+        valores = valores.iloc[:faltam].tolist() if valores is not None else [None] * len(linhas)
+        for linha, valor in zip(linhas, valores):
+            self.exemplos.append({"linha": int(linha), "valor": valor, "motivo": motivo})
+
+    def atualizar(self, serie: pd.Series, linhas: np.ndarray):
+        texto = serie.str.strip()
+        vazios = texto.isna().to_numpy() | (texto == "").to_numpy(dtype=bool, na_value=False)
+        self.vazios += int(vazios.sum())
+        self._guardar_exemplos(linhas[vazios], None, "vazio")
+
+        preenchidos = texto[~vazios]
+        linhas_preenchidas = linhas[~vazios]
+        if preenchidos.empty:
+            return
+
+        if self.tipo:
+            conforme = _conforme_tipo(preenchidos, self.tipo)
+            self.fora_do_tipo += int((~conforme).sum())
+            self._guardar_exemplos(linhas_preenchidas[~conforme], preenchidos[~conforme], "tipo")
+
+        if self.padrao:
+            conforme = preenchidos.str.fullmatch(self.padrao).to_numpy(dtype=bool)
+            self.fora_do_padrao += int((~conforme).sum())
+            self._guardar_exemplos(linhas_preenchidas[~conforme], preenchidos[~conforme], "padrao")
+
+    def resultado(self, total_registros: int) -> Dict:
+        return {
+            "coluna": self.coluna,
+            "tipo": self.tipo,
+            "vazios": self.vazios,
+            "taxa_vazios": (self.vazios / total_registros * 100) if total_registros else 0,
+            "fora_do_tipo": self.fora_do_tipo,
+            "fora_do_padrao": self.fora_do_padrao,
+            "exemplos": sorted(self.exemplos, key=lambda e: e["linha"])[:MAX_EXEMPLOS_COLUNA],
+        }
+
+# ---------------------------------------------------------------------------
+class AcumuladorConteudo:
+    """Valida o conteúdo das colunas obrigatórias bloco a bloco.
+
+    ``colunas`` associa cada campo obrigatório à coluna real do arquivo
+    (mesmo nome, alias ou variação de nomenclatura).
+    """
+
+    def __init__(self, colunas: Dict[str, str], tipos: Optional[Dict[str, str]] = None,
+                 padroes: Optional[Dict[str, str]] = None, primeira_linha: int = 2):
+        tipos = tipos or {}
+        padroes = padroes or {}
+        self.total_registros = 0
+        self.primeira_linha = primeira_linha  # nº da linha do 1º registro no arquivo
+        self._colunas = {
+            campo: _AcumuladorConteudoColuna(campo, coluna, tipos.get(campo), padroes.get(campo))
+            for campo, coluna in colunas.items()
+        }
+
+    @property
+    def colunas(self) -> List[str]:
+        """Colunas do arquivo lidas pelo acumulador."""
+        return sorted({acumulador.coluna for acumulador in self._colunas.values()})
+
+    def atualizar(self, chunk: pd.DataFrame):
+        """Incorpora um bloco de linhas lido do arquivo (colunas como texto)."""
+        linhas = np.arange(len(chunk)) + self.primeira_linha + self.total_registros
+        self.total_registros += len(chunk)
+        for acumulador in self._colunas.values():
+            acumulador.atualizar(chunk[acumulador.coluna], linhas)
+
+    def resultado(self) -> Dict:
+        colunas = {campo: acumulador.resultado(self.total_registros)
+                   for campo, acumulador in self._colunas.items()}
+        return {
+            "registros": self.total_registros,
+            "colunas": colunas,
+            "problemas": sum(c["vazios"] + c["fora_do_tipo"] + c["fora_do_padrao"] for c in colunas.values()),
+        }
+
+# ---------------------------------------------------------------------------
+def acumulador_conteudo(perfil: Dict, colunas: Dict[str, str],
+                        tipos: Optional[Dict[str, str]] = None,
+                        padroes: Optional[Dict[str, str]] = None) -> AcumuladorConteudo:
+    """Acumulador para um arquivo com o perfil informado (numeração de linhas do arquivo)."""
+    return AcumuladorConteudo(colunas, tipos, padroes,
+                              primeira_linha=opcoes_leitura(perfil)["skiprows"] + 2)
+
+def validar_conteudo_arquivo(arquivo: Path, colunas: Dict[str, str],
+                             tipos: Optional[Dict[str, str]] = None,
+                             padroes: Optional[Dict[str, str]] = None,
+                             tamanho_chunk: Optional[int] = None,
+                             pasta_colunar: Optional[Path] = None) -> Dict:
+    """Valida o conteúdo das colunas informadas lendo o arquivo em blocos."""
+    acumulador = acumulador_conteudo(perfil_arquivo(arquivo), colunas, tipos, padroes)
+    if not colunas:
+        return acumulador.resultado()
+
+    for chunk in blocos_csv(arquivo, acumulador.colunas,
+                            tamanho_chunk=tamanho_chunk or TAMANHO_CHUNK_LINHAS,
+                            pasta_colunar=pasta_colunar):
+        acumulador.atualizar(chunk)
+    return acumulador.resultado()